@@ -0,0 +1,66 @@
+"""
+Per-message overhead of SQS sends: a fresh aioboto3 client per call versus
+the shared client registry (utils.aws_clients).
+
+Runs against the in-process FakeSQS stand-in, so numbers exclude network and
+TLS time and isolate client construction, credential resolution and
+connection setup.
+
+    python benchmarks/bench_aws_clients.py [--messages 500] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+import aioboto3  # noqa: E402
+from fake_sqs import FakeSQS, QUEUE_URL  # noqa: E402
+from utils.aws_clients import close_aws_clients  # noqa: E402
+from utils.sqs_client import SQSClient  # noqa: E402
+
+REGION = "ap-southeast-2"
+
+
+async def send_with_client_per_call(endpoint_url: str, session: aioboto3.Session, i: int):
+    """What SQSClient.send_message did before the shared registry."""
+    async with session.client("sqs", region_name=REGION, endpoint_url=endpoint_url) as sqs:
+        await sqs.send_message(QueueUrl=QUEUE_URL, MessageBody=f'{{"n": {i}}}')
+
+
+async def run(label: str, send, messages: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await send(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(messages)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed / messages * 1e6:10.0f} us/msg {messages / elapsed:10.0f} msg/s")
+
+
+async def main(messages: int, concurrency: int):
+    async with FakeSQS() as fake:
+        session = aioboto3.Session()
+        await run("client per call", lambda i: send_with_client_per_call(fake.endpoint_url, session, i),
+                  messages, concurrency)
+
+        sqs_client = SQSClient(queue_url=QUEUE_URL, region_name=REGION, endpoint_url=fake.endpoint_url)
+        await run("shared client", lambda i: sqs_client.send_json_message({"n": i}), messages, concurrency)
+        await close_aws_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency))
@@ -0,0 +1,139 @@
+"""
+REST latency while the SQS router works through a flood of CPU-bound
+messages, with the handler running on the event loop ("async" mode) versus
+offloaded to the handler thread or process pool.
+
+A FastAPI app with a trivial endpoint is served by uvicorn in the same event
+loop as the handlers, as in app.py. A client requests it at a steady rate
+while the flood is routed with `concurrency` messages in flight, and the
+latency percentiles are reported per mode.
+
+    python benchmarks/bench_handler_offload.py [--messages 200] [--work-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import aiohttp  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from adapters.sqs.decoder import decode_message  # noqa: E402
+from adapters.sqs.executors import shutdown_handler_executors  # noqa: E402
+from adapters.sqs.registry import HandlerSpec, route_table  # noqa: E402
+from adapters.sqs.router import route_envelope  # noqa: E402
+
+WORK_MS = 20
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+def burn_cpu(envelope):
+    """Pure-Python busy loop standing in for parsing, image or report work."""
+    deadline = time.thread_time() + envelope.content["work_ms"] / 1000
+    n = 0
+    while time.thread_time() < deadline:
+        n += 1
+    return n
+
+
+async def async_burn_cpu(envelope):
+    burn_cpu(envelope)
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+async def measure_rest(url: str, stop: asyncio.Event, interval: float = 0.005):
+    """
+    Request `url` every `interval` seconds. Latency is measured from when each
+    request was due, so requests delayed by a blocked loop count as slow
+    rather than going missing.
+    """
+    latencies = []
+    async with aiohttp.ClientSession() as session:
+        due = time.perf_counter()
+        while not stop.is_set():
+            async with session.get(url) as response:
+                await response.read()
+            now = time.perf_counter()
+            latencies.append((now - due) * 1000)
+            due += interval
+            # Requests that fell behind are sent straight away
+            await asyncio.sleep(max(0.0, due - now))
+    return latencies
+
+
+async def flood(messages: int, concurrency: int, work_ms: float):
+    semaphore = asyncio.Semaphore(concurrency)
+    message = {
+        "MessageId": "m", "ReceiptHandle": "r", "Body": f'{{"work_ms": {work_ms}}}',
+        "MessageAttributes": {
+            "Message-Type": {"DataType": "String", "StringValue": "cpu"},
+            "Content-Type": {"DataType": "String", "StringValue": "application/json"},
+        },
+    }
+
+    async def one():
+        async with semaphore:
+            await route_envelope(decode_message(message))
+
+    await asyncio.gather(*(one() for _ in range(messages)))
+
+
+async def run_mode(mode: str, url: str, args):
+    handler = async_burn_cpu if mode == "async" else burn_cpu
+    route_table["cpu"] = HandlerSpec("cpu", handler, mode=mode)
+    if mode == "process":
+        # Start the pool before timing so worker spawn isn't counted
+        await flood(args.concurrency, args.concurrency, 0)
+
+    stop = asyncio.Event()
+    client = asyncio.create_task(measure_rest(url, stop))
+    await asyncio.sleep(0.2)
+    start = time.perf_counter()
+    await flood(args.messages, args.concurrency, args.work_ms)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    latencies = await client
+
+    print(f"{mode:<8} {percentile(latencies, 50):9.1f} {percentile(latencies, 95):9.1f} "
+          f"{percentile(latencies, 99):9.1f} {max(latencies):9.1f} {args.messages / elapsed:10.0f}")
+
+
+async def main(args):
+    config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{args.port}/ping"
+
+    print(f"REST latency (ms) during a flood of {args.messages} x {args.work_ms}ms CPU-bound messages")
+    print(f"{'mode':<8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'msg/s':>10}")
+    try:
+        for mode in ("async", "thread", "process"):
+            await run_mode(mode, url, args)
+    finally:
+        shutdown_handler_executors()
+        server.should_exit = True
+        await serve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--work-ms", type=float, default=WORK_MS)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""
+Per-message decode cost in the SQS router: the previous two-pass parsing
+versus adapters.sqs.decoder with each available JSON backend.
+
+Covers plain SQS JSON bodies, SNS-wrapped JSON and text payloads.
+
+    python benchmarks/bench_sqs_decode.py [--messages 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import adapters.sqs.decoder as decoder  # noqa: E402
+
+PAYLOAD = {"user_id": 12345, "event": "profile_updated", "fields": ["name", "email"], "source": "web"}
+
+
+def sqs_attributes(content_type):
+    return {
+        "Message-Type": {"DataType": "String", "StringValue": "template"},
+        "Content-Type": {"DataType": "String", "StringValue": content_type},
+    }
+
+
+MESSAGES = {
+    "sqs-json": {
+        "MessageId": "m1", "ReceiptHandle": "r1",
+        "Body": json.dumps(PAYLOAD),
+        "MessageAttributes": sqs_attributes("application/json"),
+    },
+    "sns-json": {
+        "MessageId": "m1", "ReceiptHandle": "r1",
+        "Body": json.dumps({
+            "Type": "Notification",
+            "MessageId": "sns-1",
+            "TopicArn": "arn:aws:sns:ap-southeast-2:000000000000:users",
+            "Message": json.dumps(PAYLOAD),
+            "Timestamp": "2024-01-01T00:00:00.000Z",
+            "MessageAttributes": {
+                "Message-Type": {"Type": "String", "Value": "template"},
+                "Content-Type": {"Type": "String", "Value": "application/json"},
+            },
+        }),
+    },
+    "sqs-text": {
+        "MessageId": "m1", "ReceiptHandle": "r1",
+        "Body": "user 12345 updated their profile",
+        "MessageAttributes": sqs_attributes("text/plain"),
+    },
+}
+
+
+def legacy_decode(message):
+    """The parsing route_message did before the decoder stage."""
+    body = message.get("Body", "")
+    sns_message = None
+    if body:
+        try:
+            parsed_body = json.loads(body)
+            if isinstance(parsed_body, dict) and parsed_body.get("Type") == "Notification":
+                sns_message = parsed_body
+        except json.JSONDecodeError:
+            pass
+    if sns_message is not None:
+        attributes = sns_message.get("MessageAttributes", {})
+        message_type = attributes["Message-Type"].get("Value") if "Message-Type" in attributes else None
+        content_type = attributes["Content-Type"].get("Value") if "Content-Type" in attributes else None
+        content = sns_message.get("Message", "")
+    else:
+        attributes = message.get("MessageAttributes", {})
+        message_type = attributes.get("Message-Type", {}).get("StringValue") if "Message-Type" in attributes else None
+        content_type = attributes.get("Content-Type", {}).get("StringValue") if "Content-Type" in attributes else None
+        content = body
+    if content_type == "application/json" and content:
+        content = json.loads(content)
+    return message_type, content
+
+
+def measure(decode, message, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        decode(message)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'':26}" + "".join(f"{kind:>12}" for kind in MESSAGES) + "   (us/message)")
+
+    def report(label, decode):
+        timings = [measure(decode, message, args.messages) for message in MESSAGES.values()]
+        print(f"{label:26}" + "".join(f"{timing:12.2f}" for timing in timings))
+
+    report("legacy (json, two-pass)", legacy_decode)
+    for backend in ("json", "orjson", "msgspec"):
+        name, decoder._loads, decoder._decode_errors = decoder._load_json_backend(backend)
+        if name == backend:
+            report(f"decoder ({name})", decoder.decode_message)
+
+
+if __name__ == "__main__":
+    main()
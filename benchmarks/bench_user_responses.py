@@ -0,0 +1,77 @@
+"""
+CPU per request for GET /users/ returning a large page: the previous path
+(a UserDTO built per row, then validated and serialized again by FastAPI's
+response_model) versus adapters.rest.responses, which validates and encodes
+the whole page in one pydantic-core pass.
+
+Rows are in-memory User models, so the figures are the response-building
+cost alone, without the database. Each request goes through the ASGI app
+in-process.
+
+    python benchmarks/bench_user_responses.py [--rows 10000] [--requests 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+import adapters.rest.responses as responses  # noqa: E402
+from dto.user_dto import UserDTO  # noqa: E402
+from models.users import User  # noqa: E402
+
+
+def build_app(users) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_model=list[UserDTO])
+    async def legacy():
+        """What get_users did before FastJSONResponse."""
+        return [UserDTO(id=user.id, name=user.name, email=user.email) for user in users]
+
+    @app.get("/fast", response_model=list[UserDTO])
+    async def fast():
+        return responses.users_response(users)
+
+    return app
+
+
+async def measure(client, path, requests) -> tuple[float, float, int]:
+    """Return (CPU ms per request, wall ms per request, response bytes)."""
+    response = await client.get(path)  # warm up
+    size = len(response.content)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        (await client.get(path)).raise_for_status()
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    return cpu / requests * 1000, wall / requests * 1000, size
+
+
+async def run(args):
+    users = [User(id=i, name=f"user {i}", email=f"user{i}@example.com") for i in range(1, args.rows + 1)]
+    transport = httpx.ASGITransport(app=build_app(users))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.rows} users per response, {args.requests} requests each")
+        print(f"{'':30}{'cpu ms/req':>12}{'wall ms/req':>13}{'bytes':>10}{'cpu saved':>11}")
+
+        legacy_cpu, wall, size = await measure(client, "/legacy", args.requests)
+        print(f"{'legacy (DTO + response_model)':30}{legacy_cpu:12.2f}{wall:13.2f}{size:10}{'':>11}")
+
+        cpu, wall, size = await measure(client, "/fast", args.requests)
+        saved = 1 - cpu / legacy_cpu if legacy_cpu else 0.0
+        print(f"{'FastJSONResponse':30}{cpu:12.2f}{wall:13.2f}{size:10}{saved:11.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
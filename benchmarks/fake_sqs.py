@@ -0,0 +1,87 @@
+"""
+A minimal in-process SQS stand-in (ElasticMQ-style) for benchmarks.
+
+Speaks the SQS JSON protocol over plain HTTP for the handful of actions the
+service uses: SendMessage, SendMessageBatch, ReceiveMessage,
+DeleteMessageBatch and ChangeMessageVisibilityBatch. Point an aioboto3 client
+at `server.endpoint_url` with any credentials.
+"""
+import hashlib
+import json
+import uuid
+from collections import deque
+from aiohttp import web
+
+QUEUE_URL = "http://localhost/000000000000/bench-queue"
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+class FakeSQS:
+    def __init__(self):
+        self.messages = deque()
+        self.requests = 0
+        self.deleted = 0
+        self._runner = None
+        self.endpoint_url = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.endpoint_url = f"http://{host}:{port}"
+        return self
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def _enqueue(self, body: str, attributes: dict | None) -> dict:
+        message_id = str(uuid.uuid4())
+        self.messages.append({
+            "MessageId": message_id,
+            "ReceiptHandle": message_id,
+            "Body": body,
+            "MD5OfBody": _md5(body),
+            "MessageAttributes": attributes or {},
+        })
+        return {"MessageId": message_id, "MD5OfMessageBody": _md5(body)}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        action = request.headers.get("X-Amz-Target", "").rsplit(".", 1)[-1]
+        payload = json.loads(await request.read() or b"{}")
+
+        if action == "SendMessage":
+            result = self._enqueue(payload["MessageBody"], payload.get("MessageAttributes"))
+        elif action == "SendMessageBatch":
+            successful = []
+            for entry in payload["Entries"]:
+                sent = self._enqueue(entry["MessageBody"], entry.get("MessageAttributes"))
+                successful.append({"Id": entry["Id"], **sent})
+            result = {"Successful": successful, "Failed": []}
+        elif action == "ReceiveMessage":
+            count = min(payload.get("MaxNumberOfMessages", 1), len(self.messages))
+            result = {"Messages": [self.messages.popleft() for _ in range(count)]}
+        elif action == "DeleteMessageBatch":
+            self.deleted += len(payload["Entries"])
+            result = {"Successful": [{"Id": e["Id"]} for e in payload["Entries"]], "Failed": []}
+        elif action == "ChangeMessageVisibilityBatch":
+            result = {"Successful": [{"Id": e["Id"]} for e in payload["Entries"]], "Failed": []}
+        else:
+            return web.json_response(
+                {"__type": "InvalidAction", "message": f"Unsupported action {action}"}, status=400
+            )
+        return web.json_response(result, content_type="application/x-amz-json-1.0")
@@ -0,0 +1,106 @@
+"""
+Load generation, latency statistics and baseline comparison for the
+benchmark suite (benchmarks/suite.py).
+
+A scenario is an async callable taking the operation number; run_load calls
+it `operations` times with `concurrency` calls in flight and times each call.
+"""
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable
+
+# Metric -> direction that counts as better; only these are compared against the baseline
+COMPARED_METRICS = {"rps": "higher", "p50_ms": "lower", "p95_ms": "lower"}
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Throughput and latency percentiles (milliseconds) for one run."""
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "operations": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+    }
+
+
+async def run_load(operation: Callable[[int], Awaitable], operations: int, concurrency: int = 1,
+                   warmup: int = 0) -> dict:
+    """
+    Call operation(i) for i in range(operations), `concurrency` at a time.
+
+    `warmup` untimed calls run first so connection pools, caches and lazily
+    imported code are in place before measuring. A call that raises counts as
+    an error and is left out of the latency figures.
+
+    Returns:
+        summarize() of the timed calls
+    """
+    for i in range(warmup):
+        await operation(-1 - i)
+
+    latencies: list[float] = []
+    errors = 0
+    numbers = iter(range(operations))
+
+    async def worker():
+        nonlocal errors
+        for i in numbers:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: dict, metadata: dict):
+    with open(path, "w") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare a run with a baseline.
+
+    Args:
+        results: Scenario name -> summarize() output for this run
+        baseline: The same, from load_baseline()
+        threshold: Allowed slowdown as a fraction, e.g. 0.2 for 20%
+
+    Returns:
+        One message per metric that regressed by more than `threshold`;
+        scenarios missing from either side are not compared
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if better == "higher" else (new - old) / old
+            if change > threshold:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.0%} worse, limit {threshold:.0%})")
+    return regressions
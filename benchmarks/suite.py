@@ -0,0 +1,236 @@
+"""
+Throughput and latency benchmarks for the service's hot paths, run against
+local stand-ins: a SQLite file (or a local Postgres via --database-url) for
+the database, FakeSQS for SQS and an in-process gRPC server.
+
+Scenarios:
+    repo.get_user_by_id       UserRepository primary-key lookup
+    repo.list_users           UserRepository keyset page of 100
+    rest.get_user             GET /users/{id} through the FastAPI app (in-process ASGI)
+    rest.list_users           GET /users/?limit=100
+    grpc.get_user             User.GetUser over a pooled channel
+    sqs.route_message         decode + dispatch of one message to a no-op handler
+    sqs.poll_messages         receive, route and delete one batch of 10 from FakeSQS
+
+Each scenario reports req/s and p50/p95/p99 latency. With --save-baseline the
+results are written to the baseline file; otherwise, if a baseline exists, the
+run fails (exit status 1) when req/s, p50 or p95 is worse than the baseline by
+more than --threshold. Baselines depend on the machine, so record one on the
+machine that will compare against it.
+
+    python benchmarks/suite.py [--save-baseline] [--threshold 0.2] [--only sqs.]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_sqs import FakeSQS, QUEUE_URL  # noqa: E402
+from harness import compare, load_baseline, run_load, save_baseline  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED_USERS = 1000
+BENCH_MESSAGE_TYPE = "bench"
+
+
+def configure_environment(database_url: str):
+    """Point config at the stand-ins; must run before any service module is imported."""
+    os.environ["WRITER_DATABASE_URL"] = database_url
+    os.environ["READER_DATABASE_URL"] = database_url
+    os.environ["SQS_QUEUE_URL"] = QUEUE_URL
+    os.environ["SQS_REGION"] = "ap-southeast-2"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ["GRPC_SERVE_IN_APP"] = "false"
+    os.environ["SQS_POLL_IN_APP"] = "false"
+
+
+def sqs_message(i: int) -> dict:
+    return {
+        "MessageId": f"bench-{i}",
+        "ReceiptHandle": f"receipt-{i}",
+        "Body": json.dumps({"user_id": i, "event": "profile_updated"}),
+        "MessageAttributes": {
+            "Message-Type": {"DataType": "String", "StringValue": BENCH_MESSAGE_TYPE},
+            "Content-Type": {"DataType": "String", "StringValue": "application/json"},
+        },
+    }
+
+
+async def seed_users():
+    from database.db import create_tables
+    from data_access.user_repo import UserRepository
+
+    await create_tables()
+    users = [{"name": f"user {i}", "email": f"bench{i}@example.com"} for i in range(SEED_USERS)]
+    result = await UserRepository().bulk_upsert_users(users)
+    return [user.id for user in result["users"]]
+
+
+async def bench_repository(user_ids, args):
+    from data_access.user_repo import UserRepository
+    repo = UserRepository()
+    return {
+        "repo.get_user_by_id": await run_load(
+            lambda i: repo.get_user_by_id(user_ids[i % len(user_ids)]),
+            args.operations, args.concurrency, warmup=args.concurrency),
+        "repo.list_users": await run_load(
+            lambda i: repo.list_users(limit=100, after=user_ids[i % (len(user_ids) - 100)]),
+            args.operations, args.concurrency, warmup=args.concurrency),
+    }
+
+
+async def bench_rest(user_ids, args):
+    import httpx
+    from app import app
+
+    # The app configures INFO logging on import; per-request logs would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async def get(path):
+        response = await client.get(path)
+        response.raise_for_status()
+
+    # The lifespan isn't run: no gRPC server or SQS poller, just the HTTP path
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        return {
+            "rest.get_user": await run_load(
+                lambda i: get(f"/users/{user_ids[i % len(user_ids)]}"),
+                args.operations, args.concurrency, warmup=args.concurrency),
+            "rest.list_users": await run_load(
+                lambda i: get(f"/users/?limit=100&after={user_ids[i % (len(user_ids) - 100)]}"),
+                args.operations, args.concurrency, warmup=args.concurrency),
+        }
+
+
+async def bench_grpc(user_ids, args):
+    try:
+        from adapters.grpc.server.grpc_server import create_grpc_server
+        from utils.grpc_stub import GrpcClient
+        from utils.grpc_channels import close_grpc_channels
+    except ImportError as e:
+        logging.warning(f"Skipping gRPC benchmarks, generated stubs are unavailable: {e}")
+        return {}
+
+    server = create_grpc_server()
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        client = GrpcClient("127.0.0.1", port)
+        return {
+            "grpc.get_user": await run_load(
+                lambda i: client.get_user(user_ids[i % len(user_ids)]),
+                args.operations, args.concurrency, warmup=args.concurrency),
+        }
+    finally:
+        await close_grpc_channels()
+        await server.stop(None)
+
+
+async def bench_sqs(args):
+    from adapters.sqs.poll import poll_messages
+    from adapters.sqs.registry import register_handler
+    from adapters.sqs.router import route_message
+    from utils.aws_clients import close_aws_clients
+
+    @register_handler(BENCH_MESSAGE_TYPE)
+    async def handle_bench(envelope):
+        return None
+
+    results = {
+        "sqs.route_message": await run_load(
+            lambda i: route_message(sqs_message(i)), args.operations, args.concurrency, warmup=args.concurrency),
+    }
+
+    batches = max(1, args.operations // 10)
+    async with FakeSQS() as fake:
+        # Read when the shared client is created, on the first poll
+        os.environ["AWS_ENDPOINT_URL_SQS"] = fake.endpoint_url
+        for i in range(batches * 10 + 10):
+            message = sqs_message(i)
+            fake._enqueue(message["Body"], message["MessageAttributes"])
+        try:
+            results["sqs.poll_messages"] = await run_load(lambda i: poll_messages(QUEUE_URL), batches, 1, warmup=1)
+        finally:
+            await close_aws_clients()
+    return results
+
+
+async def run_suite(args) -> dict:
+    results = {}
+    groups = ("repo.", "rest.", "grpc.", "sqs.")
+    wanted = [group for group in groups if not args.only or any(group.startswith(o) or o.startswith(group) for o in args.only)]
+    user_ids = await seed_users() if {"repo.", "rest.", "grpc."} & set(wanted) else []
+    if "repo." in wanted:
+        results.update(await bench_repository(user_ids, args))
+    if "rest." in wanted:
+        results.update(await bench_rest(user_ids, args))
+    if "grpc." in wanted:
+        results.update(await bench_grpc(user_ids, args))
+    if "sqs." in wanted:
+        results.update(await bench_sqs(args))
+    if args.only:
+        results = {name: result for name, result in results.items() if any(name.startswith(o) for o in args.only)}
+    return results
+
+
+def print_results(results: dict):
+    columns = ("operations", "errors", "rps", "p50_ms", "p95_ms", "p99_ms")
+    print(f"{'scenario':24}" + "".join(f"{column:>12}" for column in columns))
+    for name, result in results.items():
+        print(f"{name:24}" + "".join(f"{result[column]:>12}" for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=2000, help="Timed calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight per scenario")
+    parser.add_argument("--database-url", help="Async database URL, e.g. a local Postgres (default: a temporary SQLite file)")
+    parser.add_argument("--only", nargs="*", help="Run scenarios whose names start with these prefixes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(args.database_url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        logging.basicConfig(level=logging.WARNING)
+        results = asyncio.run(run_suite(args))
+
+    print_results(results)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, {
+            "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": "postgres" if args.database_url else "sqlite",
+            "operations": args.operations,
+            "concurrency": args.concurrency,
+        })
+        print(f"\nSaved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from compsci399_grpc import greeter_pb2, greeter_pb2_grpc
+# Generated from greeter.proto next to this file (see "gRPC generation" in the README)
+from adapters.grpc.proto.greeting import greeter_pb2, greeter_pb2_grpc
 
 
 class GreeterServicer(greeter_pb2_grpc.GreeterServicer):
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: adapters/grpc/proto/post/post.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'adapters/grpc/proto/post/post.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n#adapters/grpc/proto/post/post.proto\x12\x04post\"G\n\x08PostData\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07user_id\x18\x02 \x01(\x03\x12\r\n\x05title\x18\x03 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\"D\n\x11\x43reatePostRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"\x1c\n\x0eGetPostRequest\x12\n\n\x02id\x18\x01 \x01(\x03\"E\n\x14ListUserPostsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\r\n\x05\x61\x66ter\x18\x03 \x01(\x03\"J\n\x15ListUserPostsResponse\x12\x1d\n\x05posts\x18\x01 \x03(\x0b\x32\x0e.post.PostData\x12\x12\n\nnext_after\x18\x02 \x01(\x03\"W\n\rUserWithPosts\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x1d\n\x05posts\x18\x04 \x03(\x0b\x32\x0e.post.PostData\",\n\x18GetUsersWithPostsRequest\x12\x10\n\x08user_ids\x18\x01 \x03(\x03\"T\n\x19GetUsersWithPostsResponse\x12\"\n\x05users\x18\x01 \x03(\x0b\x32\x13.post.UserWithPosts\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\x03\x32\x8e\x02\n\x04Post\x12\x35\n\nCreatePost\x12\x17.post.CreatePostRequest\x1a\x0e.post.PostData\x12/\n\x07GetPost\x12\x14.post.GetPostRequest\x1a\x0e.post.PostData\x12H\n\rListUserPosts\x12\x1a.post.ListUserPostsRequest\x1a\x1b.post.ListUserPostsResponse\x12T\n\x11GetUsersWithPosts\x12\x1e.post.GetUsersWithPostsRequest\x1a\x1f.post.GetUsersWithPostsResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'adapters.grpc.proto.post.post_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_POSTDATA']._serialized_start=45
+  _globals['_POSTDATA']._serialized_end=116
+  _globals['_CREATEPOSTREQUEST']._serialized_start=118
+  _globals['_CREATEPOSTREQUEST']._serialized_end=186
+  _globals['_GETPOSTREQUEST']._serialized_start=188
+  _globals['_GETPOSTREQUEST']._serialized_end=216
+  _globals['_LISTUSERPOSTSREQUEST']._serialized_start=218
+  _globals['_LISTUSERPOSTSREQUEST']._serialized_end=287
+  _globals['_LISTUSERPOSTSRESPONSE']._serialized_start=289
+  _globals['_LISTUSERPOSTSRESPONSE']._serialized_end=363
+  _globals['_USERWITHPOSTS']._serialized_start=365
+  _globals['_USERWITHPOSTS']._serialized_end=452
+  _globals['_GETUSERSWITHPOSTSREQUEST']._serialized_start=454
+  _globals['_GETUSERSWITHPOSTSREQUEST']._serialized_end=498
+  _globals['_GETUSERSWITHPOSTSRESPONSE']._serialized_start=500
+  _globals['_GETUSERSWITHPOSTSRESPONSE']._serialized_end=584
+  _globals['_POST']._serialized_start=587
+  _globals['_POST']._serialized_end=857
+# @@protoc_insertion_point(module_scope)
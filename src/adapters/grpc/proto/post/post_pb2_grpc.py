@@ -0,0 +1,228 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from adapters.grpc.proto.post import post_pb2 as adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in adapters/grpc/proto/post/post_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class PostStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.CreatePost = channel.unary_unary(
+                '/post.Post/CreatePost',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.CreatePostRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.FromString,
+                _registered_method=True)
+        self.GetPost = channel.unary_unary(
+                '/post.Post/GetPost',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetPostRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.FromString,
+                _registered_method=True)
+        self.ListUserPosts = channel.unary_unary(
+                '/post.Post/ListUserPosts',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsResponse.FromString,
+                _registered_method=True)
+        self.GetUsersWithPosts = channel.unary_unary(
+                '/post.Post/GetUsersWithPosts',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsResponse.FromString,
+                _registered_method=True)
+
+
+class PostServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def CreatePost(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPost(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListUserPosts(self, request, context):
+        """One page of a user's posts ordered by id
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUsersWithPosts(self, request, context):
+        """Users with all of their posts; posts for every user are loaded with one query
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PostServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'CreatePost': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreatePost,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.CreatePostRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.SerializeToString,
+            ),
+            'GetPost': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPost,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetPostRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.SerializeToString,
+            ),
+            'ListUserPosts': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListUserPosts,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsResponse.SerializeToString,
+            ),
+            'GetUsersWithPosts': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUsersWithPosts,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'post.Post', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('post.Post', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Post:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def CreatePost(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.Post/CreatePost',
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.CreatePostRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetPost(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.Post/GetPost',
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetPostRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.PostData.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListUserPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.Post/ListUserPosts',
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.ListUserPostsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetUsersWithPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.Post/GetUsersWithPosts',
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_post_dot_post__pb2.GetUsersWithPostsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,53 @@
+import grpc
+from services.post_service import PostService
+# Generated from post.proto next to this file (see "gRPC generation" in the README)
+from adapters.grpc.proto.post import post_pb2, post_pb2_grpc
+from config import POSTS_PAGE_DEFAULT_LIMIT, POSTS_PAGE_MAX_LIMIT, POSTS_BY_USERS_MAX_IDS
+
+def _post_data(post):
+    return post_pb2.PostData(id=post.id, user_id=post.user_id, title=post.title, content=post.content)
+
+class PostServicer(post_pb2_grpc.PostServicer):
+    def __init__(self):
+        self.post_service = PostService()
+
+    async def CreatePost(self, request, context):
+        post = await self.post_service.create_post(request.user_id, request.title, request.content)
+        if post is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "User not found")
+        return _post_data(post)
+
+    async def GetPost(self, request, context):
+        post = await self.post_service.get_post_by_id(request.id)
+        if post is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "Post not found")
+        return _post_data(post)
+
+    async def ListUserPosts(self, request, context):
+        """One page of request.user_id's posts after request.after; next_after is 0 on the last page."""
+        limit = min(request.limit or POSTS_PAGE_DEFAULT_LIMIT, POSTS_PAGE_MAX_LIMIT)
+        posts = await self.post_service.list_user_posts(request.user_id, limit=limit, after=request.after or None)
+        return post_pb2.ListUserPostsResponse(
+            posts=[_post_data(post) for post in posts],
+            next_after=posts[-1].id if len(posts) == limit else 0,
+        )
+
+    async def GetUsersWithPosts(self, request, context):
+        """Users with their posts in two queries. Ids that don't exist are returned in missing_ids."""
+        user_ids = list(dict.fromkeys(request.user_ids))
+        if len(user_ids) > POSTS_BY_USERS_MAX_IDS:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"At most {POSTS_BY_USERS_MAX_IDS} users can be requested at once"
+            )
+        users = await self.post_service.get_users_with_posts(user_ids)
+        found = {user.id for user in users}
+        return post_pb2.GetUsersWithPostsResponse(
+            users=[
+                post_pb2.UserWithPosts(
+                    id=user.id, name=user.name, email=user.email, posts=[_post_data(post) for post in user.posts]
+                )
+                for user in users
+            ],
+            missing_ids=[user_id for user_id in user_ids if user_id not in found],
+        )
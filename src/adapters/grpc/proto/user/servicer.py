@@ -1,13 +1,49 @@
 import grpc
+from contextlib import aclosing
 from services.user_service import UserService
-from compsci399_grpc import user_pb2, user_pb2_grpc
+# Generated from user.proto next to this file (see "gRPC generation" in the README)
+from adapters.grpc.proto.user import user_pb2, user_pb2_grpc
+from config import GRPC_BATCH_GET_MAX_IDS, USERS_STREAM_CHUNK_SIZE
 
 class UserServicer(user_pb2_grpc.UserServicer):
     def __init__(self):
+        # Concurrent GetUser calls are coalesced into one query by the service's batch loader
         self.user_service = UserService()
-        
+
     async def GetUser(self, request, context):
         user = await self.user_service.get_user_by_id(request.id)
         if user is None:
-            raise grpc.RpcStatus(grpc.StatusCode.NOT_FOUND, "User not found")
+            await context.abort(grpc.StatusCode.NOT_FOUND, "User not found")
         return user_pb2.GetUserResponse(id=user.id, name=user.name, email=user.email)
+
+    async def BatchGetUsers(self, request, context):
+        """Look up many users with a single query. Ids that don't exist are returned in missing_ids."""
+        user_ids = list(dict.fromkeys(request.ids))
+        if len(user_ids) > GRPC_BATCH_GET_MAX_IDS:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"At most {GRPC_BATCH_GET_MAX_IDS} ids can be requested at once"
+            )
+        users = await self.user_service.get_users_by_ids(user_ids)
+        users_by_id = {user.id: user for user in users}
+        return user_pb2.BatchGetUsersResponse(
+            users=[
+                user_pb2.GetUserResponse(id=user_id, name=users_by_id[user_id].name, email=users_by_id[user_id].email)
+                for user_id in user_ids if user_id in users_by_id
+            ],
+            missing_ids=[user_id for user_id in user_ids if user_id not in users_by_id],
+        )
+
+    async def StreamUsers(self, request, context):
+        """Stream users ordered by id, starting after request.after; request.limit of 0 means no limit."""
+        remaining = request.limit or None
+        chunks = self.user_service.stream_users(chunk_size=USERS_STREAM_CHUNK_SIZE, after=request.after or None)
+        # aclosing releases the DB cursor as soon as we stop early
+        async with aclosing(chunks):
+            async for rows in chunks:
+                for row in rows:
+                    yield user_pb2.GetUserResponse(id=row.id, name=row.name, email=row.email)
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining == 0:
+                            return
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: adapters/grpc/proto/user/user.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'adapters/grpc/proto/user/user.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n#adapters/grpc/proto/user/user.proto\x12\x04user\"\x1c\n\x0eGetUserRequest\x12\n\n\x02id\x18\x01 \x01(\x03\":\n\x0fGetUserResponse\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"#\n\x14\x42\x61tchGetUsersRequest\x12\x0b\n\x03ids\x18\x01 \x03(\x03\"R\n\x15\x42\x61tchGetUsersResponse\x12$\n\x05users\x18\x01 \x03(\x0b\x32\x15.user.GetUserResponse\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\x03\"2\n\x12StreamUsersRequest\x12\r\n\x05\x61\x66ter\x18\x01 \x01(\x03\x12\r\n\x05limit\x18\x02 \x01(\x05\x32\xca\x01\n\x04User\x12\x36\n\x07GetUser\x12\x14.user.GetUserRequest\x1a\x15.user.GetUserResponse\x12H\n\rBatchGetUsers\x12\x1a.user.BatchGetUsersRequest\x1a\x1b.user.BatchGetUsersResponse\x12@\n\x0bStreamUsers\x12\x18.user.StreamUsersRequest\x1a\x15.user.GetUserResponse0\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'adapters.grpc.proto.user.user_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_GETUSERREQUEST']._serialized_start=45
+  _globals['_GETUSERREQUEST']._serialized_end=73
+  _globals['_GETUSERRESPONSE']._serialized_start=75
+  _globals['_GETUSERRESPONSE']._serialized_end=133
+  _globals['_BATCHGETUSERSREQUEST']._serialized_start=135
+  _globals['_BATCHGETUSERSREQUEST']._serialized_end=170
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_start=172
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_end=254
+  _globals['_STREAMUSERSREQUEST']._serialized_start=256
+  _globals['_STREAMUSERSREQUEST']._serialized_end=306
+  _globals['_USER']._serialized_start=309
+  _globals['_USER']._serialized_end=511
+# @@protoc_insertion_point(module_scope)
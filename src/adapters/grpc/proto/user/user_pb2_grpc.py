@@ -0,0 +1,185 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from adapters.grpc.proto.user import user_pb2 as adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in adapters/grpc/proto/user/user_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class UserStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetUser = channel.unary_unary(
+                '/user.User/GetUser',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.FromString,
+                _registered_method=True)
+        self.BatchGetUsers = channel.unary_unary(
+                '/user.User/BatchGetUsers',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersResponse.FromString,
+                _registered_method=True)
+        self.StreamUsers = channel.unary_stream(
+                '/user.User/StreamUsers',
+                request_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.StreamUsersRequest.SerializeToString,
+                response_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.FromString,
+                _registered_method=True)
+
+
+class UserServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def GetUser(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetUsers(self, request, context):
+        """Many users looked up with one query; ids that don't exist come back in missing_ids
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamUsers(self, request, context):
+        """Users ordered by id, read from the database in chunks
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_UserServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetUser': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUser,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.SerializeToString,
+            ),
+            'BatchGetUsers': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetUsers,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersResponse.SerializeToString,
+            ),
+            'StreamUsers': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamUsers,
+                    request_deserializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.StreamUsersRequest.FromString,
+                    response_serializer=adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'user.User', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('user.User', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class User:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GetUser(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/user.User/GetUser',
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/user.User/BatchGetUsers',
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.BatchGetUsersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/user.User/StreamUsers',
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.StreamUsersRequest.SerializeToString,
+            adapters_dot_grpc_dot_proto_dot_user_dot_user__pb2.GetUserResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
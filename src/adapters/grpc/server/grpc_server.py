@@ -2,32 +2,136 @@
 import asyncio
 import logging
 import grpc
+from typing import Optional, Sequence
 from grpc.experimental import aio as grpc_aio  # Async gRPC server module
-from compsci399_grpc import greeter_pb2, greeter_pb2_grpc
+from adapters.grpc.proto.greeting import greeter_pb2_grpc
 from adapters.grpc.proto.greeting.servicer import GreeterServicer
-from compsci399_grpc import user_pb2_grpc
+from adapters.grpc.proto.user import user_pb2_grpc
 from adapters.grpc.proto.user.servicer import UserServicer
-from config import GRPC_SERVER_ADDR
+from adapters.grpc.proto.post import post_pb2_grpc
+from adapters.grpc.proto.post.servicer import PostServicer
+from adapters.grpc.server.metrics_interceptor import MetricsInterceptor
+from utils.processes import configure_process_logging, run_processes
+from config import (
+    GRPC_SERVER_ADDR,
+    GRPC_PROCESSES,
+    GRPC_MAX_CONCURRENT_RPCS,
+    GRPC_MAX_RECEIVE_MESSAGE_BYTES,
+    GRPC_MAX_SEND_MESSAGE_BYTES,
+    GRPC_KEEPALIVE_TIME_MS,
+    GRPC_KEEPALIVE_TIMEOUT_MS,
+    GRPC_KEEPALIVE_MIN_PING_INTERVAL_MS,
+    GRPC_MAX_CONNECTION_IDLE_MS,
+    GRPC_MAX_CONNECTION_AGE_MS,
+    GRPC_COMPRESSION,
+    GRPC_SHUTDOWN_GRACE_SECONDS,
+    METRICS_ENABLED,
+)
 
-async def serve_grpc():
-    logging.info("Setting up gRPC server...")
-    # Create the asynchronous gRPC server
-    server = grpc_aio.server()
-    # Register the servicer with the server
+COMPRESSION_ALGORITHMS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+def grpc_server_options(reuse_port: bool = False) -> list[tuple[str, int]]:
+    """Channel arguments for the server, built from config."""
+    options = [
+        # With SO_REUSEPORT several processes can listen on the same port and the kernel balances connections
+        ("grpc.so_reuseport", 1 if reuse_port else 0),
+        ("grpc.max_receive_message_length", GRPC_MAX_RECEIVE_MESSAGE_BYTES),
+        ("grpc.max_send_message_length", GRPC_MAX_SEND_MESSAGE_BYTES),
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", GRPC_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_ping_interval_without_data_ms", GRPC_KEEPALIVE_MIN_PING_INTERVAL_MS),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+    if GRPC_MAX_CONNECTION_IDLE_MS > 0:
+        options.append(("grpc.max_connection_idle_ms", GRPC_MAX_CONNECTION_IDLE_MS))
+    if GRPC_MAX_CONNECTION_AGE_MS > 0:
+        options.append(("grpc.max_connection_age_ms", GRPC_MAX_CONNECTION_AGE_MS))
+        # Let in-flight RPCs finish when a connection reaches its max age
+        options.append(("grpc.max_connection_age_grace_ms", int(GRPC_SHUTDOWN_GRACE_SECONDS * 1000)))
+    return options
+
+def create_grpc_server(
+    reuse_port: bool = False,
+    interceptors: Sequence[grpc_aio.ServerInterceptor] = (),
+    maximum_concurrent_rpcs: Optional[int] = GRPC_MAX_CONCURRENT_RPCS,
+    compression: str = GRPC_COMPRESSION,
+) -> grpc_aio.Server:
+    """
+    Build the async gRPC server with the service's servicers registered.
+
+    Once `maximum_concurrent_rpcs` RPCs are in flight, further RPCs are
+    rejected straight away with RESOURCE_EXHAUSTED instead of queueing, so an
+    overloaded server sheds load and clients can back off or try another
+    process. The caller binds the port.
+
+    Args:
+        reuse_port: Set SO_REUSEPORT so several processes can share the port
+        interceptors: Server interceptors, run in order for every RPC after the metrics
+            interceptor (installed unless METRICS_ENABLED is false)
+        maximum_concurrent_rpcs: In-flight RPC ceiling; 0 or None means unlimited
+        compression: Default response compression, one of COMPRESSION_ALGORITHMS
+
+    Returns:
+        The server, not yet started
+    """
+    if compression not in COMPRESSION_ALGORITHMS:
+        raise ValueError(f"Unknown gRPC compression {compression!r}, expected one of {sorted(COMPRESSION_ALGORITHMS)}")
+    if METRICS_ENABLED:
+        interceptors = [MetricsInterceptor(), *interceptors]
+    server = grpc_aio.server(
+        interceptors=list(interceptors),
+        options=grpc_server_options(reuse_port),
+        maximum_concurrent_rpcs=maximum_concurrent_rpcs or None,
+        compression=COMPRESSION_ALGORITHMS[compression],
+    )
+    # Register the servicers with the server
     greeter_pb2_grpc.add_GreeterServicer_to_server(GreeterServicer(), server)
     user_pb2_grpc.add_UserServicer_to_server(UserServicer(), server)
-    
+    post_pb2_grpc.add_PostServicer_to_server(PostServicer(), server)
+    return server
+
+async def serve_grpc(reuse_port: bool = GRPC_PROCESSES > 1):
+    logging.info("Setting up gRPC server...")
+    # Create the asynchronous gRPC server
+    server = create_grpc_server(reuse_port=reuse_port)
+
     # Listen on configured address and port
     server.add_insecure_port(GRPC_SERVER_ADDR)
     logging.info(f"Adding insecure port: {GRPC_SERVER_ADDR}")
     
     # Start the server and print a startup message
     await server.start()
-    logging.info(f"gRPC server started on {GRPC_SERVER_ADDR}")
+    logging.info(f"gRPC server started on {GRPC_SERVER_ADDR} (max concurrent RPCs: {GRPC_MAX_CONCURRENT_RPCS or 'unlimited'})")
     
-    # Keep the server running indefinitely
-    await server.wait_for_termination()
+    # Keep the server running until cancelled, then give in-flight RPCs a grace period
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(GRPC_SHUTDOWN_GRACE_SECONDS)
+
+def _grpc_process_main(reuse_port: bool):
+    configure_process_logging()
+    try:
+        asyncio.run(serve_grpc(reuse_port=reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+def run_grpc_processes(processes: int = GRPC_PROCESSES):
+    """
+    Serve gRPC from `processes` processes, each with its own event loop, sharing the port via SO_REUSEPORT.
+
+    Blocks until every server process exits.
+    """
+    if processes <= 1:
+        _grpc_process_main(reuse_port=False)
+    else:
+        run_processes(_grpc_process_main, (True,), processes, name="grpc-server")
 
 if __name__ == '__main__':
     logging.info("Running gRPC server directly...")
-    asyncio.run(serve_grpc())
+    run_grpc_processes()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+import grpc
+from grpc.experimental import aio as grpc_aio
+from utils.metrics import metrics
+
+GRPC_HANDLED = metrics.counter(
+    "grpc_server_handled", "RPCs completed on the server by method and status code", ("grpc_method", "grpc_code")
+)
+GRPC_HANDLING_SECONDS = metrics.histogram(
+    "grpc_server_handling_seconds", "RPC latency on the server by method, until the last response is sent",
+    ("grpc_method",)
+)
+
+
+def _status(context, error: BaseException = None) -> str:
+    code = context.code()
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    if error is None:
+        return "OK"
+    if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+        return "CANCELLED"
+    return "UNKNOWN"
+
+
+class MetricsInterceptor(grpc_aio.ServerInterceptor):
+    """Records count by status code and latency for every RPC."""
+
+    def __init__(self):
+        # Method -> (handler from the continuation, instrumented handler)
+        self._wrapped: dict[str, tuple] = {}
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method
+        cached = self._wrapped.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        wrapped = self._instrument(handler, method)
+        self._wrapped[method] = (handler, wrapped)
+        return wrapped
+
+    @staticmethod
+    def _instrument(handler, method: str):
+        latency = GRPC_HANDLING_SECONDS.labels(method)
+
+        def record(context, start, error=None):
+            latency.observe(time.perf_counter() - start)
+            GRPC_HANDLED.labels(method, _status(context, error)).inc()
+
+        def unary_response(behavior):
+            async def instrumented(request, context):
+                start = time.perf_counter()
+                try:
+                    response = await behavior(request, context)
+                except BaseException as e:
+                    record(context, start, e)
+                    raise
+                record(context, start)
+                return response
+            return instrumented
+
+        def stream_response(behavior):
+            async def instrumented(request, context):
+                start = time.perf_counter()
+                try:
+                    result = behavior(request, context)
+                    if hasattr(result, "__aiter__"):
+                        async for response in result:
+                            yield response
+                    else:
+                        # Handlers that write with context.write() and return
+                        await result
+                except BaseException as e:
+                    record(context, start, e)
+                    raise
+                record(context, start)
+            return instrumented
+
+        kwargs = {
+            "request_deserializer": handler.request_deserializer,
+            "response_serializer": handler.response_serializer,
+        }
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(unary_response(handler.unary_unary), **kwargs)
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(unary_response(handler.stream_unary), **kwargs)
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(stream_response(handler.unary_stream), **kwargs)
+        if handler.stream_stream:
+            return grpc.stream_stream_rpc_method_handler(stream_response(handler.stream_stream), **kwargs)
+        return handler
@@ -0,0 +1,58 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from database.slow_queries import slow_query_log
+from utils.profiling import PROFILE_FORMATS, ProfilerBusy, profile_event_loop
+from utils.request_timing import slow_requests
+from config import ADMIN_TOKEN, ADMIN_PROFILE_MAX_SECONDS
+
+async def require_admin(x_admin_token: str | None = Header(default=None)):
+    # compare_digest so the token can't be guessed byte by byte from response times
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+# Only mounted by app.py when ADMIN_TOKEN is set
+router = APIRouter(dependencies=[Depends(require_admin)], include_in_schema=False)
+
+@router.post("/profile")
+async def profile(
+    seconds: float = Query(10, gt=0, le=ADMIN_PROFILE_MAX_SECONDS),
+    profile_format: str = Query("collapsed", alias="format", description=f"One of {', '.join(PROFILE_FORMATS)}"),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """
+    Profile this process's event loop for `seconds` and download the result.
+
+    collapsed: sampled folded stacks, for flamegraph.pl or speedscope.
+    pstats: a cProfile trace, for `python -m pstats` or snakeviz.
+    """
+    if profile_format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(PROFILE_FORMATS)}")
+    try:
+        data = await profile_event_loop(seconds, profile_format, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    filename = "profile.folded" if profile_format == "collapsed" else "profile.pstats"
+    media_type = "text/plain" if profile_format == "collapsed" else "application/octet-stream"
+    return Response(data, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.get("/slow-queries")
+async def get_slow_queries(explain: bool = Query(False, description="Add EXPLAIN plans (runs one EXPLAIN per query)")):
+    """The slowest SQL statements seen by the reader and writer engines, slowest first."""
+    entries = slow_query_log.entries()
+    if explain:
+        for entry in entries:
+            await slow_query_log.explain(entry)
+    return [entry.to_dict() for entry in entries]
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    slow_query_log.clear()
+
+@router.get("/slow-requests")
+async def get_slow_requests():
+    """Recent requests slower than SLOW_REQUEST_MS with their DB / handler / serialization breakdown, newest first."""
+    return list(reversed(slow_requests.entries))
+
+@router.delete("/slow-requests", status_code=204)
+async def clear_slow_requests():
+    slow_requests.clear()
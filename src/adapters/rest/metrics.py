@@ -0,0 +1,58 @@
+import time
+from fastapi import APIRouter, Response
+from utils.metrics import metrics, CONTENT_TYPE
+
+router = APIRouter()
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency.
+
+    Requests are labelled with the matched route template (e.g.
+    /users/{user_id}) rather than the raw path, so label cardinality stays
+    bounded; requests that match no route are labelled "unmatched". Written
+    as plain ASGI rather than with @app.middleware("http") to avoid the
+    per-request overhead of BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, path, status).inc()
+            HTTP_REQUEST_SECONDS.labels(method, path).observe(elapsed)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Every metric in this process, in the Prometheus text format."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,129 @@
+from fastapi import APIRouter, HTTPException, Query
+from services.post_service import (
+    get_post_by_id,
+    list_user_posts,
+    get_users_with_posts,
+    create_post as service_create_post,
+)
+from adapters.rest.timing import TimedRoute
+from adapters.rest.responses import FastJSONResponse, POST, POSTS, USERS_WITH_POSTS, post_dict, user_with_posts_dict
+from dto.post_dto import PostDTO, PostCreateDTO, UserWithPostsDTO
+from config import POSTS_PAGE_DEFAULT_LIMIT, POSTS_PAGE_MAX_LIMIT, POSTS_BY_USERS_MAX_IDS
+
+# Endpoints return FastJSONResponse; response_model only documents the shape (see user_controller)
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/", response_model=PostDTO, status_code=201)
+async def create_post_endpoint(post: PostCreateDTO):
+    """
+    Create a post for a user.
+    ---
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            user_id:
+              type: integer
+            title:
+              type: string
+            content:
+              type: string
+          required:
+            - user_id
+            - title
+            - content
+    responses:
+      201:
+        description: Post created successfully.
+      404:
+        description: User not found.
+    """
+    new_post = await service_create_post(post.user_id, post.title, post.content)
+    if new_post is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return FastJSONResponse(post_dict(new_post), POST, status_code=201)
+
+@router.get("/by-users", response_model=list[UserWithPostsDTO])
+async def get_users_with_posts_endpoint(user_ids: list[int] = Query(..., min_length=1)):
+    """
+    Retrieve users together with all of their posts, ordered by user id.
+    Posts for every user are loaded with one query; ids that don't exist are left out.
+    ---
+    parameters:
+      - name: user_ids
+        in: query
+        type: array
+        items:
+          type: integer
+        collectionFormat: multi
+        required: true
+        description: Ids of the users to return, e.g. ?user_ids=1&user_ids=2.
+    responses:
+      200:
+        description: A list of users, each with a `posts` list.
+      413:
+        description: Too many ids in one request.
+    """
+    if len(user_ids) > POSTS_BY_USERS_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"At most {POSTS_BY_USERS_MAX_IDS} users can be requested at once")
+    users = await get_users_with_posts(user_ids)
+    return FastJSONResponse([user_with_posts_dict(user) for user in users], USERS_WITH_POSTS)
+
+@router.get("/by-user/{user_id}", response_model=list[PostDTO])
+async def list_user_posts_endpoint(
+    user_id: int,
+    limit: int = Query(POSTS_PAGE_DEFAULT_LIMIT, ge=1, le=POSTS_PAGE_MAX_LIMIT),
+    after: int | None = None,
+):
+    """
+    Retrieve a page of a user's posts ordered by id.
+    When a full page is returned, the X-Next-Cursor header holds the value to pass as `after` for the next page.
+    ---
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the author.
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Maximum number of posts to return.
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Only return posts with an id greater than this cursor.
+    responses:
+      200:
+        description: A list of posts.
+    """
+    posts = await list_user_posts(user_id, limit=limit, after=after)
+    headers = {"X-Next-Cursor": str(posts[-1].id)} if len(posts) == limit else None
+    return FastJSONResponse([post_dict(post) for post in posts], POSTS, headers=headers)
+
+@router.get("/{post_id}", response_model=PostDTO)
+async def get_post(post_id: int):
+    """
+    Retrieve a post by ID.
+    ---
+    parameters:
+      - name: post_id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the post to retrieve.
+    responses:
+      200:
+        description: A post object.
+      404:
+        description: Post not found.
+    """
+    post = await get_post_by_id(post_id)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return FastJSONResponse(post_dict(post), POST)
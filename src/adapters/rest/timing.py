@@ -0,0 +1,80 @@
+import functools
+import inspect
+import time
+from fastapi.routing import APIRoute
+from utils.request_timing import RequestTiming, current_request_timing, slow_requests
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware that times each request's phases and keeps a breakdown
+    of slow ones in utils.request_timing.slow_requests.
+
+    Query time is added by the database layer's cursor events; endpoint
+    time is marked by TimedRoute.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(scope["method"], scope["path"])
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing.response_start = time.perf_counter()
+            await send(message)
+
+        token = current_request_timing.set(timing)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_timing.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                timing.path = route.path
+            slow_requests.record(timing, status, time.perf_counter())
+
+
+def _timed_endpoint(call):
+    """Wrap an endpoint so the current request's timing records when it ran."""
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def timed(*args, **kwargs):
+            timing = current_request_timing.get()
+            if timing is None:
+                return await call(*args, **kwargs)
+            timing.handler_start = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timing.handler_end = time.perf_counter()
+    else:
+        @functools.wraps(call)
+        def timed(*args, **kwargs):
+            # Sync endpoints run in the threadpool, which copies the request's context
+            timing = current_request_timing.get()
+            if timing is None:
+                return call(*args, **kwargs)
+            timing.handler_start = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                timing.handler_end = time.perf_counter()
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute whose endpoint marks its start and end in the request's timing breakdown."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # Wrapped before APIRoute builds its dependant, so routers included
+        # elsewhere (which rebuild it) call the timed endpoint too
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from services.user_service import UserService
-from dto.user_dto import UserDTO
+from services.user_service import (
+    get_all_users,
+    get_user_by_id,
+    stream_users,
+    create_user as service_create_user,
+    bulk_upsert_users as service_bulk_upsert_users,
+    update_user as service_update_user,
+    patch_user as service_patch_user,
+)
+from adapters.rest.timing import TimedRoute
+from adapters.rest.responses import FastJSONResponse, BULK_USERS, user_dict, user_response, users_response, users_ndjson
+from dto.user_dto import UserDTO, UserPatchDTO, BulkUsersRequest, BulkUsersResponse
+from config import USERS_PAGE_DEFAULT_LIMIT, USERS_PAGE_MAX_LIMIT, USERS_BULK_MAX_ROWS
 
-router = APIRouter()
-user_service = UserService()
+# TimedRoute marks endpoint time in the slow request breakdown.
+# Endpoints return FastJSONResponse built from the ORM rows, so each response
+# is validated and encoded once; response_model only documents the shape in OpenAPI.
+router = APIRouter(route_class=TimedRoute)
 
 class User(BaseModel):
     id: int
@@ -15,11 +29,38 @@ class UserCreate(BaseModel):
     name: str
     email: str
 
+async def _users_ndjson(after: int | None):
+    """Encode streamed user chunks as newline-delimited JSON."""
+    async for rows in stream_users(after=after):
+        yield users_ndjson(rows)
+
 @router.get("/", response_model=list[UserDTO])
-async def get_users():
+async def get_users(
+    limit: int = Query(USERS_PAGE_DEFAULT_LIMIT, ge=1, le=USERS_PAGE_MAX_LIMIT),
+    after: int | None = None,
+    stream: bool = False,
+):
     """
-    Retrieve a list of all users.
+    Retrieve a page of users ordered by id.
+    When a full page is returned, the X-Next-Cursor header holds the value to pass as `after` for the next page.
+    With stream=true, all users after the cursor are streamed as NDJSON and `limit` is ignored.
     ---
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Maximum number of users to return.
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Only return users with an id greater than this cursor.
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Stream users as application/x-ndjson.
     responses:
       200:
         description: A list of users.
@@ -35,8 +76,12 @@ async def get_users():
               email:
                 type: string
     """
-    users = await user_service.get_all_users()
-    return [UserDTO(id=user.id, name=user.name, email=user.email) for user in users]
+    if stream:
+        return StreamingResponse(_users_ndjson(after), media_type="application/x-ndjson")
+
+    users = await get_all_users(limit=limit, after=after)
+    headers = {"X-Next-Cursor": str(users[-1].id)} if len(users) == limit else None
+    return users_response(users, headers=headers)
 
 @router.get("/{user_id}", response_model=UserDTO)
 async def get_user(user_id: int):
@@ -69,10 +114,10 @@ async def get_user(user_id: int):
             error:
               type: string
     """
-    user_serialized = await user_service.get_user_by_id(user_id)
+    user_serialized = await get_user_by_id(user_id)
     if user_serialized is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserDTO(id=user_serialized.id, name=user_serialized.name, email=user_serialized.email)
+    return user_response(user_serialized)
 
 @router.post("/", response_model=UserDTO, status_code=201)
 async def create_user_endpoint(user: UserCreate):
@@ -106,8 +151,75 @@ async def create_user_endpoint(user: UserCreate):
             email:
               type: string
     """
-    new_user_serialized = await user_service.create_user(user.name, user.email)
-    return UserDTO(id=new_user_serialized.id, name=new_user_serialized.name, email=new_user_serialized.email)
+    new_user_serialized = await service_create_user(user.name, user.email)
+    return user_response(new_user_serialized, status_code=201)
+
+@router.post("/bulk", response_model=BulkUsersResponse)
+async def bulk_upsert_users_endpoint(request: BulkUsersRequest):
+    """
+    Create or update many users in one request, matched on email.
+    Rows that could not be written are reported in `conflicts` by their index in the request.
+    ---
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  name:
+                    type: string
+                  email:
+                    type: string
+            on_conflict:
+              type: string
+              enum: [update, skip]
+              description: Update the name of existing users (default) or skip them.
+    responses:
+      200:
+        description: The users written and the rows that were rejected.
+        schema:
+          type: object
+          properties:
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  name:
+                    type: string
+                  email:
+                    type: string
+            conflicts:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  email:
+                    type: string
+                  reason:
+                    type: string
+      413:
+        description: Too many users in one request.
+    """
+    if len(request.users) > USERS_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {USERS_BULK_MAX_ROWS} users can be imported at once")
+    result = await service_bulk_upsert_users(
+        [user.model_dump() for user in request.users], on_conflict=request.on_conflict
+    )
+    return FastJSONResponse({
+        "users": [user_dict(user) for user in result["users"]],
+        "conflicts": result["conflicts"],
+    }, BULK_USERS)
 
 @router.put("/{user_id}", response_model=UserDTO)
 async def update_user_endpoint(user_id: int, user: UserCreate):
@@ -150,7 +262,54 @@ async def update_user_endpoint(user_id: int, user: UserCreate):
             error:
               type: string
     """
-    updated_user_serialized = await user_service.update_user(user_id, user.name, user.email)
+    updated_user_serialized = await service_update_user(user_id, user.name, user.email)
     if updated_user_serialized is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserDTO(id=updated_user_serialized.id, name=updated_user_serialized.name, email=updated_user_serialized.email)
+    return user_response(updated_user_serialized)
+
+@router.patch("/{user_id}", response_model=UserDTO)
+async def patch_user_endpoint(user_id: int, user: UserPatchDTO):
+    """
+    Partially update an existing user. Only the fields present in the body are changed.
+    ---
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the user to update.
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            name:
+              type: string
+            email:
+              type: string
+    responses:
+      200:
+        description: User updated successfully.
+        schema:
+          type: object
+          properties:
+            id:
+              type: integer
+            name:
+              type: string
+            email:
+              type: string
+      404:
+        description: User not found.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    changes = user.model_dump(exclude_unset=True, exclude_none=True)
+    patched_user_serialized = await service_patch_user(user_id, changes)
+    if patched_user_serialized is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user_response(patched_user_serialized)
@@ -0,0 +1,127 @@
+import json
+import logging
+from typing import Optional
+from config import SQS_JSON_BACKEND, SQS_DEDUP_ATTRIBUTE
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _load_json_backend(name: str):
+    """Return (name, loads, error types) for the configured JSON library, falling back to json."""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson.loads, (orjson.JSONDecodeError,)
+        except ImportError:
+            if name == "orjson":
+                logger.warning("SQS_JSON_BACKEND=orjson but orjson is not installed, using json")
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return "msgspec", msgspec.json.decode, (msgspec.DecodeError,)
+        except ImportError:
+            if name == "msgspec":
+                logger.warning("SQS_JSON_BACKEND=msgspec but msgspec is not installed, using json")
+    return "json", json.loads, (json.JSONDecodeError,)
+
+
+json_backend, _loads, _decode_errors = _load_json_backend(SQS_JSON_BACKEND)
+
+
+class DecodeError(ValueError):
+    """The message declares JSON content that can't be parsed."""
+
+
+class MessageEnvelope:
+    """
+    A decoded SQS message as handed to handlers.
+
+    `content` is the parsed JSON payload when the content type is
+    application/json and the raw text otherwise. For SNS notifications
+    delivered through SQS, type, content type and content come from the
+    SNS envelope. `idempotency_key` is the sender-supplied SQS_DEDUP_ATTRIBUTE,
+    if any. `message` is the raw SQS message dict.
+    """
+
+    __slots__ = ("message_id", "receipt_handle", "message_type", "content_type", "content", "is_sns",
+                 "idempotency_key", "message")
+
+    def __init__(self, message_id, receipt_handle, message_type, content_type, content, is_sns,
+                 message, idempotency_key=None):
+        self.message_id = message_id
+        self.receipt_handle = receipt_handle
+        self.message_type = message_type
+        self.content_type = content_type
+        self.content = content
+        self.is_sns = is_sns
+        self.idempotency_key = idempotency_key
+        self.message = message
+
+    def __repr__(self):
+        return f"<MessageEnvelope id={self.message_id} type={self.message_type} sns={self.is_sns}>"
+
+
+def _attribute(attributes: dict, name: str, value_key: str, legacy_name: Optional[str] = None):
+    attribute = attributes.get(name) or (attributes.get(legacy_name) if legacy_name else None)
+    return attribute.get(value_key) if attribute else None
+
+
+def decode_message(message: dict) -> MessageEnvelope:
+    """
+    Detect SNS envelopes and parse the payload, parsing each JSON document once.
+
+    Bodies that don't start with "{" are never handed to the JSON parser. A
+    plain SQS JSON body parsed while looking for an SNS envelope is reused as
+    the content rather than parsed again.
+
+    Raises:
+        DecodeError: If the content type is application/json but the payload is not valid JSON
+    """
+    body = message.get("Body") or ""
+    parsed = None
+    if body[:1] == "{":
+        try:
+            parsed = _loads(body)
+        except _decode_errors:
+            parsed = None
+
+    if type(parsed) is dict and parsed.get("Type") == "Notification":
+        attributes = parsed.get("MessageAttributes") or {}
+        message_type = _attribute(attributes, "Message-Type", "Value", "MessageType")
+        content_type = _attribute(attributes, "Content-Type", "Value", "ContentType")
+        idempotency_key = _attribute(attributes, SQS_DEDUP_ATTRIBUTE, "Value")
+        content = parsed.get("Message", "")
+        if content_type == JSON_CONTENT_TYPE and content:
+            try:
+                content = _loads(content)
+            except _decode_errors as e:
+                raise DecodeError(f"Invalid JSON in SNS message {parsed.get('MessageId')}: {e}") from e
+        is_sns = True
+    else:
+        attributes = message.get("MessageAttributes") or {}
+        message_type = _attribute(attributes, "Message-Type", "StringValue", "MessageType")
+        content_type = _attribute(attributes, "Content-Type", "StringValue", "ContentType")
+        idempotency_key = _attribute(attributes, SQS_DEDUP_ATTRIBUTE, "StringValue")
+        content = body
+        if content_type == JSON_CONTENT_TYPE and body:
+            if parsed is None:
+                # Arrays, scalars and bodies with leading whitespace weren't parsed above
+                try:
+                    parsed = _loads(body)
+                except _decode_errors as e:
+                    raise DecodeError(f"Invalid JSON in message {message.get('MessageId')}: {e}") from e
+            content = parsed
+        is_sns = False
+
+    return MessageEnvelope(
+        message.get("MessageId"),
+        message.get("ReceiptHandle"),
+        message_type,
+        content_type,
+        content,
+        is_sns,
+        message,
+        idempotency_key,
+    )
@@ -0,0 +1,129 @@
+import logging
+from typing import Optional
+from utils.cache import LRUTTLCache
+from config import (
+    SQS_DEDUP_ENABLED,
+    SQS_DEDUP_MAXSIZE,
+    SQS_DEDUP_TTL_SECONDS,
+    SQS_DEDUP_DB_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of MessageDeduplicator.claim
+CLAIMED = "claimed"
+DUPLICATE = "duplicate"
+IN_PROGRESS = "in_progress"
+
+
+class MessageDeduplicator:
+    """
+    Remembers which messages were handled successfully so redeliveries are skipped.
+
+    Processed keys are kept in a bounded in-memory window for `ttl` seconds.
+    With a repository they are also written to the processed_messages table,
+    so other consumer processes and restarts see them. Keys being handled
+    right now are tracked too, so a concurrent redelivery isn't run twice.
+    """
+
+    def __init__(self, window: LRUTTLCache, repository=None, ttl: float = SQS_DEDUP_TTL_SECONDS,
+                 purge_every: int = 1000):
+        self.window = window
+        self.repository = repository
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._processing: set[str] = set()
+        self.claims = 0
+        self.completed = 0
+        self.duplicates = 0
+        self.in_progress_duplicates = 0
+        self.db_hits = 0
+        self.db_errors = 0
+
+    async def claim(self, key: str) -> str:
+        """
+        Claim a message for processing.
+
+        Returns:
+            CLAIMED if it should be handled, DUPLICATE if it was already processed,
+            or IN_PROGRESS if another delivery of it is being handled right now
+        """
+        if key in self._processing:
+            self.in_progress_duplicates += 1
+            return IN_PROGRESS
+        found, _ = self.window.get(key)
+        if found:
+            self.duplicates += 1
+            return DUPLICATE
+
+        # Claim before awaiting the database so a concurrent redelivery sees it
+        self._processing.add(key)
+        if self.repository is not None:
+            try:
+                processed = await self.repository.is_processed(key)
+            except Exception as e:
+                # Fail open: processing twice is better than not at all
+                self.db_errors += 1
+                logger.warning(f"Dedup lookup failed for {key}, processing anyway: {e}")
+                processed = False
+            if processed:
+                self._processing.discard(key)
+                self.window.set(key, True)
+                self.duplicates += 1
+                self.db_hits += 1
+                return DUPLICATE
+        self.claims += 1
+        return CLAIMED
+
+    async def complete(self, key: str, message_type: str):
+        """Record a successfully handled message."""
+        self._processing.discard(key)
+        self.window.set(key, True)
+        self.completed += 1
+        if self.repository is None:
+            return
+        try:
+            await self.repository.mark_processed(key, message_type, self.ttl)
+            # Counted here rather than off claims, which also go up for failures and retries
+            if self.completed % self.purge_every == 0:
+                await self.repository.purge_expired()
+        except Exception as e:
+            self.db_errors += 1
+            logger.warning(f"Failed to record processed message {key}: {e}")
+
+    def release(self, key: str):
+        """Give up a claim after a failure so the redelivery is handled."""
+        self._processing.discard(key)
+
+    def clear(self):
+        self._processing.clear()
+        self.window.clear()
+
+    def stats(self) -> dict:
+        return {
+            "claims": self.claims,
+            "completed": self.completed,
+            "duplicates_skipped": self.duplicates,
+            "in_progress_duplicates": self.in_progress_duplicates,
+            "db_hits": self.db_hits,
+            "db_errors": self.db_errors,
+            "window_size": len(self.window),
+        }
+
+
+def build_message_deduplicator() -> Optional[MessageDeduplicator]:
+    """Build the process-wide deduplicator from config, or None if deduplication is disabled."""
+    if not SQS_DEDUP_ENABLED:
+        return None
+    repository = None
+    if SQS_DEDUP_DB_ENABLED:
+        # Imported lazily so the consumer only needs the database when the table is used
+        from data_access.processed_message_repo import ProcessedMessageRepository
+        repository = ProcessedMessageRepository()
+    return MessageDeduplicator(
+        LRUTTLCache(maxsize=SQS_DEDUP_MAXSIZE, ttl=SQS_DEDUP_TTL_SECONDS),
+        repository=repository,
+    )
+
+
+message_dedup = build_message_deduplicator()
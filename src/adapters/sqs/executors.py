@@ -0,0 +1,58 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from config import SQS_HANDLER_THREADS, SQS_HANDLER_PROCESSES
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("async", "thread", "process")
+
+
+class HandlerExecutors:
+    """
+    The thread and process pools that sync handlers registered with
+    mode="thread" or mode="process" run in, so they don't block the event
+    loop shared with FastAPI and gRPC. Pools are created on first use.
+    """
+
+    def __init__(self, threads: int = SQS_HANDLER_THREADS, processes: int = SQS_HANDLER_PROCESSES):
+        self.threads = threads
+        self.processes = processes
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get(self, mode: str) -> Executor:
+        with self._lock:
+            if mode == "thread":
+                if self._thread_pool is None:
+                    logger.info(f"Starting SQS handler thread pool with {self.threads} threads")
+                    self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="sqs-handler")
+                return self._thread_pool
+            if mode == "process":
+                if self._process_pool is None:
+                    logger.info(f"Starting SQS handler process pool with {self.processes} processes")
+                    # spawn, not fork: the parent has running event loops and open connections
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+                    )
+                return self._process_pool
+        raise ValueError(f"No executor for execution mode {mode!r}")
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the pools, waiting for running handlers if `wait`; queued ones are cancelled."""
+        with self._lock:
+            pools = [pool for pool in (self._thread_pool, self._process_pool) if pool is not None]
+            self._thread_pool = None
+            self._process_pool = None
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+handler_executors = HandlerExecutors()
+
+
+def shutdown_handler_executors(wait: bool = True):
+    handler_executors.shutdown(wait=wait)
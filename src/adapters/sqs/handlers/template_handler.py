@@ -1,2 +1,9 @@
-async def handle_template(message: dict, content: dict | str):
-    print(content)
+import logging
+from ..decoder import MessageEnvelope
+from ..registry import register_handler
+
+logger = logging.getLogger(__name__)
+
+@register_handler("template")
+async def handle_template(envelope: MessageEnvelope):
+    logger.debug(f"Template message {envelope.message_id}: {envelope.content}")
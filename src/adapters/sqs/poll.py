@@ -1,77 +1,403 @@
 import asyncio
+import itertools
 import logging
-from adapters.sqs.router import route_message
-from adapters.sqs.sqs_session import get_sqs_client
-from config import SQS_QUEUE_URL
+import time
+from collections import deque
+from adapters.sqs.decoder import DecodeError, decode_message
+from adapters.sqs.router import route_message, route_envelope, route_table
+from adapters.sqs.executors import shutdown_handler_executors
+from adapters.sqs.dedup import message_dedup
+from adapters.sqs.sqs_session import get_sqs_client, check_sqs_settings
+from utils.aws_clients import close_aws_clients
+from utils.batching import MicroBatcher
+from utils.processes import configure_process_logging, run_processes
+from config import (
+    SQS_QUEUE_URL,
+    SQS_RECEIVER_COUNT,
+    SQS_WORKER_CONCURRENCY,
+    SQS_MAX_IN_FLIGHT,
+    SQS_VISIBILITY_TIMEOUT,
+    SQS_HEARTBEAT_INTERVAL,
+    SQS_DELETE_LINGER_MS,
+    SQS_CONSUMER_PROCESSES,
+)
 
 logger = logging.getLogger(__name__)
 
-async def receive_message(queue_url: str):
-    async with await get_sqs_client() as client:
-        response = await client.receive_message(
-            QueueUrl=queue_url,
-            MaxNumberOfMessages=10,
-            WaitTimeSeconds=20,
-            VisibilityTimeout=20,
-            MessageAttributeNames=["All"]
-        )
+# SQS never returns more than 10 messages per receive call
+MAX_RECEIVE_BATCH = 10
+
+async def receive_message(queue_url: str, max_messages: int = MAX_RECEIVE_BATCH,
+                          visibility_timeout: int = SQS_VISIBILITY_TIMEOUT):
+    client = await get_sqs_client()
+    response = await client.receive_message(
+        QueueUrl=queue_url,
+        MaxNumberOfMessages=max_messages,
+        WaitTimeSeconds=20,
+        VisibilityTimeout=visibility_timeout,
+        MessageAttributeNames=["All"]
+    )
     return response.get("Messages", [])
 
+async def delete_message_batch(queue_url: str, entries: list[dict]) -> dict:
+    """Delete up to 10 messages in one call and return the raw batch response."""
+    client = await get_sqs_client()
+    return await client.delete_message_batch(
+        QueueUrl=queue_url,
+        Entries=entries
+    )
+
+def _delete_entry_size(entry: dict) -> int:
+    return len(entry["ReceiptHandle"])
+
+def new_ack_batcher(linger_ms: float = SQS_DELETE_LINGER_MS) -> MicroBatcher:
+    """
+    Batcher for deletes: acks from concurrent workers go out together in
+    delete_message_batch calls once 10 are waiting or after `linger_ms`.
+    """
+    return MicroBatcher(delete_message_batch, _delete_entry_size, linger=linger_ms / 1000)
+
+async def change_visibility(queue_url: str, entries: list[dict]):
+    """Change the visibility timeout of messages, 10 per call, logging (not raising) any failures."""
+    try:
+        client = await get_sqs_client()
+        for start in range(0, len(entries), MAX_RECEIVE_BATCH):
+            response = await client.change_message_visibility_batch(
+                QueueUrl=queue_url,
+                Entries=entries[start:start + MAX_RECEIVE_BATCH]
+            )
+            for failed in response.get("Failed", []):
+                logger.error(f"Failed to change message visibility: {failed}")
+    except Exception as e:
+        logger.error(f"Error changing message visibility: {str(e)}")
+
 async def poll_messages(queue_url: str = SQS_QUEUE_URL, delete_unknown_types: bool = True):
+    """
+    Receive and handle one batch of messages, deleting each one as soon as it is handled.
+
+    SQSConsumer is the long-running equivalent used by poll_loop.
+    """
     messages = await receive_message(queue_url)
     if not messages:
         return
 
-    # Process each message and track which ones should be deleted
-    results = await asyncio.gather(
-        *(route_message(message, delete_unknown_types) for message in messages),
-        return_exceptions=True
-    )
-    
-    # Determine which messages to delete
-    messages_to_delete = []
-    for i, result in enumerate(results):
-        message = messages[i]
-        
-        # Handle exceptions raised during processing
-        if isinstance(result, Exception):
-            logger.error(f"Error routing message {message.get('MessageId')}: {str(result)}")
-            continue
-            
-        # If result is True, the message was successfully processed or should be deleted
-        if result:
-            messages_to_delete.append({
-                "Id": message["MessageId"],
-                "ReceiptHandle": message["ReceiptHandle"]
-            })
-    
-    # Delete messages that were successfully processed or should be deleted
-    if messages_to_delete:
-        async with await get_sqs_client() as client:
+    acks = new_ack_batcher()
+
+    async def handle(message: dict):
+        try:
+            delete = await route_message(message, delete_unknown_types)
+        except Exception as e:
+            logger.error(f"Error routing message {message.get('MessageId')}: {str(e)}")
+            return
+        if delete:
             try:
-                response = await client.delete_message_batch(
-                    QueueUrl=queue_url,
-                    Entries=messages_to_delete
+                await acks.submit(queue_url, {"ReceiptHandle": message["ReceiptHandle"]})
+            except Exception as e:
+                logger.error(f"Failed to delete message {message.get('MessageId')}: {e}")
+
+    await asyncio.gather(*(handle(message) for message in messages))
+
+
+class _Received:
+    """A received message waiting in its lane for a worker."""
+
+    __slots__ = ("seq", "message", "envelope")
+
+    def __init__(self, seq, message, envelope):
+        self.seq = seq
+        self.message = message
+        self.envelope = envelope
+
+
+class SQSConsumer:
+    """
+    Concurrent SQS consumer.
+
+    The consumer is a pipeline of independent stages: receivers feed
+    workers, and workers feed an ack batcher, so no message waits on the
+    others it was received with.
+
+    `receivers` long-poll loops decode messages into per-type lanes, from
+    which a dispatcher starts handlers bounded by a semaphore of
+    `worker_concurrency`. The dispatcher picks the highest-priority lane
+    whose type is below its registered max_concurrency, oldest message
+    first, so one slow type can't take every worker. Receivers pause while
+    `max_in_flight` messages are received but not yet deleted, so a slow
+    handler backs up into SQS rather than into memory. As soon as a handler
+    finishes, its worker is free for the next message while the delete
+    waits in the ack batcher, which sends delete_message_batch once 10
+    deletes are waiting or `delete_linger_ms` has passed.
+
+    Every `heartbeat_interval` seconds, received messages within two
+    intervals of their visibility deadline are extended with
+    change_message_visibility_batch, by the handler's visibility_timeout or
+    `visibility_timeout`. Messages whose handler fails are made visible
+    again straight away so their retry doesn't wait out the timeout. A
+    thread or process handler that times out keeps its worker until it
+    actually returns, since it still occupies its pool.
+    """
+
+    def __init__(self,
+                 queue_url: str = SQS_QUEUE_URL,
+                 receivers: int = SQS_RECEIVER_COUNT,
+                 worker_concurrency: int = SQS_WORKER_CONCURRENCY,
+                 max_in_flight: int = SQS_MAX_IN_FLIGHT,
+                 delete_unknown_types: bool = True,
+                 error_backoff: float = 0.1,
+                 visibility_timeout: int = SQS_VISIBILITY_TIMEOUT,
+                 heartbeat_interval: float = SQS_HEARTBEAT_INTERVAL,
+                 delete_linger_ms: float = SQS_DELETE_LINGER_MS):
+        self.queue_url = queue_url
+        self.receivers = receivers
+        self.worker_concurrency = worker_concurrency
+        self.max_in_flight = max_in_flight
+        self.delete_unknown_types = delete_unknown_types
+        self.error_backoff = error_backoff
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = heartbeat_interval
+
+        self.in_flight = 0
+        # Lane key is the registered message type, or None for unknown/undecodable messages
+        self._lanes: dict[str | None, deque] = {}
+        self._running: dict[str | None, int] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._capacity = asyncio.Condition()
+        self._workers = asyncio.Semaphore(worker_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        # Receipt handle -> [visibility deadline, message id, lane] for every received, undeleted message
+        self._visibility: dict[str, list] = {}
+        self.extended = 0
+        self.released = 0
+        self.deleted = 0
+        self.delete_failures = 0
+        self._acks = new_ack_batcher(delete_linger_ms)
+
+    async def run(self):
+        """Run receivers and the dispatcher until cancelled."""
+        logger.info(
+            f"Starting SQS consumer: {self.receivers} receivers, "
+            f"{self.worker_concurrency} workers, max {self.max_in_flight} in flight"
+        )
+        loops = [asyncio.create_task(self._receive_loop()) for _ in range(self.receivers)]
+        loops.append(asyncio.create_task(self._dispatch_loop()))
+        if self.heartbeat_interval > 0:
+            loops.append(asyncio.create_task(self._heartbeat_loop()))
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for task in loops + list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*loops, *self._tasks, return_exceptions=True)
+            await self._acks.flush()
+
+    async def _reserve(self) -> int:
+        """Wait until there is room below the in-flight ceiling and reserve up to one receive batch of it."""
+        async with self._capacity:
+            await self._capacity.wait_for(lambda: self.in_flight < self.max_in_flight)
+            reserved = min(MAX_RECEIVE_BATCH, self.max_in_flight - self.in_flight)
+            self.in_flight += reserved
+            return reserved
+
+    async def _release(self, count: int):
+        async with self._capacity:
+            self.in_flight -= count
+            self._capacity.notify_all()
+
+    async def _receive_loop(self):
+        while True:
+            reserved = await self._reserve()
+            try:
+                messages = await receive_message(
+                    self.queue_url, max_messages=reserved, visibility_timeout=self.visibility_timeout
                 )
-                
-                # Log any failed deletions
-                if "Failed" in response and response["Failed"]:
-                    for failed in response["Failed"]:
-                        logger.error(f"Failed to delete message: {failed}")
-                        
-                logger.info(f"Deleted {len(response.get('Successful', []))} messages from queue")
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.error(f"Error polling messages: {error}")
+                messages = []
+                await asyncio.sleep(self.error_backoff)
+
+            # Give back the part of the reservation that wasn't used
+            if len(messages) < reserved:
+                await self._release(reserved - len(messages))
+
+            received_at = time.monotonic()
+            for message in messages:
+                self._visibility[message["ReceiptHandle"]] = [
+                    received_at + self.visibility_timeout, message["MessageId"], None
+                ]
+                self._enqueue(message)
+
+    def _enqueue(self, message: dict):
+        try:
+            envelope = decode_message(message)
+        except DecodeError as e:
+            logger.error(str(e))
+            envelope = None
+        lane = envelope.message_type if envelope is not None and envelope.message_type in route_table else None
+        self._visibility[message["ReceiptHandle"]][2] = lane
+        self._lanes.setdefault(lane, deque()).append(_Received(next(self._seq), message, envelope))
+        self._wakeup.set()
+
+    def _next_ready(self):
+        """Pop the oldest message of the highest-priority lane that has room, or None."""
+        best = None
+        best_key = None
+        for lane, pending in self._lanes.items():
+            if not pending:
+                continue
+            spec = route_table.get(lane) if lane is not None else None
+            if spec is not None and spec.max_concurrency is not None \
+                    and self._running.get(lane, 0) >= spec.max_concurrency:
+                continue
+            key = (spec.priority if spec is not None else 0, -pending[0].seq)
+            if best_key is None or key > best_key:
+                best, best_key = lane, key
+        if best_key is None:
+            return None
+        self._running[best] = self._running.get(best, 0) + 1
+        return best, self._lanes[best].popleft()
+
+    async def _dispatch_loop(self):
+        while True:
+            await self._workers.acquire()
+            while (ready := self._next_ready()) is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            lane, item = ready
+            task = asyncio.create_task(self._process(lane, item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self._extend_expiring()
+
+    async def _extend_expiring(self):
+        """Extend the visibility of tracked messages that are close to their deadline."""
+        now = time.monotonic()
+        margin = 2 * self.heartbeat_interval
+        entries = []
+        for receipt_handle, tracked in self._visibility.items():
+            deadline, message_id, lane = tracked
+            if deadline - now > margin:
+                continue
+            spec = route_table.get(lane) if lane is not None else None
+            if spec is not None and not spec.heartbeat:
+                continue
+            timeout = spec.visibility_timeout if spec is not None and spec.visibility_timeout else self.visibility_timeout
+            entries.append({"Id": message_id, "ReceiptHandle": receipt_handle, "VisibilityTimeout": timeout})
+            tracked[0] = now + timeout
+        if entries:
+            self.extended += len(entries)
+            await change_visibility(self.queue_url, entries)
+
+    async def _process(self, lane, item: _Received):
+        message = item.message
+        overrun: list[asyncio.Task] = []
+        try:
+            delete = False
+            try:
+                if item.envelope is None:
+                    delete = self.delete_unknown_types
+                else:
+                    delete = await route_envelope(item.envelope, self.delete_unknown_types, on_overrun=overrun.append)
             except Exception as e:
-                logger.error(f"Error deleting messages: {str(e)}")
+                logger.error(f"Error routing message {message.get('MessageId')}: {str(e)}")
+            finally:
+                if overrun:
+                    # The handler timed out but is still busy in its pool: its worker and its
+                    # place under the type's max_concurrency stay taken until it returns
+                    overrun[0].add_done_callback(lambda _: self._free_worker(lane))
+                else:
+                    self._free_worker(lane)
+
+            if delete:
+                # Keep extending visibility until the delete has gone through
+                await self._ack(message)
+            elif delete is None:
+                # Another delivery of this message is being handled, or its offloaded handler is
+                # still running after a timeout: stop extending it and let it lapse, never release it
+                self._visibility.pop(message["ReceiptHandle"], None)
+            else:
+                # Kept messages stop being extended; failed ones go back to the queue now
+                self._visibility.pop(message["ReceiptHandle"], None)
+                spec = route_table.get(lane) if lane is not None else None
+                if spec is not None and spec.release_on_failure:
+                    self.released += 1
+                    await change_visibility(self.queue_url, [{
+                        "Id": message["MessageId"],
+                        "ReceiptHandle": message["ReceiptHandle"],
+                        "VisibilityTimeout": 0,
+                    }])
+        finally:
+            await self._release(1)
+
+    def _free_worker(self, lane):
+        self._running[lane] -= 1
+        self._workers.release()
+        self._wakeup.set()
+
+    async def _ack(self, message: dict):
+        try:
+            await self._acks.submit(self.queue_url, {"ReceiptHandle": message["ReceiptHandle"]})
+            self.deleted += 1
+        except Exception as e:
+            self.delete_failures += 1
+            logger.error(f"Failed to delete message {message.get('MessageId')}: {e}")
+        finally:
+            self._visibility.pop(message["ReceiptHandle"], None)
+
+    def stats(self) -> dict:
+        """Messages waiting for a worker and running, per lane."""
+        return {
+            "in_flight": self.in_flight,
+            "waiting": {lane: len(pending) for lane, pending in self._lanes.items()},
+            "running": dict(self._running),
+            "visibility_extended": self.extended,
+            "released_on_failure": self.released,
+            "deleted": self.deleted,
+            "delete_failures": self.delete_failures,
+            "dedup": message_dedup.stats() if message_dedup is not None else {},
+        }
+
 
 async def poll_loop(interval: float = 0.1, delete_unknown_types: bool = True):
+    check_sqs_settings()
     logger.info("Starting SQS poll loop")
-    while True:
-        try:
-            await poll_messages(SQS_QUEUE_URL, delete_unknown_types)
-        except Exception as error:
-            logger.error(f"Error polling messages: {error}")
-        await asyncio.sleep(interval)
+    consumer = SQSConsumer(
+        queue_url=SQS_QUEUE_URL,
+        delete_unknown_types=delete_unknown_types,
+        error_backoff=interval,
+    )
+    await consumer.run()
+
+async def _run_consumer_process(delete_unknown_types: bool):
+    try:
+        await poll_loop(delete_unknown_types=delete_unknown_types)
+    finally:
+        await asyncio.to_thread(shutdown_handler_executors)
+        await close_aws_clients()
+
+def _consumer_process_main(delete_unknown_types: bool):
+    configure_process_logging()
+    try:
+        asyncio.run(_run_consumer_process(delete_unknown_types))
+    except KeyboardInterrupt:
+        pass
+
+def run_consumer_processes(processes: int = SQS_CONSUMER_PROCESSES, delete_unknown_types: bool = True):
+    """
+    Run the consumer in `processes` worker processes, each with its own event loop.
+
+    A single process runs in the calling process. Blocks until every worker exits.
+    """
+    if processes <= 1:
+        _consumer_process_main(delete_unknown_types)
+    else:
+        run_processes(_consumer_process_main, (delete_unknown_types,), processes, name="sqs-consumer")
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
-    asyncio.run(poll_loop())
\ No newline at end of file
+    run_consumer_processes(SQS_CONSUMER_PROCESSES)
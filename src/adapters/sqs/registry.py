@@ -0,0 +1,157 @@
+import inspect
+import logging
+from typing import Awaitable, Callable, Optional
+from utils.metrics import metrics
+from .executors import EXECUTION_MODES
+
+logger = logging.getLogger(__name__)
+
+SQS_MESSAGES = metrics.counter(
+    "sqs_messages", "SQS messages routed, by message type and outcome", ("message_type", "outcome")
+)
+SQS_PROCESSING_SECONDS = metrics.histogram(
+    "sqs_message_processing_seconds", "Handler time per message, by message type", ("message_type",)
+)
+SQS_IN_FLIGHT = metrics.gauge(
+    "sqs_messages_in_flight", "Messages being handled right now, by message type", ("message_type",)
+)
+
+
+class HandlerSpec:
+    """
+    A registered message handler with its scheduling limits and metrics.
+
+    Args:
+        message_type: Value of the Message-Type attribute this handler serves
+        handler: Function taking a MessageEnvelope; a coroutine function for mode "async",
+            a plain function for "thread" and "process"
+        max_concurrency: Most messages of this type SQSConsumer runs at once (None for no limit)
+        timeout: Seconds before a message is abandoned and left for redelivery (None for no timeout)
+        priority: Higher priorities are dispatched first when workers are scarce
+        visibility_timeout: Seconds each heartbeat extends this type's messages by (None for the consumer default)
+        heartbeat: Whether to keep extending visibility while a message is in flight
+        release_on_failure: Make failed or timed out messages visible again immediately instead of
+            waiting for the visibility timeout to run out
+        mode: "async" runs the handler on the event loop. "thread" runs it in the shared thread
+            pool, for blocking I/O or work that releases the GIL. "process" runs it in the shared
+            process pool, for pure-Python CPU-bound work; such handlers must be module-level
+            functions since they are pickled
+        dedup: Skip messages whose MessageId or idempotency key was already handled successfully
+    """
+
+    def __init__(self,
+                 message_type: str,
+                 handler: Callable[..., Awaitable],
+                 max_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 priority: int = 0,
+                 visibility_timeout: Optional[int] = None,
+                 heartbeat: bool = True,
+                 release_on_failure: bool = True,
+                 mode: str = "async",
+                 dedup: bool = True):
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode {mode!r}, expected one of {EXECUTION_MODES}")
+        if mode != "async" and inspect.iscoroutinefunction(handler):
+            raise ValueError(f"Handler for {message_type} runs in mode {mode!r} so it must not be async")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.message_type = message_type
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.priority = priority
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat = heartbeat
+        self.release_on_failure = release_on_failure
+        self.mode = mode
+        self.dedup = dedup
+
+        self._in_flight_gauge = SQS_IN_FLIGHT.labels(message_type)
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.duplicates = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self._latency_histogram = SQS_PROCESSING_SECONDS.labels(message_type)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @in_flight.setter
+    def in_flight(self, value: int):
+        # Kept in step with the sqs_messages_in_flight gauge for this type
+        self._in_flight = value
+        self._in_flight_gauge.set(value)
+
+    def record(self, elapsed: float, outcome: str):
+        """Count one finished message; outcome is "processed", "failed" or "timeout"."""
+        if outcome == "processed":
+            self.processed += 1
+        elif outcome == "timeout":
+            self.timeouts += 1
+        else:
+            self.failed += 1
+        self.latency_total += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+        self._latency_histogram.observe(elapsed)
+        SQS_MESSAGES.labels(self.message_type, outcome).inc()
+
+    def stats(self) -> dict:
+        finished = self.processed + self.failed + self.timeouts
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "priority": self.priority,
+            "mode": self.mode,
+            "processed": self.processed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "duplicates_skipped": self.duplicates,
+            "latency_avg_ms": self.latency_total / finished * 1000 if finished else 0.0,
+            "latency_max_ms": self.latency_max * 1000,
+        }
+
+
+# Message type -> HandlerSpec, filled in by @register_handler
+route_table: dict[str, HandlerSpec] = {}
+
+
+def register_handler(message_type: str,
+                     max_concurrency: Optional[int] = None,
+                     timeout: Optional[float] = None,
+                     priority: int = 0,
+                     visibility_timeout: Optional[int] = None,
+                     heartbeat: bool = True,
+                     release_on_failure: bool = True,
+                     mode: str = "async",
+                     dedup: bool = True):
+    """
+    Decorator that registers a handler for a message type.
+
+    Example:
+        @register_handler("user_created", max_concurrency=5, timeout=10, priority=1, visibility_timeout=60)
+        async def handle_user_created(envelope: MessageEnvelope):
+            ...
+
+        @register_handler("thumbnail", mode="process", timeout=30)
+        def handle_thumbnail(envelope: MessageEnvelope):
+            ...
+    """
+    def decorator(handler):
+        if message_type in route_table:
+            logger.warning(f"Replacing handler for message type {message_type}")
+        route_table[message_type] = HandlerSpec(
+            message_type, handler, max_concurrency, timeout, priority,
+            visibility_timeout, heartbeat, release_on_failure, mode, dedup,
+        )
+        return handler
+    return decorator
+
+
+def handler_stats() -> dict:
+    """Per-message-type in-flight, outcome and latency metrics."""
+    return {message_type: spec.stats() for message_type, spec in route_table.items()}
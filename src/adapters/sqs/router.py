@@ -1,106 +1,150 @@
-import json
+import asyncio
 import logging
-from .handlers.template_handler import handle_template
+import time
+from typing import Callable, Optional
+from .decoder import DecodeError, MessageEnvelope, decode_message
+from .dedup import CLAIMED, DUPLICATE, message_dedup
+from .executors import handler_executors
+from .registry import SQS_MESSAGES, route_table, register_handler  # noqa: F401
+
+# Handlers register themselves with @register_handler when their module is imported.
+# Import new handler modules here.
+from .handlers import template_handler  # noqa: F401
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
 
-# Add your handlers here
-# The key is the message type
-# The value is the handler function
-route_table = {
-    "template": handle_template,
-}
-
 async def route_message(message: dict, delete_unknown_types: bool = True) -> bool:
     """
     Route a message to the appropriate handler based on its type.
-    
+
     Args:
         message: The SQS message to route
         delete_unknown_types: Whether to delete messages with unknown types
-        
+
     Returns:
         bool: True if the message was successfully handled, False if not
     """
-    # First, check if this is an SNS message wrapped in SQS
-    body = message.get("Body", "")
-    sns_message = None
-    is_sns_message = False
-    
-    # Try to parse the body as JSON to see if it's an SNS message
-    if body:
-        try:
-            parsed_body = json.loads(body)
-            # Check if it has SNS-specific fields
-            if isinstance(parsed_body, dict) and parsed_body.get("Type") == "Notification":
-                is_sns_message = True
-                sns_message = parsed_body
-                logger.debug("Detected SNS message")
-        except json.JSONDecodeError:
-            # Not a JSON body, so not an SNS message
-            pass
-            
-    if is_sns_message:
-        # For SNS messages, the message attributes are in the parsed body
-        sns_message_attributes = sns_message.get("MessageAttributes", {})
-        
-        # Extract message type and content type from SNS message attributes
-        message_type = None
-        content_type = None
-        
-        if "Message-Type" in sns_message_attributes:
-            message_type = sns_message_attributes["Message-Type"].get("Value")
-        elif "MessageType" in sns_message_attributes:
-            message_type = sns_message_attributes["MessageType"].get("Value")
-            
-        if "Content-Type" in sns_message_attributes:
-            content_type = sns_message_attributes["Content-Type"].get("Value")
-        elif "ContentType" in sns_message_attributes:
-            content_type = sns_message_attributes["ContentType"].get("Value")
-        
-        # The actual message content is in the "Message" field
-        content = sns_message.get("Message", "")
-        
-        if content_type == "application/json" and content:
-            try:
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON content for SNS message {sns_message.get('MessageId')}")
-                return delete_unknown_types
+    try:
+        envelope = decode_message(message)
+    except DecodeError as e:
+        logger.error(str(e))
+        SQS_MESSAGES.labels("", "decode_error").inc()
+        return delete_unknown_types
+    return await route_envelope(envelope, delete_unknown_types)
+
+# Offloaded handler calls that outlived their timeout, kept referenced until they return
+_overrunning: set[asyncio.Task] = set()
+
+async def _settle_overrun(spec, envelope: MessageEnvelope, future: asyncio.Future, dedup_key, start: float):
+    """
+    Wait for a thread or process handler that kept running after its timeout,
+    then settle the message's dedup claim the way its outcome calls for.
+    """
+    try:
+        await future
+    except Exception as e:
+        logger.error(f"Timed out handler for {spec.message_type} failed on message {envelope.message_id}: {str(e)}")
+        if dedup_key is not None:
+            message_dedup.release(dedup_key)
     else:
-        # Original SQS message handling
-        message_attributes = message.get("MessageAttributes", {})
-        
-        message_type = message_attributes.get("Message-Type", {}).get("StringValue") if "Message-Type" in message_attributes else None
-        content_type = message_attributes.get("Content-Type", {}).get("StringValue") if "Content-Type" in message_attributes else None
-        
-        # If message type is missing, try the old key format for backward compatibility
-        if message_type is None:
-            message_type = message_attributes.get("MessageType", {}).get("StringValue") if "MessageType" in message_attributes else None
-            content_type = message_attributes.get("ContentType", {}).get("StringValue") if "ContentType" in message_attributes else None
-        
-        content = body
-        if content_type == "application/json" and content:
-            try:
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON content for message {message.get('MessageId')}")
-                return delete_unknown_types
-    
+        logger.info(f"Timed out handler for {spec.message_type} finished message {envelope.message_id} "
+                    f"after {time.perf_counter() - start:.1f}s")
+        # The redelivery will find it processed and be deleted
+        if dedup_key is not None:
+            await message_dedup.complete(dedup_key, spec.message_type)
+    finally:
+        spec.in_flight -= 1
+
+async def route_envelope(envelope: MessageEnvelope, delete_unknown_types: bool = True,
+                         on_overrun: Optional[Callable[[asyncio.Task], None]] = None) -> bool | None:
+    """
+    Run the registered handler for an already decoded message, applying its timeout.
+
+    Messages that were already handled successfully are skipped before
+    dispatch. Thread and process handlers can't be interrupted, so one that
+    times out keeps running in its pool: its dedup claim is held until it
+    returns, and the message is left alone so it only reappears once its
+    visibility lapses instead of running again next to the first call.
+
+    Args:
+        envelope: The decoded message
+        delete_unknown_types: Whether to delete messages with unknown types
+        on_overrun: Called with a task that finishes when a timed out thread or process
+            handler returns, so callers can keep counting it against their limits until then
+
+    Returns:
+        True if the message should be deleted, False to leave it for redelivery, or None if
+        another delivery of it is being handled right now (or this one's handler is still
+        running after a timeout) and it should be left alone
+    """
+    message_type = envelope.message_type
     if message_type is None:
-        logger.warning(f"Message has no type attribute: {message.get('MessageId')}")
+        logger.warning(f"Message has no type attribute: {envelope.message_id}")
+        SQS_MESSAGES.labels("", "untyped").inc()
         return delete_unknown_types
-    
-    if message_type in route_table:
-        try:
-            await route_table[message_type](message, content)
-            return True
-        except Exception as e:
-            logger.error(f"Error processing message of type {message_type}: {str(e)}")
-            # Don't delete the message on processing error to allow retry
-            return False
-    else:
-        logger.warning(f"Unknown message type: {message_type} for message {message.get('MessageId')}")
+
+    spec = route_table.get(message_type)
+    if spec is None:
+        logger.warning(f"Unknown message type: {message_type} for message {envelope.message_id}")
+        # Not labelled with the type: unregistered types are sender-controlled and unbounded
+        SQS_MESSAGES.labels("", "unknown_type").inc()
         # Delete unknown message types if configured to do so
         return delete_unknown_types
+
+    dedup_key = None
+    if message_dedup is not None and spec.dedup:
+        dedup_key = envelope.idempotency_key or envelope.message_id
+        claim = await message_dedup.claim(dedup_key)
+        if claim != CLAIMED:
+            spec.duplicates += 1
+            SQS_MESSAGES.labels(message_type, claim).inc()
+            logger.info(f"Skipping {claim} message {envelope.message_id} of type {message_type} (key {dedup_key})")
+            # Already processed: delete it. Still being processed: leave it to that delivery.
+            return True if claim == DUPLICATE else None
+
+    spec.in_flight += 1
+    start = time.perf_counter()
+    future = None
+    overrunning = False
+    try:
+        async with asyncio.timeout(spec.timeout):
+            if spec.mode == "async":
+                await spec.handler(envelope)
+            else:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(handler_executors.get(spec.mode), spec.handler, envelope)
+                # Shielded: a timeout stops the wait but keeps the future, which reports when the call ends
+                await asyncio.shield(future)
+    except TimeoutError:
+        spec.record(time.perf_counter() - start, "timeout")
+        logger.warning(f"Handler for {message_type} timed out after {spec.timeout}s on message {envelope.message_id}")
+        if future is not None:
+            # Still running in the pool: keep the claim and the message until it returns
+            overrunning = True
+            task = asyncio.create_task(_settle_overrun(spec, envelope, future, dedup_key, start))
+            _overrunning.add(task)
+            task.add_done_callback(_overrunning.discard)
+            if on_overrun is not None:
+                on_overrun(task)
+            return None
+        # Leave the message for redelivery
+        if dedup_key is not None:
+            message_dedup.release(dedup_key)
+        return False
+    except Exception as e:
+        spec.record(time.perf_counter() - start, "failed")
+        logger.error(f"Error processing message of type {message_type}: {str(e)}")
+        # Don't delete the message on processing error to allow retry
+        if dedup_key is not None:
+            message_dedup.release(dedup_key)
+        return False
+    else:
+        spec.record(time.perf_counter() - start, "processed")
+        if dedup_key is not None:
+            await message_dedup.complete(dedup_key, message_type)
+        return True
+    finally:
+        # An overrunning call is counted until _settle_overrun sees it return
+        if not overrunning:
+            spec.in_flight -= 1
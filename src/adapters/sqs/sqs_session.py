@@ -1,10 +1,11 @@
-import aioboto3
 from config import SQS_QUEUE_URL, SQS_REGION
+from utils.aws_clients import get_aws_client
 
-if not SQS_QUEUE_URL or not SQS_REGION:
-    raise Exception("SQS_QUEUE_URL and SQS_REGION must be set")
-
-session = aioboto3.Session()
+def check_sqs_settings():
+    """Raise unless the queue is configured. Checked when a consumer starts, so importing this module never fails."""
+    if not SQS_QUEUE_URL or not SQS_REGION:
+        raise RuntimeError("SQS_QUEUE_URL and SQS_REGION must be set")
 
 async def get_sqs_client():
-    return session.client("sqs", region_name=SQS_REGION)
+    """Return the shared, long-lived SQS client. It is closed in the app lifespan, not by callers."""
+    return await get_aws_client("sqs", region_name=SQS_REGION)
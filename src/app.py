@@ -1,11 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from adapters.rest.user_controller import router as user_bp
-from adapters.sqs.poll import poll_loop
-from database.db import create_tables
+from adapters.rest.post_controller import router as post_bp
+from adapters.rest.metrics import MetricsMiddleware, router as metrics_bp
+from adapters.rest.timing import RequestTimingMiddleware
+from database.db import create_tables, run_replica_health_checks, reader_router
+from database.replicas import set_caller_key, reset_caller_key
 import asyncio
+import sys
 from contextlib import asynccontextmanager
-from adapters.grpc.server.grpc_server import serve_grpc
+from config import GRPC_SERVE_IN_APP, SQS_POLL_IN_APP, READ_YOUR_WRITES_MS, METRICS_ENABLED, SLOW_REQUEST_MS, ADMIN_TOKEN
 import logging
 
 # Configure logging for the entire application
@@ -21,28 +25,52 @@ async def lifespan(app: FastAPI):
     # Create tables for all models in the database
     asyncio.create_task(create_tables())
 
-    # Start the gRPC server
-    grpc_task = asyncio.create_task(serve_grpc())
+    # Start the gRPC server and the SQS poll, unless they run as their own roles (see cli.py).
+    # Imported here so a REST-only worker never loads the gRPC stubs or the SQS client.
+    grpc_task = None
+    if GRPC_SERVE_IN_APP:
+        from adapters.grpc.server.grpc_server import serve_grpc
+        grpc_task = asyncio.create_task(serve_grpc())
 
-    # Start the SQS poll
-    sqs_task = asyncio.create_task(poll_loop())
+    sqs_task = None
+    if SQS_POLL_IN_APP:
+        from adapters.sqs.poll import poll_loop
+        sqs_task = asyncio.create_task(poll_loop())
+
+    # Health check the reader replicas when there is more than one to choose from
+    health_task = asyncio.create_task(run_replica_health_checks()) if len(reader_router.replicas) > 1 else None
 
     yield
 
     # Cancel the tasks
-    grpc_task.cancel()
-    sqs_task.cancel()
+    if grpc_task:
+        grpc_task.cancel()
+    if sqs_task:
+        sqs_task.cancel()
+    if health_task:
+        health_task.cancel()
 
     # Wait for the tasks to complete
 
-    try:
-        await grpc_task
-    except asyncio.CancelledError:
-        logging.info("gRPC server cancelled.")
-    try:
-        await sqs_task
-    except asyncio.CancelledError:
-        logging.info("SQS poll cancelled.")
+    if grpc_task:
+        try:
+            await grpc_task
+        except asyncio.CancelledError:
+            logging.info("gRPC server cancelled.")
+    if sqs_task:
+        try:
+            await sqs_task
+        except asyncio.CancelledError:
+            logging.info("SQS poll cancelled.")
+
+    # Stop the thread/process pools used by offloaded SQS handlers and close the shared
+    # AWS clients, if anything loaded them: a REST-only app never imports aioboto3
+    executors = sys.modules.get("adapters.sqs.executors")
+    if executors is not None:
+        await asyncio.to_thread(executors.shutdown_handler_executors)
+    aws_clients = sys.modules.get("utils.aws_clients")
+    if aws_clients is not None:
+        await aws_clients.close_aws_clients()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -55,8 +83,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Route a client's reads to the writer shortly after its own writes, keyed on the X-Client-Id header
+if READ_YOUR_WRITES_MS > 0:
+    @app.middleware("http")
+    async def read_your_writes_caller(request: Request, call_next):
+        token = set_caller_key(request.headers.get("X-Client-Id"))
+        try:
+            return await call_next(request)
+        finally:
+            reset_caller_key(token)
+
+# DB / handler / serialization breakdown of slow requests, listed at GET /admin/slow-requests
+if SLOW_REQUEST_MS > 0:
+    app.add_middleware(RequestTimingMiddleware)
+
+# Request counts and latency per route, exposed with everything else at GET /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_bp)
+
 # Register routes, you might want to edit this to add RESTful routes
 app.include_router(user_bp, prefix="/users")
+app.include_router(post_bp, prefix="/posts")
+
+# Profiling and slow query/request inspection, for callers sending X-Admin-Token
+if ADMIN_TOKEN:
+    from adapters.rest.admin_controller import router as admin_bp
+    app.include_router(admin_bp, prefix="/admin")
 
 if __name__ == '__main__':
     import uvicorn
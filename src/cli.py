@@ -0,0 +1,137 @@
+"""
+Process entry points, one per role, so the REST API, the gRPC server and the
+SQS consumer can be deployed and scaled independently. Run from src/:
+
+    python -m cli serve-rest [--workers N]      # uvicorn workers, REST only
+    python -m cli serve-grpc [--processes N]    # gRPC processes sharing the port (SO_REUSEPORT)
+    python -m cli consume-sqs [--processes N]   # SQS consumer processes
+    python -m cli all                           # every role, each in its own process(es)
+    python -m cli startup-report                # import times and time to first request of a REST worker
+
+Counts default to REST_WORKERS, GRPC_PROCESSES and SQS_CONSUMER_PROCESSES.
+Each role imports only the subsystems it runs, so e.g. a consumer never
+loads FastAPI and a REST worker never loads the gRPC stubs.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+
+ROLES = ("serve-rest", "serve-grpc", "consume-sqs")
+
+
+def serve_rest(workers=None, host=None, port=None):
+    # gRPC and SQS run as their own roles; must be set before config is first imported
+    os.environ["GRPC_SERVE_IN_APP"] = "false"
+    os.environ["SQS_POLL_IN_APP"] = "false"
+    import uvicorn
+    from config import REST_HOST, REST_PORT, REST_WORKERS
+    uvicorn.run(
+        "app:app",
+        host=host or REST_HOST,
+        port=port or REST_PORT,
+        workers=workers or REST_WORKERS,
+        log_level="info",
+    )
+
+
+def serve_grpc(processes=None):
+    from adapters.grpc.server.grpc_server import run_grpc_processes
+    from config import GRPC_PROCESSES
+    run_grpc_processes(processes or GRPC_PROCESSES)
+
+
+def consume_sqs(processes=None):
+    from adapters.sqs.poll import run_consumer_processes
+    from config import SQS_CONSUMER_PROCESSES
+    run_consumer_processes(processes or SQS_CONSUMER_PROCESSES)
+
+
+def run_all():
+    """Run every role in its own spawned process; each role then starts its own workers."""
+    ctx = multiprocessing.get_context("spawn")
+    children = [ctx.Process(target=main, args=([role],), name=role) for role in ROLES]
+    for child in children:
+        child.start()
+    logging.info(f"Started roles: {', '.join(ROLES)}")
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.join()
+
+
+def startup_report(top=20, path="/openapi.json", monolith=False):
+    """
+    Print where a cold REST worker's import time goes and how long it takes to
+    answer its first request, and exit with status 1 if that is over
+    STARTUP_BUDGET_SECONDS.
+    """
+    from utils.startup import import_report, import_times, time_to_first_request
+    from config import STARTUP_BUDGET_SECONDS
+    # As serve-rest runs the app, unless asked for the app with its in-app roles as configured
+    env = {} if monolith else {"GRPC_SERVE_IN_APP": "false", "SQS_POLL_IN_APP": "false"}
+
+    report = import_report(import_times("app", env), top=top)
+    print(f"Total import time: {report['total_ms']:.1f} ms\n")
+    print("Slowest imports (cumulative ms):")
+    for module, ms in report["slowest"]:
+        print(f"  {ms:9.1f}  {module}")
+    print("\nImport time by package (self ms):")
+    for package, ms in report["packages"]:
+        print(f"  {ms:9.1f}  {package}")
+
+    elapsed = time_to_first_request("app", path, env)
+    print(f"\nTime to first request (GET {path}): {elapsed * 1000:.0f} ms, "
+          f"budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms")
+    if elapsed > STARTUP_BUDGET_SECONDS:
+        print("Over the startup budget")
+        sys.exit(1)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Run one or all of the service's roles.")
+    roles = parser.add_subparsers(dest="role", required=True)
+
+    rest = roles.add_parser("serve-rest", help="Serve the REST API with uvicorn")
+    rest.add_argument("--workers", type=int, help="uvicorn worker processes (default REST_WORKERS)")
+    rest.add_argument("--host", help="Bind address (default REST_HOST)")
+    rest.add_argument("--port", type=int, help="Port (default REST_PORT)")
+
+    grpc = roles.add_parser("serve-grpc", help="Serve gRPC")
+    grpc.add_argument("--processes", type=int, help="Server processes (default GRPC_PROCESSES)")
+
+    sqs = roles.add_parser("consume-sqs", help="Consume the SQS queue")
+    sqs.add_argument("--processes", type=int, help="Consumer processes (default SQS_CONSUMER_PROCESSES)")
+
+    roles.add_parser("all", help="Run every role")
+
+    report = roles.add_parser("startup-report", help="Report import times and time to first request of a REST worker")
+    report.add_argument("--top", type=int, default=20, help="Modules and packages to list")
+    report.add_argument("--path", default="/openapi.json", help="Path of the first request")
+    report.add_argument("--monolith", action="store_true",
+                        help="Start gRPC and SQS in-app as configured (default: REST only, as serve-rest runs it)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s')
+    if args.role == "serve-rest":
+        serve_rest(args.workers, args.host, args.port)
+    elif args.role == "serve-grpc":
+        serve_grpc(args.processes)
+    elif args.role == "consume-sqs":
+        consume_sqs(args.processes)
+    elif args.role == "startup-report":
+        startup_report(args.top, args.path, args.monolith)
+    else:
+        run_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,4 +11,150 @@ SQS_REGION = os.environ.get("SQS_REGION")
 # gRPC Server Configuration
 GRPC_SERVER_HOST = os.environ.get("GRPC_SERVER_HOST", "::")
 GRPC_SERVER_PORT = os.environ.get("GRPC_SERVER_PORT", "50051")
-GRPC_SERVER_ADDR = f"[{GRPC_SERVER_HOST}]:{GRPC_SERVER_PORT}"
\ No newline at end of file
+GRPC_SERVER_ADDR = f"[{GRPC_SERVER_HOST}]:{GRPC_SERVER_PORT}"
+# RPCs beyond this many in flight are rejected with RESOURCE_EXHAUSTED; 0 means unlimited
+GRPC_MAX_CONCURRENT_RPCS = int(os.environ.get("GRPC_MAX_CONCURRENT_RPCS", "100"))
+GRPC_MAX_RECEIVE_MESSAGE_BYTES = int(os.environ.get("GRPC_MAX_RECEIVE_MESSAGE_BYTES", str(4 * 1024 * 1024)))
+GRPC_MAX_SEND_MESSAGE_BYTES = int(os.environ.get("GRPC_MAX_SEND_MESSAGE_BYTES", str(4 * 1024 * 1024)))
+# Server-initiated pings detect dead connections; clients may ping no more often than the min interval
+GRPC_KEEPALIVE_TIME_MS = int(os.environ.get("GRPC_KEEPALIVE_TIME_MS", "60000"))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(os.environ.get("GRPC_KEEPALIVE_TIMEOUT_MS", "20000"))
+GRPC_KEEPALIVE_MIN_PING_INTERVAL_MS = int(os.environ.get("GRPC_KEEPALIVE_MIN_PING_INTERVAL_MS", "10000"))
+# Close idle / long-lived connections (0 disables); a max age lets clients rebalance across processes
+GRPC_MAX_CONNECTION_IDLE_MS = int(os.environ.get("GRPC_MAX_CONNECTION_IDLE_MS", "0"))
+GRPC_MAX_CONNECTION_AGE_MS = int(os.environ.get("GRPC_MAX_CONNECTION_AGE_MS", "0"))
+# Default response compression: none, gzip or deflate
+GRPC_COMPRESSION = os.environ.get("GRPC_COMPRESSION", "none").lower()
+# Seconds in-flight RPCs get to finish on shutdown
+GRPC_SHUTDOWN_GRACE_SECONDS = float(os.environ.get("GRPC_SHUTDOWN_GRACE_SECONDS", "5"))
+
+# gRPC client channels (utils/grpc_stub.py); channels are pooled per target and shared by every client
+GRPC_CLIENT_CHANNELS = int(os.environ.get("GRPC_CLIENT_CHANNELS", "2"))
+# Default per-call deadline in seconds
+GRPC_CLIENT_TIMEOUT = float(os.environ.get("GRPC_CLIENT_TIMEOUT", "5"))
+# Must not be below the server's GRPC_KEEPALIVE_MIN_PING_INTERVAL_MS or the server closes the connection
+GRPC_CLIENT_KEEPALIVE_TIME_MS = int(os.environ.get("GRPC_CLIENT_KEEPALIVE_TIME_MS", "30000"))
+GRPC_CLIENT_KEEPALIVE_TIMEOUT_MS = int(os.environ.get("GRPC_CLIENT_KEEPALIVE_TIMEOUT_MS", "10000"))
+# Attempts per call (including the first) for UNAVAILABLE / RESOURCE_EXHAUSTED responses
+GRPC_CLIENT_MAX_ATTEMPTS = int(os.environ.get("GRPC_CLIENT_MAX_ATTEMPTS", "3"))
+GRPC_CLIENT_BATCH_CONCURRENCY = int(os.environ.get("GRPC_CLIENT_BATCH_CONCURRENCY", "32"))
+
+# Process layout (python -m cli); each role can be scaled on its own
+REST_HOST = os.environ.get("REST_HOST", "0.0.0.0")
+REST_PORT = int(os.environ.get("REST_PORT", "3000"))
+REST_WORKERS = int(os.environ.get("REST_WORKERS", "1"))
+# gRPC processes share the port with SO_REUSEPORT
+GRPC_PROCESSES = int(os.environ.get("GRPC_PROCESSES", "1"))
+# Set to "false" when gRPC is served by its own processes (python -m cli serve-grpc)
+GRPC_SERVE_IN_APP = os.environ.get("GRPC_SERVE_IN_APP", "true").lower() == "true"
+# Most seconds a cold REST worker may take from process start to its first response
+# (checked by python -m cli startup-report and tests/test_startup.py)
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "2.0"))
+
+# User listing (GET /users/) configuration
+USERS_PAGE_DEFAULT_LIMIT = int(os.environ.get("USERS_PAGE_DEFAULT_LIMIT", "100"))
+USERS_PAGE_MAX_LIMIT = int(os.environ.get("USERS_PAGE_MAX_LIMIT", "1000"))
+USERS_STREAM_CHUNK_SIZE = int(os.environ.get("USERS_STREAM_CHUNK_SIZE", "1000"))
+
+# Post listing configuration (GET /posts/by-user/{user_id}, GET /posts/by-users and the Post gRPC service)
+POSTS_PAGE_DEFAULT_LIMIT = int(os.environ.get("POSTS_PAGE_DEFAULT_LIMIT", "20"))
+POSTS_PAGE_MAX_LIMIT = int(os.environ.get("POSTS_PAGE_MAX_LIMIT", "100"))
+# Upper bound on users whose posts are loaded in one request
+POSTS_BY_USERS_MAX_IDS = int(os.environ.get("POSTS_BY_USERS_MAX_IDS", "100"))
+
+# SQS consumer configuration
+SQS_RECEIVER_COUNT = int(os.environ.get("SQS_RECEIVER_COUNT", "2"))
+SQS_WORKER_CONCURRENCY = int(os.environ.get("SQS_WORKER_CONCURRENCY", "20"))
+SQS_MAX_IN_FLIGHT = int(os.environ.get("SQS_MAX_IN_FLIGHT", "50"))
+# Visibility timeout requested on receive; in-flight messages are extended by a heartbeat
+SQS_VISIBILITY_TIMEOUT = int(os.environ.get("SQS_VISIBILITY_TIMEOUT", "20"))
+# Seconds between heartbeats; messages within two intervals of expiry are extended (0 disables)
+SQS_HEARTBEAT_INTERVAL = float(os.environ.get("SQS_HEARTBEAT_INTERVAL", "5"))
+# Deletes are sent together once 10 are waiting or after this many milliseconds
+SQS_DELETE_LINGER_MS = float(os.environ.get("SQS_DELETE_LINGER_MS", "50"))
+# Pools for sync handlers registered with mode="thread" or mode="process"
+SQS_HANDLER_THREADS = int(os.environ.get("SQS_HANDLER_THREADS", "4"))
+SQS_HANDLER_PROCESSES = int(os.environ.get("SQS_HANDLER_PROCESSES", str(os.cpu_count() or 1)))
+# Skip redeliveries of messages that were already handled, keyed on this attribute or the MessageId
+SQS_DEDUP_ENABLED = os.environ.get("SQS_DEDUP_ENABLED", "true").lower() == "true"
+SQS_DEDUP_ATTRIBUTE = os.environ.get("SQS_DEDUP_ATTRIBUTE", "Idempotency-Key")
+SQS_DEDUP_MAXSIZE = int(os.environ.get("SQS_DEDUP_MAXSIZE", "100000"))
+SQS_DEDUP_TTL_SECONDS = float(os.environ.get("SQS_DEDUP_TTL_SECONDS", "3600"))
+# Also record processed messages in the processed_messages table, shared by all consumer processes.
+# The table is only created at startup when this is on.
+SQS_DEDUP_DB_ENABLED = os.environ.get("SQS_DEDUP_DB_ENABLED", "false").lower() == "true"
+SQS_CONSUMER_PROCESSES = int(os.environ.get("SQS_CONSUMER_PROCESSES", "1"))
+# Set to "false" when the consumer runs in its own processes (python -m adapters.sqs.poll)
+SQS_POLL_IN_APP = os.environ.get("SQS_POLL_IN_APP", "true").lower() == "true"
+# JSON library for decoding message bodies: "auto" (orjson, then msgspec, then json), "orjson", "msgspec" or "json"
+SQS_JSON_BACKEND = os.environ.get("SQS_JSON_BACKEND", "auto").lower()
+
+# Shared AWS client configuration (one long-lived client per service/region/endpoint)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "5"))
+# Must be longer than the 20 second SQS long-poll wait
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "30"))
+
+# Batched sends/publishes. A linger above 0 merges concurrent single sends into batch calls.
+SQS_SEND_LINGER_MS = float(os.environ.get("SQS_SEND_LINGER_MS", "0"))
+SNS_PUBLISH_LINGER_MS = float(os.environ.get("SNS_PUBLISH_LINGER_MS", "0"))
+AWS_BATCH_MAX_RETRIES = int(os.environ.get("AWS_BATCH_MAX_RETRIES", "3"))
+
+# User read-through cache (in-process tier, plus an optional shared Redis tier).
+# Off by default: an update only invalidates the tier of the process that made it (and the
+# shared tier), so other workers can return a user up to USER_CACHE_TTL_SECONDS out of date.
+USER_CACHE_ENABLED = os.environ.get("USER_CACHE_ENABLED", "false").lower() == "true"
+USER_CACHE_MAXSIZE = int(os.environ.get("USER_CACHE_MAXSIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_REDIS_URL = os.environ.get("USER_CACHE_REDIS_URL")
+
+# Coalesce concurrent single-user lookups into one WHERE id IN (...) query
+USER_LOOKUP_COALESCING = os.environ.get("USER_LOOKUP_COALESCING", "true").lower() == "true"
+USER_LOOKUP_MAX_BATCH = int(os.environ.get("USER_LOOKUP_MAX_BATCH", "500"))
+# Upper bound on ids accepted by the BatchGetUsers RPC
+GRPC_BATCH_GET_MAX_IDS = int(os.environ.get("GRPC_BATCH_GET_MAX_IDS", "1000"))
+
+# Database connection pools (applied to both the reader and writer engines)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+# Seconds before a connection is replaced; -1 disables recycling
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+# asyncpg prepared statement cache size; set to 0 behind pgbouncer in transaction mode
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "100"))
+# Minimum seconds between pool-exhaustion warnings per engine
+DB_POOL_EXHAUSTED_WARNING_INTERVAL = float(os.environ.get("DB_POOL_EXHAUSTED_WARNING_INTERVAL", "10"))
+
+# Reader replicas. READER_DATABASE_URL may hold a comma-separated list of reader URLs.
+READER_DATABASE_URLS = [url.strip() for url in (READER_DATABASE_URL or "").split(",") if url.strip()]
+# round_robin, least_outstanding or lowest_latency
+READER_ROUTING_STRATEGY = os.environ.get("READER_ROUTING_STRATEGY", "round_robin")
+READER_HEALTH_CHECK_INTERVAL = float(os.environ.get("READER_HEALTH_CHECK_INTERVAL", "5"))
+READER_HEALTH_CHECK_TIMEOUT = float(os.environ.get("READER_HEALTH_CHECK_TIMEOUT", "2"))
+# Replicas are ejected after this many consecutive failures, or when a health check is slower than READER_SLOW_MS
+READER_EJECT_AFTER_FAILURES = int(os.environ.get("READER_EJECT_AFTER_FAILURES", "3"))
+READER_SLOW_MS = float(os.environ.get("READER_SLOW_MS", "500"))
+READER_EJECT_SECONDS = float(os.environ.get("READER_EJECT_SECONDS", "30"))
+# Send a caller's reads to the writer for this many ms after it writes (0 disables)
+READ_YOUR_WRITES_MS = float(os.environ.get("READ_YOUR_WRITES_MS", "0"))
+
+# Prometheus metrics (GET /metrics): HTTP, gRPC, SQS handler and query latency
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+
+# Admin endpoints (/admin: profiling, slow queries, slow requests) are only mounted when a token is set;
+# callers send it in the X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+ADMIN_PROFILE_MAX_SECONDS = float(os.environ.get("ADMIN_PROFILE_MAX_SECONDS", "60"))
+# Keep the DB_SLOW_QUERY_LOG_SIZE slowest statements taking at least DB_SLOW_QUERY_MS (0 disables)
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", "100"))
+DB_SLOW_QUERY_LOG_SIZE = int(os.environ.get("DB_SLOW_QUERY_LOG_SIZE", "50"))
+# Log a DB / handler / serialization breakdown for REST requests slower than this (0 disables)
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_LOG_SIZE = int(os.environ.get("SLOW_REQUEST_LOG_SIZE", "100"))
+
+# Bulk user import (POST /users/bulk)
+USERS_BULK_MAX_ROWS = int(os.environ.get("USERS_BULK_MAX_ROWS", "100000"))
+USERS_BULK_CHUNK_SIZE = int(os.environ.get("USERS_BULK_CHUNK_SIZE", "1000"))
+# Imports at least this large use asyncpg COPY into a temp table (PostgreSQL only)
+USERS_BULK_COPY_THRESHOLD = int(os.environ.get("USERS_BULK_COPY_THRESHOLD", "10000"))
\ No newline at end of file
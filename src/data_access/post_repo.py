@@ -0,0 +1,76 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.future import select
+from models.posts import Post
+from models.users import User
+from database.db import get_async_session
+
+class PostRepository:
+    def __init__(self):
+        pass
+
+    async def _get_db(self, read_only=True):
+        """Get a database session"""
+        return await get_async_session(read_only=read_only)
+
+    async def create_post(self, user_id: int, title: str, content: str) -> Post | None:
+        """
+        Create a post for a user.
+
+        Returns:
+            The new post, or None if the foreign key rejected user_id
+        """
+        async with await self._get_db(read_only=False) as db:
+            post = Post(user_id=user_id, title=title, content=content)
+            db.add(post)
+            try:
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                return None
+            await db.refresh(post)
+            return post
+
+    async def get_post_by_id(self, post_id: int) -> Post | None:
+        async with await self._get_db(read_only=True) as db:
+            stmt = select(Post).where(Post.id == post_id)
+            result = await db.execute(stmt)
+            return result.scalars().first()
+
+    async def list_user_posts(self, user_id: int, limit: int | None = None, after: int | None = None) -> list[Post]:
+        """
+        List one user's posts ordered by id, using keyset pagination on the (user_id, id) index.
+
+        Args:
+            user_id: Author of the posts
+            limit: Maximum number of posts to return (None for no limit)
+            after: Only return posts whose id is greater than this cursor
+        """
+        async with await self._get_db(read_only=True) as db:
+            stmt = select(Post).where(Post.user_id == user_id).order_by(Post.id)
+            if after is not None:
+                stmt = stmt.where(Post.id > after)
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            result = await db.execute(stmt)
+            return result.scalars().all()
+
+    async def get_users_with_posts(self, user_ids: list[int]) -> list[User]:
+        """
+        Fetch many users with their posts loaded, in two queries however many users there are:
+        one for the users and one WHERE user_id IN (...) for all of their posts.
+
+        Returns:
+            Users ordered by id, each with `posts` ordered by id. Missing ids are simply absent.
+        """
+        if not user_ids:
+            return []
+        async with await self._get_db(read_only=True) as db:
+            stmt = (
+                select(User)
+                .where(User.id.in_(user_ids))
+                .order_by(User.id)
+                .options(selectinload(User.posts))
+            )
+            result = await db.execute(stmt)
+            return result.scalars().all()
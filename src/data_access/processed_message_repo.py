@@ -0,0 +1,44 @@
+import time
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.future import select
+from models.processed_messages import ProcessedMessage
+from database.db import get_async_session
+
+class ProcessedMessageRepository:
+    """Durable record of handled SQS messages, shared by every consumer process."""
+
+    async def _get_db(self):
+        # Always the writer: a lagging replica could miss a message that was just processed
+        return await get_async_session(read_only=False)
+
+    async def is_processed(self, key: str) -> bool:
+        async with await self._get_db() as db:
+            stmt = select(ProcessedMessage.key).where(
+                ProcessedMessage.key == key,
+                ProcessedMessage.expires_at > time.time(),
+            )
+            result = await db.execute(stmt)
+            return result.first() is not None
+
+    async def mark_processed(self, key: str, message_type: str, ttl: float):
+        now = time.time()
+        async with await self._get_db() as db:
+            insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+            stmt = insert(ProcessedMessage).values(
+                key=key, message_type=message_type, processed_at=now, expires_at=now + ttl
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ProcessedMessage.key],
+                set_={"processed_at": stmt.excluded.processed_at, "expires_at": stmt.excluded.expires_at},
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+    async def purge_expired(self) -> int:
+        async with await self._get_db() as db:
+            stmt = delete(ProcessedMessage).where(ProcessedMessage.expires_at <= time.time())
+            result = await db.execute(stmt)
+            await db.commit()
+            return result.rowcount
@@ -1,7 +1,15 @@
+import logging
+from sqlalchemy import delete, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.users import User
 from sqlalchemy.future import select
 from database.db import get_async_session
+from config import USERS_BULK_CHUNK_SIZE, USERS_BULK_COPY_THRESHOLD
+
+logger = logging.getLogger(__name__)
 
 class UserRepository:
     def __init__(self):
@@ -19,44 +27,211 @@ class UserRepository:
             await db.refresh(user)
             return user
         
+    async def bulk_upsert_users(self, users: list[dict], on_conflict: str = "update",
+                                chunk_size: int = USERS_BULK_CHUNK_SIZE,
+                                copy_threshold: int = USERS_BULK_COPY_THRESHOLD) -> dict:
+        """
+        Insert many users with multi-row INSERT ... ON CONFLICT (email) ... RETURNING.
+
+        Rows are written in transactions of chunk_size rows. On PostgreSQL,
+        imports of at least copy_threshold rows are loaded with COPY into a
+        temporary table first, falling back to the INSERT path if that fails.
+        Problem rows are reported instead of failing the whole import: a
+        chunk the database rejects is split until the failing rows are found.
+
+        Args:
+            users: Dicts with "name" and "email"
+            on_conflict: "update" sets the name of users whose email already exists,
+                "skip" leaves them untouched and reports them as conflicts
+
+        Returns:
+            {"users": rows (id, name, email) in input order,
+             "conflicts": [{"index", "email", "reason"}] sorted by index}
+        """
+        conflicts = []
+        rows = []
+        seen_emails = set()
+        for index, user in enumerate(users):
+            email = user.get("email")
+            if not email or not user.get("name"):
+                conflicts.append({"index": index, "email": email, "reason": "name and email are required"})
+            elif email in seen_emails:
+                conflicts.append({"index": index, "email": email, "reason": "duplicate email in request"})
+            else:
+                seen_emails.add(email)
+                rows.append((index, {"name": user["name"], "email": email}))
+
+        returned = {}
+        failed = set()
+        async with await self._get_db(read_only=False) as db:
+            dialect = db.get_bind().dialect
+            copied = False
+            if len(rows) >= copy_threshold and dialect.driver == "asyncpg":
+                try:
+                    returned = await self._copy_upsert(db, [row for _, row in rows], on_conflict)
+                    copied = True
+                except Exception as e:
+                    # One bad row fails the whole COPY; the INSERT path below finds and reports it
+                    await db.rollback()
+                    logger.warning(f"COPY import of {len(rows)} users failed, falling back to INSERT: {e}")
+            if not copied:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    await self._upsert_chunk(db, dialect.name, chunk, on_conflict, returned, failed, conflicts)
+
+        upserted = []
+        for index, row in rows:
+            if row["email"] in returned:
+                upserted.append(returned[row["email"]])
+            elif index not in failed:
+                conflicts.append({"index": index, "email": row["email"], "reason": "email already exists"})
+        conflicts.sort(key=lambda conflict: conflict["index"])
+        return {"users": upserted, "conflicts": conflicts}
+
+    async def _upsert_chunk(self, db: AsyncSession, dialect_name: str, chunk: list[tuple], on_conflict: str,
+                            returned: dict, failed: set, conflicts: list):
+        """
+        Upsert one chunk in its own transaction. If the database rejects it,
+        the chunk is split in half and each half retried, so only the rows
+        that actually fail are reported.
+        """
+        stmt = self._upsert_stmt(dialect_name, [row for _, row in chunk], on_conflict)
+        try:
+            result = await db.execute(stmt)
+            returned.update({row.email: row for row in result.all()})
+            await db.commit()
+            return
+        except DBAPIError as e:
+            # Constraint violations, but also over-long or invalid values (DataError) and the like
+            await db.rollback()
+            if len(chunk) == 1:
+                index, row = chunk[0]
+                # The database's message can name constraints and values, so it is only logged
+                logger.warning(f"Bulk upsert rejected row {index} ({row['email']}): {e.orig}")
+                failed.add(index)
+                conflicts.append({"index": index, "email": row["email"], "reason": "rejected by database"})
+                return
+        middle = len(chunk) // 2
+        await self._upsert_chunk(db, dialect_name, chunk[:middle], on_conflict, returned, failed, conflicts)
+        await self._upsert_chunk(db, dialect_name, chunk[middle:], on_conflict, returned, failed, conflicts)
+
+    @staticmethod
+    def _upsert_stmt(dialect_name: str, rows: list[dict], on_conflict: str):
+        insert = sqlite_insert if dialect_name == "sqlite" else pg_insert
+        stmt = insert(User).values(rows)
+        if on_conflict == "update":
+            stmt = stmt.on_conflict_do_update(index_elements=[User.email], set_={"name": stmt.excluded.name})
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[User.email])
+        return stmt.returning(User.id, User.name, User.email)
+
+    async def _copy_upsert(self, db: AsyncSession, rows: list[dict], on_conflict: str) -> dict:
+        """COPY rows into a temporary table, then upsert them with a single INSERT ... SELECT."""
+        conn = await db.connection()
+        raw_conn = await conn.get_raw_connection()
+        await db.execute(text(
+            "CREATE TEMP TABLE users_import (name text NOT NULL, email text NOT NULL) ON COMMIT DROP"
+        ))
+        await raw_conn.driver_connection.copy_records_to_table(
+            "users_import",
+            records=[(row["name"], row["email"]) for row in rows],
+            columns=["name", "email"],
+        )
+        action = "DO UPDATE SET name = EXCLUDED.name" if on_conflict == "update" else "DO NOTHING"
+        result = await db.execute(text(
+            f"INSERT INTO {User.__tablename__} (name, email) SELECT name, email FROM users_import "
+            f"ON CONFLICT (email) {action} RETURNING id, name, email"
+        ))
+        returned = {row.email: row for row in result.all()}
+        await db.commit()
+        return returned
+
     async def get_user_by_id(self, user_id: int) -> User:
         async with await self._get_db(read_only=True) as db:
             stmt = select(User).where(User.id == user_id)
             result = await db.execute(stmt)
             return result.scalars().first()
     
+    async def get_users_by_ids(self, user_ids: list[int]) -> list[User]:
+        """Fetch many users in a single WHERE id IN (...) query. Missing ids are simply absent."""
+        if not user_ids:
+            return []
+        async with await self._get_db(read_only=True) as db:
+            stmt = select(User).where(User.id.in_(user_ids))
+            result = await db.execute(stmt)
+            return result.scalars().all()
+
     async def get_user_by_email(self, email: str) -> User:
         async with await self._get_db(read_only=True) as db:
             stmt = select(User).where(User.email == email)
             result = await db.execute(stmt)
             return result.scalars().first()
     
-    async def list_users(self) -> list[User]:
+    async def list_users(self, limit: int | None = None, after: int | None = None) -> list[User]:
+        """
+        List users ordered by id, using keyset pagination.
+
+        Args:
+            limit: Maximum number of users to return (None for no limit)
+            after: Only return users whose id is greater than this cursor
+        """
         async with await self._get_db(read_only=True) as db:
-            stmt = select(User)
+            stmt = select(User).order_by(User.id)
+            if after is not None:
+                stmt = stmt.where(User.id > after)
+            if limit is not None:
+                stmt = stmt.limit(limit)
             result = await db.execute(stmt)
             return result.scalars().all()
+
+    async def stream_users(self, chunk_size: int = 1000, after: int | None = None):
+        """
+        Stream users ordered by id from a server-side cursor.
+
+        Yields lists of at most chunk_size rows (with id, name and email
+        attributes) so only one chunk is held in memory at a time.
+        """
+        async with await self._get_db(read_only=True) as db:
+            stmt = select(User.id, User.name, User.email).order_by(User.id)
+            if after is not None:
+                stmt = stmt.where(User.id > after)
+            result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+            async for rows in result.partitions(chunk_size):
+                yield rows
     
     async def delete_user(self, user_id: int) -> bool:
         async with await self._get_db(read_only=False) as db:
-            stmt = select(User).where(User.id == user_id)
+            stmt = delete(User).where(User.id == user_id).returning(User.id)
             result = await db.execute(stmt)
-            user = result.scalars().first()
-            if not user:
-                return False
-            await db.delete(user)
+            deleted = result.first() is not None
             await db.commit()
-            return True
+            return deleted
     
     async def update_user(self, user_id: int, name: str, email: str) -> User:
+        return await self.patch_user(user_id, {"name": name, "email": email})
+
+    async def patch_user(self, user_id: int, changes: dict) -> User:
+        """
+        Update only the given columns with a single UPDATE ... RETURNING statement.
+
+        Args:
+            user_id: Id of the user to update
+            changes: Column names mapped to their new values
+
+        Returns:
+            The updated user, or None if no user has that id
+        """
+        if not changes:
+            return await self.get_user_by_id(user_id)
         async with await self._get_db(read_only=False) as db:
-            stmt = select(User).where(User.id == user_id)
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**changes)
+                .returning(User)
+                .execution_options(synchronize_session=False)
+            )
             result = await db.execute(stmt)
             user = result.scalars().first()
-            if not user:
-                return None
-            user.name = name
-            user.email = email
             await db.commit()
-            await db.refresh(user)
-            return user
\ No newline at end of file
+            return user
@@ -1,13 +1,82 @@
 # db.py
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from config import READER_DATABASE_URL, WRITER_DATABASE_URL
+from config import (
+    READER_DATABASE_URLS,
+    WRITER_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_CACHE_SIZE,
+    READER_ROUTING_STRATEGY,
+    READER_HEALTH_CHECK_INTERVAL,
+    READER_HEALTH_CHECK_TIMEOUT,
+    READER_EJECT_AFTER_FAILURES,
+    READER_SLOW_MS,
+    READER_EJECT_SECONDS,
+    READ_YOUR_WRITES_MS,
+    METRICS_ENABLED,
+    DB_SLOW_QUERY_MS,
+    SLOW_REQUEST_MS,
+    SQS_DEDUP_DB_ENABLED,
+)
+from database.query_metrics import instrument_engine
+from database.slow_queries import slow_query_log
+from database.pool import InstrumentedAsyncQueuePool, PoolMetrics, export_pool_stats
+from database.replicas import ReaderReplica, ReplicaRouter, ReadYourWritesTracker, export_replica_stats
+from utils.metrics import metrics
 from models.base_class import Base
 
 
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    '''
+    Creates an async engine with the configured pool settings and pool telemetry.
+    '''
+    url = make_url(url)
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's own prepared statement cache and asyncpg's statement cache
+        url = url.update_query_dict({"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)})
+        connect_args["statement_cache_size"] = DB_STATEMENT_CACHE_SIZE
+
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    engine.sync_engine.pool.metrics = PoolMetrics(name, record_metrics=METRICS_ENABLED)
+    if METRICS_ENABLED or DB_SLOW_QUERY_MS > 0 or SLOW_REQUEST_MS > 0:
+        instrument_engine(engine, name, record_metrics=METRICS_ENABLED,
+                          slow_queries=slow_query_log if DB_SLOW_QUERY_MS > 0 else None)
+    return engine
+
+
 # This is for the setup of AWS RDS Aurora, which has a reader and writer endpoint. For normal RDS, you can just use one engine/SessionLocal.
-_writer_engine = create_async_engine(WRITER_DATABASE_URL, echo=False)
-_reader_engine = create_async_engine(READER_DATABASE_URL, echo=False)
+# READER_DATABASE_URL may list several replicas; reads are spread across them by reader_router.
+_writer_engine = _create_engine(WRITER_DATABASE_URL, "writer")
+_reader_engines = [
+    _create_engine(url, "reader" if len(READER_DATABASE_URLS) == 1 else f"reader-{i}")
+    for i, url in enumerate(READER_DATABASE_URLS)
+]
+_reader_engine = _reader_engines[0]
+
+reader_router = ReplicaRouter(
+    [ReaderReplica(engine.sync_engine.pool.metrics.name, engine) for engine in _reader_engines],
+    strategy=READER_ROUTING_STRATEGY,
+    eject_after_failures=READER_EJECT_AFTER_FAILURES,
+    slow_ms=READER_SLOW_MS,
+    eject_seconds=READER_EJECT_SECONDS,
+)
+read_your_writes = ReadYourWritesTracker(READ_YOUR_WRITES_MS)
 
 AsyncWriterSessionLocal = async_sessionmaker(
     bind=_writer_engine,
@@ -21,18 +90,53 @@ AsyncReaderSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+def _tables_to_create() -> list:
+    # processed_messages only backs SQS deduplication across processes, so it's left out unless that's on
+    skipped = set() if SQS_DEDUP_DB_ENABLED else {"processed_messages"}
+    return [table for table in Base.metadata.sorted_tables if table.name not in skipped]
+
 async def create_tables():
     async with _writer_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(Base.metadata.create_all, tables=_tables_to_create())
 
 async def get_async_session(read_only: bool):
     '''
     Returns a new SQLAlchemy session.
-    If read_only is True, returns a session bound to the reader endpoint.
+    If read_only is True, returns a session bound to a reader replica chosen by reader_router,
+    unless the caller wrote within the last READ_YOUR_WRITES_MS, in which case the writer is used.
     Otherwise, returns a session bound to the writer endpoint.
     '''
-    if read_only:
-        return AsyncReaderSessionLocal()
-    else:
-        return AsyncWriterSessionLocal()
+    if read_only and not read_your_writes.should_use_writer():
+        return reader_router.choose().sessionmaker()
+    if not read_only:
+        read_your_writes.record_write()
+    return AsyncWriterSessionLocal()
+
+async def run_replica_health_checks():
+    '''
+    Periodically health checks the reader replicas, ejecting failing or slow ones. Runs until cancelled.
+    '''
+    await reader_router.health_check_loop(READER_HEALTH_CHECK_INTERVAL, READER_HEALTH_CHECK_TIMEOUT)
+
+def get_pool_stats() -> dict:
+    '''
+    Returns live pool metrics (checked out, idle, overflow, waiting, wait time) per engine.
+    '''
+    stats = {"writer": _writer_engine.sync_engine.pool.stats()}
+    for engine in _reader_engines:
+        stats[engine.sync_engine.pool.metrics.name] = engine.sync_engine.pool.stats()
+    return stats
+
+def get_replica_stats() -> dict:
+    '''
+    Returns health, outstanding queries and latency per reader replica.
+    '''
+    return reader_router.stats()
+
+def _collect_db_metrics():
+    export_pool_stats(get_pool_stats())
+    export_replica_stats(get_replica_stats())
 
+# Pool and replica state is sampled into the registry each time GET /metrics is scraped
+if METRICS_ENABLED:
+    metrics.add_collector(_collect_db_metrics)
@@ -0,0 +1,122 @@
+# pool.py
+import logging
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from utils.metrics import metrics
+from config import DB_POOL_EXHAUSTED_WARNING_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_CONNECTIONS = metrics.gauge(
+    "db_pool_connections", "Pool connections by engine and state (checked_out, idle, overflow, waiting)",
+    ("engine", "state"),
+)
+DB_POOL_SIZE = metrics.gauge("db_pool_size", "Configured pool size by engine", ("engine",))
+DB_POOL_CHECKOUT_WAIT_SECONDS = metrics.histogram(
+    "db_pool_checkout_wait_seconds", "Time to check a connection out of the pool, by engine", ("engine",)
+)
+DB_POOL_TIMEOUTS = metrics.counter("db_pool_timeouts", "Checkouts that gave up after pool_timeout, by engine", ("engine",))
+DB_POOL_EXHAUSTED = metrics.counter("db_pool_exhausted", "Checkouts that found every connection in use, by engine", ("engine",))
+
+
+class PoolMetrics:
+    """Counters for connection checkouts from one engine's pool."""
+
+    def __init__(self, name: str, record_metrics: bool = False):
+        self.name = name
+        # Checkout waits also go to db_pool_checkout_wait_seconds when recording metrics
+        self.wait_histogram = DB_POOL_CHECKOUT_WAIT_SECONDS.labels(name) if record_metrics else None
+        self.waiting = 0
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.exhausted = 0
+        self.last_exhausted_warning = 0.0
+        self._lock = threading.Lock()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long checkouts wait and how many
+    coroutines are waiting, and warns when every connection is in use.
+    """
+
+    metrics: PoolMetrics = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+
+        # Only callers that find every connection in use have to wait for one
+        exhausted = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        if exhausted:
+            with metrics._lock:
+                metrics.waiting += 1
+                waiting = metrics.waiting
+            self._on_exhausted(metrics, waiting)
+
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with metrics._lock:
+                metrics.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with metrics._lock:
+                if exhausted:
+                    metrics.waiting -= 1
+                metrics.checkouts += 1
+                metrics.wait_time_total += elapsed
+                metrics.wait_time_max = max(metrics.wait_time_max, elapsed)
+            if metrics.wait_histogram is not None:
+                metrics.wait_histogram.observe(elapsed)
+
+    def _on_exhausted(self, metrics: PoolMetrics, waiting: int):
+        metrics.exhausted += 1
+        now = time.monotonic()
+        if now - metrics.last_exhausted_warning >= DB_POOL_EXHAUSTED_WARNING_INTERVAL:
+            metrics.last_exhausted_warning = now
+            logger.warning(
+                f"Connection pool '{metrics.name}' exhausted: {self.checkedout()} connections checked out "
+                f"(size {self.size()}, max overflow {self._max_overflow}), {waiting} coroutines waiting"
+            )
+
+    def recreate(self):
+        pool = super().recreate()
+        # Keep counting across dispose()/recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        """Snapshot of the pool's current state and its checkout counters."""
+        metrics = self.metrics
+        checkouts = metrics.checkouts if metrics else 0
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "waiting": metrics.waiting if metrics else 0,
+            "checkouts": checkouts,
+            "wait_time_avg_ms": (metrics.wait_time_total / checkouts * 1000) if checkouts else 0.0,
+            "wait_time_max_ms": metrics.wait_time_max * 1000 if metrics else 0.0,
+            "timeouts": metrics.timeouts if metrics else 0,
+            "exhausted": metrics.exhausted if metrics else 0,
+        }
+
+
+def export_pool_stats(stats: dict):
+    """Copy InstrumentedAsyncQueuePool.stats() snapshots, keyed by engine name, into the db_pool_* metrics."""
+    for engine, pool in stats.items():
+        for state in ("checked_out", "idle", "overflow", "waiting"):
+            DB_POOL_CONNECTIONS.labels(engine, state).set(pool[state])
+        DB_POOL_SIZE.labels(engine).set(pool["size"])
+        DB_POOL_TIMEOUTS.labels(engine).value = pool["timeouts"]
+        DB_POOL_EXHAUSTED.labels(engine).value = pool["exhausted"]
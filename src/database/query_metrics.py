@@ -0,0 +1,67 @@
+# query_metrics.py
+import re
+import time
+from sqlalchemy import event
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database.slow_queries import SlowQueryLog
+from utils.metrics import metrics
+from utils.request_timing import current_request_timing
+
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_duration_seconds", "Query execution time by engine and statement type", ("engine", "operation")
+)
+DB_QUERY_ERRORS = metrics.counter("db_query_errors", "Queries that raised, by engine", ("engine",))
+
+_OPERATION = re.compile(r"\s*(\w+)")
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "BEGIN", "COMMIT", "ROLLBACK"}
+
+_START_KEY = "query_metrics_start"
+
+
+def statement_operation(statement: str) -> str:
+    '''
+    The statement's leading keyword, e.g. "SELECT", or "OTHER" for anything unexpected (keeps label cardinality bounded).
+    '''
+    match = _OPERATION.match(statement)
+    operation = match.group(1).upper() if match else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine, name: str, record_metrics: bool = True,
+                      slow_queries: Optional[SlowQueryLog] = None):
+    '''
+    Times every statement the engine executes with before/after_cursor_execute events.
+
+    Each statement's time goes to the db_query_duration_seconds histogram (if
+    record_metrics), the slow query log (if given) and the current REST
+    request's timing breakdown (if any).
+    '''
+    sync_engine = engine.sync_engine
+    if slow_queries is not None:
+        slow_queries.engines[name] = engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # A stack, since a statement can be executed while another is in progress on the connection
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+        if record_metrics:
+            DB_QUERY_SECONDS.labels(name, statement_operation(statement)).observe(elapsed)
+        if slow_queries is not None:
+            slow_queries.record(name, statement, parameters, executemany, elapsed)
+        timing = current_request_timing.get()
+        if timing is not None:
+            timing.add_query(elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get(_START_KEY) if conn is not None else None
+        if starts:
+            starts.pop()
+        if record_metrics:
+            DB_QUERY_ERRORS.labels(name).inc()
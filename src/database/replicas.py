@@ -0,0 +1,222 @@
+# replicas.py
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_REPLICA_HEALTHY = metrics.gauge("db_replica_healthy", "1 if the reader replica is in rotation, 0 if ejected", ("replica",))
+DB_REPLICA_OUTSTANDING = metrics.gauge("db_replica_outstanding", "Sessions open on the reader replica", ("replica",))
+DB_REPLICA_LATENCY_SECONDS = metrics.gauge(
+    "db_replica_latency_seconds", "Moving average of the reader replica's query latency", ("replica",)
+)
+
+STRATEGIES = ("round_robin", "least_outstanding", "lowest_latency")
+
+# Smoothing factor for the latency moving average
+_EWMA_ALPHA = 0.2
+
+
+class ReaderReplica:
+    """One reader endpoint with its engine, session factory and health state."""
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.ejected_until = 0.0
+        self.router: Optional["ReplicaRouter"] = None
+
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.outstanding += 1
+        conn.info.setdefault("replica_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.outstanding -= 1
+        elapsed = time.perf_counter() - conn.info["replica_query_start"].pop()
+        if self.router:
+            self.router.record_success(self, elapsed)
+
+    def _handle_error(self, exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("replica_query_start"):
+            conn.info["replica_query_start"].pop()
+            self.outstanding -= 1
+        # SQL errors say nothing about the replica; connection failures do
+        if self.router and (conn is None or exception_context.is_disconnect):
+            self.router.record_failure(self)
+
+
+class ReplicaRouter:
+    """
+    Picks a reader replica for each read-only session.
+
+    Replicas are ejected for `eject_seconds` after `eject_after_failures`
+    consecutive connection failures or a health check slower than `slow_ms`.
+    If every replica is ejected, all of them are used again rather than
+    failing reads outright.
+    """
+
+    def __init__(self,
+                 replicas: list[ReaderReplica],
+                 strategy: str = "round_robin",
+                 eject_after_failures: int = 3,
+                 slow_ms: float = 500,
+                 eject_seconds: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        if not replicas:
+            raise ValueError("At least one reader replica is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown reader routing strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.replicas = replicas
+        self.strategy = strategy
+        self.eject_after_failures = eject_after_failures
+        self.slow_ms = slow_ms
+        self.eject_seconds = eject_seconds
+        self.clock = clock
+        self._round_robin = itertools.count()
+        for replica in replicas:
+            replica.router = self
+
+    def available(self) -> list[ReaderReplica]:
+        now = self.clock()
+        healthy = [replica for replica in self.replicas if replica.ejected_until <= now]
+        return healthy or self.replicas
+
+    def choose(self) -> ReaderReplica:
+        candidates = self.available()
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy == "least_outstanding":
+            return min(candidates, key=lambda replica: (replica.outstanding, replica.latency_ewma or 0.0))
+        if self.strategy == "lowest_latency":
+            return min(candidates, key=lambda replica: replica.latency_ewma or 0.0)
+        return candidates[next(self._round_robin) % len(candidates)]
+
+    def record_success(self, replica: ReaderReplica, elapsed: float):
+        replica.consecutive_failures = 0
+        if replica.latency_ewma is None:
+            replica.latency_ewma = elapsed
+        else:
+            replica.latency_ewma += _EWMA_ALPHA * (elapsed - replica.latency_ewma)
+
+    def record_failure(self, replica: ReaderReplica):
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after_failures:
+            self.eject(replica, f"{replica.consecutive_failures} consecutive failures")
+
+    def eject(self, replica: ReaderReplica, reason: str):
+        if replica.ejected_until <= self.clock():
+            logger.warning(f"Ejecting reader replica {replica.name} for {self.eject_seconds}s: {reason}")
+        replica.ejected_until = self.clock() + self.eject_seconds
+
+    async def check(self, replica: ReaderReplica, timeout: float):
+        """Run a health check query against one replica and eject it if it fails or is slow."""
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"Health check failed for reader replica {replica.name}: {e}")
+            replica.consecutive_failures = self.eject_after_failures
+            self.eject(replica, "health check failed")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > self.slow_ms:
+            self.eject(replica, f"health check took {elapsed_ms:.0f}ms")
+        elif replica.ejected_until > self.clock():
+            logger.info(f"Reader replica {replica.name} is healthy again")
+            replica.ejected_until = 0.0
+            replica.consecutive_failures = 0
+
+    async def health_check_loop(self, interval: float, timeout: float):
+        while True:
+            await asyncio.gather(*(self.check(replica, timeout) for replica in self.replicas))
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        now = self.clock()
+        return {
+            replica.name: {
+                "healthy": replica.ejected_until <= now,
+                "outstanding": replica.outstanding,
+                "consecutive_failures": replica.consecutive_failures,
+                "latency_ewma_ms": (replica.latency_ewma or 0.0) * 1000,
+            }
+            for replica in self.replicas
+        }
+
+
+# Identifies the caller (e.g. a client or user id) across requests for read-your-writes
+_caller_key: ContextVar[Optional[str]] = ContextVar("read_your_writes_caller", default=None)
+# Covers reads later in the same request/task even without a caller key
+_last_write_in_context: ContextVar[float] = ContextVar("read_your_writes_last_write", default=float("-inf"))
+
+
+def set_caller_key(key: Optional[str]):
+    """Set the caller whose writes should be visible to its own later reads. Returns a ContextVar token."""
+    return _caller_key.set(key)
+
+
+def reset_caller_key(token):
+    _caller_key.reset(token)
+
+
+class ReadYourWritesTracker:
+    """Remembers recent writes so a caller's reads can go to the writer for `window_ms` afterwards."""
+
+    def __init__(self, window_ms: float, max_callers: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.window = window_ms / 1000
+        self.max_callers = max_callers
+        self.clock = clock
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+
+    def record_write(self):
+        if self.window <= 0:
+            return
+        now = self.clock()
+        _last_write_in_context.set(now)
+        key = _caller_key.get()
+        if key is None:
+            return
+        self._writes[key] = now
+        self._writes.move_to_end(key)
+        # Oldest entries first: drop the expired ones and cap the size
+        while self._writes:
+            oldest_key, written_at = next(iter(self._writes.items()))
+            if now - written_at < self.window and len(self._writes) <= self.max_callers:
+                break
+            del self._writes[oldest_key]
+
+    def should_use_writer(self) -> bool:
+        if self.window <= 0:
+            return False
+        now = self.clock()
+        if now - _last_write_in_context.get() < self.window:
+            return True
+        key = _caller_key.get()
+        return key is not None and now - self._writes.get(key, float("-inf")) < self.window
+
+
+def export_replica_stats(stats: dict):
+    """Copy ReplicaRouter.stats() into the db_replica_* metrics."""
+    for replica, replica_stats in stats.items():
+        DB_REPLICA_HEALTHY.labels(replica).set(1 if replica_stats["healthy"] else 0)
+        DB_REPLICA_OUTSTANDING.labels(replica).set(replica_stats["outstanding"])
+        DB_REPLICA_LATENCY_SECONDS.labels(replica).set(replica_stats["latency_ewma_ms"] / 1000)
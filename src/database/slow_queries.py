@@ -0,0 +1,123 @@
+# slow_queries.py
+import heapq
+import itertools
+import logging
+import time
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine
+from config import DB_SLOW_QUERY_MS, DB_SLOW_QUERY_LOG_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN can plan without running them
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Parameters listed per statement shape; long IN lists are summarised
+_MAX_SHAPE_PARAMETERS = 20
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    '''
+    The types of a statement's bound parameters, without their values, e.g. {"id_1": "int"} or ["int", "str"].
+    '''
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        items = list(parameters.items())
+        shape = {key: type(value).__name__ for key, value in items[:_MAX_SHAPE_PARAMETERS]}
+        if len(items) > _MAX_SHAPE_PARAMETERS:
+            shape["..."] = f"{len(items) - _MAX_SHAPE_PARAMETERS} more"
+        return shape
+    if isinstance(parameters, (list, tuple)):
+        shape = [type(value).__name__ for value in parameters[:_MAX_SHAPE_PARAMETERS]]
+        if len(parameters) > _MAX_SHAPE_PARAMETERS:
+            shape.append(f"... {len(parameters) - _MAX_SHAPE_PARAMETERS} more")
+        return shape
+    return None
+
+
+class SlowQuery:
+    __slots__ = ("engine", "statement", "parameters", "parameter_shape", "executemany", "duration", "captured_at",
+                 "plan")
+
+    def __init__(self, engine: str, statement: str, parameters, executemany: bool, duration: float):
+        self.engine = engine
+        self.statement = statement
+        # Kept only to run EXPLAIN; never returned by to_dict
+        self.parameters = None if executemany else parameters
+        self.parameter_shape = parameter_shape(parameters, executemany)
+        self.executemany = executemany
+        self.duration = duration
+        self.captured_at = time.time()
+        self.plan: Optional[list[str]] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "engine": self.engine,
+            "duration_ms": round(self.duration * 1000, 3),
+            "statement": self.statement,
+            "parameters": self.parameter_shape,
+            "captured_at": self.captured_at,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    '''
+    The `capacity` slowest statements seen that took at least `threshold_ms`.
+
+    Recording is a comparison for the common case of a fast statement, so
+    it runs on every execution. Plans are produced on demand by explain(),
+    with plain EXPLAIN (never ANALYZE), so capturing adds nothing to the
+    slow statement itself.
+    '''
+
+    def __init__(self, capacity: int = DB_SLOW_QUERY_LOG_SIZE, threshold_ms: float = DB_SLOW_QUERY_MS):
+        self.capacity = capacity
+        self.threshold = threshold_ms / 1000
+        self.engines: dict[str, AsyncEngine] = {}
+        self._heap: list[tuple[float, int, SlowQuery]] = []
+        self._seq = itertools.count()
+
+    def record(self, engine: str, statement: str, parameters, executemany: bool, elapsed: float):
+        if elapsed < self.threshold:
+            return
+        heap = self._heap
+        if len(heap) >= self.capacity:
+            if elapsed <= heap[0][0]:
+                return
+            heapq.heapreplace(heap, (elapsed, next(self._seq), SlowQuery(engine, statement, parameters, executemany, elapsed)))
+        else:
+            heapq.heappush(heap, (elapsed, next(self._seq), SlowQuery(engine, statement, parameters, executemany, elapsed)))
+
+    def entries(self) -> list[SlowQuery]:
+        """Slowest first."""
+        return [entry for _, _, entry in sorted(self._heap, reverse=True)]
+
+    async def explain(self, entry: SlowQuery) -> Optional[list[str]]:
+        '''
+        The statement's plan from the engine it ran on, or None if it can't be explained. Cached on the entry.
+        '''
+        if entry.plan is not None:
+            return entry.plan
+        engine = self.engines.get(entry.engine)
+        keyword = entry.statement.lstrip()[:6].upper()
+        if engine is None or entry.executemany or not keyword.startswith(_EXPLAINABLE):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + entry.statement, entry.parameters or ())
+                # PostgreSQL returns one line per row; SQLite's detail is the last column
+                entry.plan = [str(row[-1]) for row in result.fetchall()]
+        except Exception as e:
+            logger.warning(f"Could not explain slow query on {entry.engine}: {e}")
+            return None
+        return entry.plan
+
+    def clear(self):
+        self._heap.clear()
+
+
+# Create a singleton instance
+slow_query_log = SlowQueryLog()
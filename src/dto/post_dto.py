@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from dto.user_dto import UserDTO
+
+class PostDTO(BaseModel):
+    id: int
+    user_id: int
+    title: str
+    content: str
+
+class PostCreateDTO(BaseModel):
+    user_id: int
+    title: str
+    content: str
+
+class UserWithPostsDTO(UserDTO):
+    posts: list[PostDTO]
@@ -1,6 +1,28 @@
+from typing import Literal, Optional
 from pydantic import BaseModel
 
 class UserDTO(BaseModel):
     id: int
     name: str
-    email: str 
\ No newline at end of file
+    email: str 
+
+class UserCreateDTO(BaseModel):
+    name: str
+    email: str
+
+class UserPatchDTO(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+
+class BulkUsersRequest(BaseModel):
+    users: list[UserCreateDTO]
+    on_conflict: Literal["update", "skip"] = "update"
+
+class BulkUserConflict(BaseModel):
+    index: int
+    email: Optional[str]
+    reason: str
+
+class BulkUsersResponse(BaseModel):
+    users: list[UserDTO]
+    conflicts: list[BulkUserConflict]
@@ -2,5 +2,6 @@
 from .base_class import Base
 from .users import User
 from .posts import Post
+from .processed_messages import ProcessedMessage
 
-__all__ = ["User", "Post", "Base"]
+__all__ = ["User", "Post", "ProcessedMessage", "Base"]
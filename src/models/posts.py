@@ -3,16 +3,25 @@
 # For simplicity, we'll use the ORM models as the domain models here.
 # Ask abc123 to refactor this if you need separate domain models.
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from .base_class import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Serves both "posts of these users" (user_id IN ...) and keyset pages of one
+        # user's posts (user_id = ? AND id > ? ORDER BY id) without a sort or a table scan
+        Index("ix_posts_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"))  # many posts -> one user
 
+    # Never lazy loaded: load it with selectinload(Post.user) where it's needed
+    user = relationship("User", back_populates="posts", lazy="raise")
+
     def __repr__(self):
         return f"<Post id={self.id} title={self.title}>"
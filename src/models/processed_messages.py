@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Float, String
+from .base_class import Base
+
+class ProcessedMessage(Base):
+    """An SQS message that was handled successfully, so redeliveries of it can be skipped."""
+    __tablename__ = "processed_messages"
+
+    key = Column(String, primary_key=True)  # MessageId or the sender's idempotency key
+    message_type = Column(String, nullable=False)
+    processed_at = Column(Float, nullable=False)  # Unix timestamps
+    expires_at = Column(Float, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ProcessedMessage key={self.key} type={self.message_type}>"
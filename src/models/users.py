@@ -4,6 +4,7 @@
 # Ask abc123 to refactor this if you need separate domain models.
 
 from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import relationship
 from .base_class import Base
 
 class User(Base):
@@ -13,5 +14,9 @@ class User(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
 
+    # Never lazy loaded, so a loop over users can't issue one query per user:
+    # load it with selectinload(User.posts), one extra query for the whole batch
+    posts = relationship("Post", back_populates="user", order_by="Post.id", lazy="raise")
+
     def __repr__(self):
         return f"<User id={self.id} name={self.name} email={self.email}>"
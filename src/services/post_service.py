@@ -0,0 +1,38 @@
+from data_access.post_repo import PostRepository
+
+class PostService:
+    def __init__(self):
+        self.post_repo = PostRepository()
+
+    async def create_post(self, user_id, title, content):
+        new_post_obj = await self.post_repo.create_post(user_id, title, content)
+        return new_post_obj
+
+    async def get_post_by_id(self, post_id):
+        post_obj = await self.post_repo.get_post_by_id(post_id)
+        return post_obj
+
+    async def list_user_posts(self, user_id, limit=None, after=None):
+        posts = await self.post_repo.list_user_posts(user_id, limit=limit, after=after)
+        return posts
+
+    async def get_users_with_posts(self, user_ids):
+        # Repeated ids would only repeat the IN list
+        users = await self.post_repo.get_users_with_posts(list(dict.fromkeys(user_ids)))
+        return users
+
+# Create a singleton instance
+post_service = PostService()
+
+# Convenience functions that use the singleton instance
+async def create_post(user_id, title, content):
+    return await post_service.create_post(user_id, title, content)
+
+async def get_post_by_id(post_id):
+    return await post_service.get_post_by_id(post_id)
+
+async def list_user_posts(user_id, limit=None, after=None):
+    return await post_service.list_user_posts(user_id, limit=limit, after=after)
+
+async def get_users_with_posts(user_ids):
+    return await post_service.get_users_with_posts(user_ids)
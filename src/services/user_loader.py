@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class UserBatchLoader:
+    """
+    DataLoader-style coalescer for single-user lookups.
+
+    Every load() made during the same event-loop tick is collected and sent
+    as one batch_fn(ids) call (split into chunks of `max_batch_size`), then
+    each caller receives its own user, or None if it does not exist.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[int]], Awaitable[List[Any]]], max_batch_size: int = 500):
+        """
+        Args:
+            batch_fn: Coroutine that fetches users for a list of ids (e.g. UserRepository.get_users_by_ids)
+            max_batch_size: Maximum ids per batch_fn call
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.loads = 0
+        self._pending: Dict[int, List[asyncio.Future]] = {}
+        self._scheduled = False
+        # The loop only keeps weak references to tasks, so in-flight batches are held here
+        self._running: set[asyncio.Task] = set()
+
+    async def load(self, user_id: int):
+        self.loads += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(user_id, []).append(future)
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        ids = list(pending)
+        for i in range(0, len(ids), self.max_batch_size):
+            chunk = {user_id: pending[user_id] for user_id in ids[i:i + self.max_batch_size]}
+            task = asyncio.create_task(self._run(chunk))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, chunk: Dict[int, List[asyncio.Future]]):
+        self.batches += 1
+        try:
+            users = await self.batch_fn(list(chunk))
+        except Exception as e:
+            logger.error(f"Batched user lookup of {len(chunk)} ids failed: {e}")
+            for futures in chunk.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        users_by_id = {user.id: user for user in users}
+        for user_id, futures in chunk.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(users_by_id.get(user_id))
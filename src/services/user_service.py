@@ -1,37 +1,140 @@
+import logging
 from data_access.user_repo import UserRepository
+from models.users import User
+from services.user_loader import UserBatchLoader
+from utils.cache import LRUTTLCache, ReadThroughCache, RedisSharedCache, register_cache_metrics
+from utils.metrics import metrics
+from config import (
+    USERS_STREAM_CHUNK_SIZE,
+    REST_WORKERS,
+    GRPC_PROCESSES,
+    USER_CACHE_ENABLED,
+    USER_CACHE_MAXSIZE,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_REDIS_URL,
+    USER_LOOKUP_COALESCING,
+    USER_LOOKUP_MAX_BATCH,
+    METRICS_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+def _build_user_cache():
+    """Build the shared user cache from config, or None if caching is disabled."""
+    if not USER_CACHE_ENABLED:
+        return None
+    if REST_WORKERS > 1 or GRPC_PROCESSES > 1:
+        # Invalidation doesn't reach the other processes' in-process tiers
+        logger.warning(f"User cache is on with several processes: updates can take up to "
+                       f"{USER_CACHE_TTL_SECONDS}s (USER_CACHE_TTL_SECONDS) to show in the other processes")
+    cache = ReadThroughCache(
+        namespace="user",
+        local=LRUTTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_SECONDS),
+        shared=RedisSharedCache(USER_CACHE_REDIS_URL) if USER_CACHE_REDIS_URL else None,
+        dumps=lambda user: {"id": user.id, "name": user.name, "email": user.email},
+        loads=lambda data: User(**data),
+    )
+    if METRICS_ENABLED:
+        # Hits, misses, evictions and size at GET /metrics, for sizing USER_CACHE_MAXSIZE and the TTL
+        register_cache_metrics(cache, metrics)
+    return cache
+
+# One cache per process, shared by every UserService (REST and gRPC)
+user_cache = _build_user_cache()
 
 class UserService:
-    def __init__(self):
+    def __init__(self, cache=user_cache, coalesce=USER_LOOKUP_COALESCING):
         self.user_repo = UserRepository()
-    
-    async def get_all_users(self):
-        users = await self.user_repo.list_users()
+        self.cache = cache
+        # Concurrent lookups of single users share one WHERE id IN (...) query
+        self.user_loader = UserBatchLoader(
+            lambda user_ids: self.user_repo.get_users_by_ids(user_ids),
+            max_batch_size=USER_LOOKUP_MAX_BATCH,
+        ) if coalesce else None
+
+    async def get_all_users(self, limit=None, after=None):
+        users = await self.user_repo.list_users(limit=limit, after=after)
         return users
 
+    def stream_users(self, chunk_size=USERS_STREAM_CHUNK_SIZE, after=None):
+        return self.user_repo.stream_users(chunk_size=chunk_size, after=after)
+
     async def get_user_by_id(self, user_id):
-        user_obj = await self.user_repo.get_user_by_id(user_id)
+        if self.cache is None:
+            return await self._load_user(user_id)
+        user_obj = await self.cache.get_or_load(user_id, lambda: self._load_user(user_id))
         return user_obj
 
+    async def _load_user(self, user_id):
+        if self.user_loader is not None:
+            return await self.user_loader.load(user_id)
+        return await self.user_repo.get_user_by_id(user_id)
+
+    async def get_users_by_ids(self, user_ids):
+        users = await self.user_repo.get_users_by_ids(user_ids)
+        return users
+
     async def create_user(self, name, email):
         new_user_obj = await self.user_repo.create_user(name, email)
+        await self._invalidate(new_user_obj.id)
         return new_user_obj
 
+    async def bulk_upsert_users(self, users, on_conflict="update"):
+        result = await self.user_repo.bulk_upsert_users(users, on_conflict=on_conflict)
+        for user in result["users"]:
+            await self._invalidate(user.id)
+        return result
+
     async def update_user(self, user_id, name, email):
         updated_user_obj = await self.user_repo.update_user(user_id, name, email)
+        await self._invalidate(user_id)
         return updated_user_obj
 
+    async def patch_user(self, user_id, changes):
+        patched_user_obj = await self.user_repo.patch_user(user_id, changes)
+        await self._invalidate(user_id)
+        return patched_user_obj
+
+    async def delete_user(self, user_id):
+        deleted = await self.user_repo.delete_user(user_id)
+        await self._invalidate(user_id)
+        return deleted
+
+    async def _invalidate(self, user_id):
+        if self.cache is not None:
+            await self.cache.invalidate(user_id)
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters for sizing the user cache."""
+        return self.cache.stats() if self.cache is not None else {}
+
 # Create a singleton instance
 user_service = UserService()
 
 # Convenience functions that use the singleton instance
-async def get_all_users():
-    return await user_service.get_all_users()
+async def get_all_users(limit=None, after=None):
+    return await user_service.get_all_users(limit=limit, after=after)
+
+def stream_users(chunk_size=USERS_STREAM_CHUNK_SIZE, after=None):
+    return user_service.stream_users(chunk_size=chunk_size, after=after)
 
 async def get_user_by_id(user_id):
     return await user_service.get_user_by_id(user_id)
 
+async def get_users_by_ids(user_ids):
+    return await user_service.get_users_by_ids(user_ids)
+
 async def create_user(name, email):
     return await user_service.create_user(name, email)
 
+async def bulk_upsert_users(users, on_conflict="update"):
+    return await user_service.bulk_upsert_users(users, on_conflict=on_conflict)
+
 async def update_user(user_id, name, email):
-    return await user_service.update_user(user_id, name, email) 
\ No newline at end of file
+    return await user_service.update_user(user_id, name, email)
+
+async def patch_user(user_id, changes):
+    return await user_service.patch_user(user_id, changes)
+
+async def delete_user(user_id):
+    return await user_service.delete_user(user_id)
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Optional
+import aioboto3
+from aiobotocore.config import AioConfig
+from config import AWS_MAX_POOL_CONNECTIONS, AWS_CONNECT_TIMEOUT, AWS_READ_TIMEOUT
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+class AWSClientRegistry:
+    """
+    Process-wide registry of long-lived aioboto3 clients.
+
+    Keeps one client per (service, region, endpoint) so credential resolution,
+    endpoint setup and connection establishment are paid once instead of on
+    every call. Clients belong to the event loop that created them; if they are
+    requested from a different loop the registry starts afresh.
+    """
+
+    def __init__(self,
+                 max_pool_connections: int = AWS_MAX_POOL_CONNECTIONS,
+                 connect_timeout: float = AWS_CONNECT_TIMEOUT,
+                 read_timeout: float = AWS_READ_TIMEOUT):
+        """
+        Initialize the registry.
+
+        Args:
+            max_pool_connections: Size of each client's HTTP connection pool
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for a response (must exceed the SQS long-poll wait)
+        """
+        self.config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self._session = aioboto3.Session()
+        self._clients: dict[tuple, Any] = {}
+        self._exit_stack = AsyncExitStack()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Clients from another (likely closed) loop can't be reused or closed here
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._clients = {}
+            self._exit_stack = AsyncExitStack()
+
+    async def get_client(self, service_name: str, region_name: Optional[str] = None,
+                         endpoint_url: Optional[str] = None):
+        """
+        Get the shared client for a service, creating it on first use.
+
+        Args:
+            service_name: AWS service name, e.g. "sqs" or "sns"
+            region_name: AWS region to connect to
+            endpoint_url: Optional endpoint URL for local development
+
+        Returns:
+            An open aioboto3 client. Do not close it; call close() on the registry instead.
+        """
+        self._bind_to_running_loop()
+        key = (service_name, region_name, endpoint_url)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        async with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = await self._exit_stack.enter_async_context(
+                    self._session.client(service_name, region_name=region_name,
+                                         endpoint_url=endpoint_url, config=self.config)
+                )
+                self._clients[key] = client
+                logger.info(f"Created shared {service_name} client for region {region_name}")
+        return client
+
+    async def close(self):
+        """Close every client created on the running loop."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        async with self._lock:
+            self._clients = {}
+            exit_stack, self._exit_stack = self._exit_stack, AsyncExitStack()
+            await exit_stack.aclose()
+        logger.info("Closed shared AWS clients")
+
+# Create a singleton instance
+aws_clients = AWSClientRegistry()
+
+# Convenience functions that use the singleton instance
+async def get_aws_client(service_name: str, region_name: Optional[str] = None,
+                         endpoint_url: Optional[str] = None):
+    return await aws_clients.get_client(service_name, region_name, endpoint_url)
+
+async def close_aws_clients():
+    await aws_clients.close()
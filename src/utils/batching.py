@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+# Limits shared by SQS SendMessageBatch and SNS PublishBatch
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+# Failure code send_in_batches reports for entries of a chunk whose batch call raised
+BATCH_CALL_FAILED = "BatchCallFailed"
+
+class BatchEntryFailed(Exception):
+    """Raised for a single entry that AWS rejected inside an otherwise successful batch call."""
+
+    def __init__(self, failure: Dict[str, Any]):
+        self.failure = failure
+        self.code = failure.get("Code")
+        self.sender_fault = failure.get("SenderFault", False)
+        super().__init__(f"{self.code}: {failure.get('Message')}")
+
+
+def entry_size(entry: Dict[str, Any], body_key: str) -> int:
+    """Approximate AWS payload size of a batch entry: the body plus every message attribute."""
+    size = len(entry[body_key].encode("utf-8"))
+    for name, attribute in entry.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8")) + len(attribute["DataType"].encode("utf-8"))
+        size += len(attribute.get("StringValue", "").encode("utf-8"))
+    return size
+
+
+def chunk_entries(entries: List[Dict[str, Any]], size_of: Callable[[Dict[str, Any]], int],
+                  max_entries: int = MAX_BATCH_ENTRIES, max_bytes: int = MAX_BATCH_BYTES) -> List[List[Dict[str, Any]]]:
+    """Split entries into chunks that respect both the entry count and total payload limits."""
+    chunks = []
+    current, current_bytes = [], 0
+    for entry in entries:
+        size = size_of(entry)
+        if current and (len(current) == max_entries or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(entry)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def send_in_batches(send_chunk: Callable[[List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+                          entries: List[Dict[str, Any]],
+                          size_of: Callable[[Dict[str, Any]], int],
+                          max_retries: int = 3,
+                          retry_backoff: float = 0.05) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Send entries in limit-sized chunks, retrying only the entries that failed.
+
+    Entries that failed through the sender's fault (e.g. invalid parameters)
+    are not retried since they would fail again. If the call for a chunk
+    raises, its entries are retried too, and end up in "Failed" with Code
+    BATCH_CALL_FAILED once the retries run out.
+
+    Args:
+        send_chunk: Coroutine that sends one chunk and returns the AWS batch response
+        entries: Batch entries, each with a unique "Id"
+        size_of: Returns the payload size of an entry
+        max_retries: How many times to retry failed entries
+        retry_backoff: Initial delay between retries in seconds, doubled each attempt
+
+    Returns:
+        Dictionary with the combined "Successful" and "Failed" entries
+    """
+    successful: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+    pending = entries
+    for attempt in range(max_retries + 1):
+        by_id = {entry["Id"]: entry for entry in pending}
+        retryable = []
+        for chunk in chunk_entries(pending, size_of):
+            try:
+                response = await send_chunk(chunk)
+            except Exception as e:
+                # Keep what the other chunks achieved: the whole chunk counts as failed, not through the sender's fault
+                logger.error(f"Batch call for {len(chunk)} entries failed: {e}")
+                response = {"Failed": [
+                    {"Id": entry["Id"], "Code": BATCH_CALL_FAILED, "Message": str(e), "SenderFault": False}
+                    for entry in chunk
+                ]}
+            successful.extend(response.get("Successful", []))
+            for failure in response.get("Failed", []):
+                if failure.get("SenderFault") or attempt == max_retries:
+                    failed.append(failure)
+                else:
+                    retryable.append(by_id[failure["Id"]])
+        if not retryable:
+            break
+        logger.warning(f"Retrying {len(retryable)} failed batch entries (attempt {attempt + 1})")
+        await asyncio.sleep(retry_backoff * (2 ** attempt))
+        pending = retryable
+    return {"Successful": successful, "Failed": failed}
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-entry sends into batch calls.
+
+    Entries submitted for the same key (e.g. a queue URL) within `linger`
+    seconds are sent together; a batch is flushed early once it reaches the
+    entry or byte limit. Each submitter gets back its own result entry.
+    """
+
+    def __init__(self,
+                 send_batch: Callable[[Hashable, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+                 size_of: Callable[[Dict[str, Any]], int],
+                 linger: float = 0.005,
+                 max_entries: int = MAX_BATCH_ENTRIES,
+                 max_bytes: int = MAX_BATCH_BYTES):
+        """
+        Initialize the batcher.
+
+        Args:
+            send_batch: Coroutine taking (key, entries) and returning an AWS-style batch response
+            size_of: Returns the payload size of an entry
+            linger: Seconds to wait for more entries before sending a partial batch
+            max_entries: Maximum entries per batch
+            max_bytes: Maximum total payload per batch
+        """
+        self.send_batch = send_batch
+        self.size_of = size_of
+        self.linger = linger
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._pending: Dict[Hashable, List[tuple]] = {}
+        self._pending_bytes: Dict[Hashable, int] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._sending: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an entry (without an Id) for sending and wait for its own result."""
+        future = asyncio.get_running_loop().create_future()
+        size = self.size_of(entry)
+        if key in self._pending and self._pending_bytes[key] + size > self.max_bytes:
+            self._flush(key)
+
+        self._pending.setdefault(key, []).append((entry, future))
+        self._pending_bytes[key] = self._pending_bytes.get(key, 0) + size
+
+        if len(self._pending[key]) >= self.max_entries:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.linger, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        items = self._pending.pop(key, [])
+        self._pending_bytes.pop(key, None)
+        if items:
+            task = asyncio.create_task(self._send(key, items))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: Hashable, items: List[tuple]):
+        entries = [{**entry, "Id": str(i)} for i, (entry, _) in enumerate(items)]
+        try:
+            response = await self.send_batch(key, entries)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results = {result["Id"]: result for result in response.get("Successful", [])}
+        failures = {failure["Id"]: failure for failure in response.get("Failed", [])}
+        for i, (_, future) in enumerate(items):
+            if future.done():
+                continue
+            if str(i) in results:
+                future.set_result(results[str(i)])
+            else:
+                future.set_exception(BatchEntryFailed(failures.get(str(i), {"Id": str(i), "Code": "Unknown"})))
+
+    async def flush(self):
+        """Send everything that is waiting and wait for all in-progress batches."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from utils.metrics import MetricsRegistry
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+class LRUTTLCache:
+    """Bounded in-process cache; entries expire after `ttl` seconds and the least recently used are evicted first."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (found, value)."""
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= self.clock():
+            del self._data[key]
+            self.expirations += 1
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (self.clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class SharedCache:
+    """Interface for an optional cache tier shared between processes (e.g. Redis)."""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+
+class RedisSharedCache(SharedCache):
+    """Shared tier backed by Redis. Requires the optional `redis` package."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: float):
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, key: str):
+        await self._redis.delete(key)
+
+
+class ReadThroughCache:
+    """
+    Read-through cache with an in-process tier and an optional shared tier.
+
+    Concurrent misses for the same key are collapsed into a single load
+    (single-flight). A load that races with invalidate() is returned to its
+    callers but not stored, so a write is never overwritten by an older read.
+    `None` results are not cached.
+    """
+
+    def __init__(self,
+                 namespace: str,
+                 local: LRUTTLCache,
+                 shared: Optional[SharedCache] = None,
+                 dumps: Callable[[Any], Dict[str, Any]] = None,
+                 loads: Callable[[Dict[str, Any]], Any] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: Prefix for keys in the shared tier
+            local: The in-process tier
+            shared: Optional shared tier
+            dumps: Converts a value to a JSON-serializable dict for the shared tier
+            loads: Rebuilds a value from the dict stored in the shared tier
+        """
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.dumps = dumps
+        self.loads = loads
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.loads_collapsed = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Loads still running after invalidate() dropped them from _inflight
+        self._loading: set[asyncio.Task] = set()
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        found, value = self.local.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.loads_collapsed += 1
+        else:
+            # The load runs in its own task so cancelling the caller that started it
+            # (e.g. a client disconnecting) doesn't fail everyone waiting on the same key
+            inflight = asyncio.create_task(self._run_load(key, loader))
+            self._inflight[key] = inflight
+            self._loading.add(inflight)
+            inflight.add_done_callback(self._load_done)
+        return await asyncio.shield(inflight)
+
+    async def _run_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+        try:
+            return await self._load(key, loader, task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def _load_done(self, task: asyncio.Task):
+        self._loading.discard(task)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def _still_current(self, key: Hashable, task: asyncio.Task) -> bool:
+        """False once invalidate() has run for the key since this load started."""
+        return self._inflight.get(key) is task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], task: asyncio.Task) -> Any:
+        if self.shared is not None:
+            try:
+                cached = await self.shared.get(self._shared_key(key))
+            except Exception as e:
+                logger.warning(f"Shared cache get failed for {key}: {e}")
+                cached = None
+            if cached is not None:
+                self.shared_hits += 1
+                value = self.loads(json.loads(cached))
+                if self._still_current(key, task):
+                    self.local.set(key, value)
+                return value
+
+        self.misses += 1
+        value = await loader()
+        if value is not None and self._still_current(key, task):
+            self.local.set(key, value)
+            if self.shared is not None:
+                try:
+                    await self.shared.set(self._shared_key(key), json.dumps(self.dumps(value)), self.local.ttl)
+                except Exception as e:
+                    logger.warning(f"Shared cache set failed for {key}: {e}")
+        return value
+
+    async def invalidate(self, key: Hashable):
+        """Drop a key from both tiers and stop any in-flight load from storing its result."""
+        self._inflight.pop(key, None)
+        self.local.delete(key)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(self._shared_key(key))
+            except Exception as e:
+                logger.warning(f"Shared cache delete failed for {key}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for sizing the cache."""
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "loads_collapsed": self.loads_collapsed,
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+            "size": len(self.local),
+            "maxsize": self.local.maxsize,
+        }
+
+
+def register_cache_metrics(cache: ReadThroughCache, registry: MetricsRegistry):
+    """
+    Export a cache's stats() as cache_* metrics labelled with its namespace,
+    copied from its counters whenever the registry is scraped.
+    """
+    lookups = registry.counter("cache_lookups", "Cache lookups by cache and result", ("cache", "result"))
+    removals = registry.counter("cache_removals", "Entries dropped from the in-process tier, by reason", ("cache", "reason"))
+    entries = registry.gauge("cache_entries", "Entries in the in-process tier", ("cache",))
+    capacity = registry.gauge("cache_max_entries", "Capacity of the in-process tier", ("cache",))
+    name = cache.namespace
+
+    def collect():
+        stats = cache.stats()
+        lookups.labels(name, "hit").value = stats["hits"]
+        lookups.labels(name, "shared_hit").value = stats["shared_hits"]
+        lookups.labels(name, "miss").value = stats["misses"]
+        lookups.labels(name, "collapsed").value = stats["loads_collapsed"]
+        removals.labels(name, "evicted").value = stats["evictions"]
+        removals.labels(name, "expired").value = stats["expirations"]
+        entries.labels(name).set(stats["size"])
+        capacity.labels(name).set(stats["maxsize"])
+
+    registry.add_collector(collect)
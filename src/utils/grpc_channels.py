@@ -0,0 +1,166 @@
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+import grpc
+import grpc.aio
+from config import (
+    GRPC_CLIENT_CHANNELS,
+    GRPC_CLIENT_TIMEOUT,
+    GRPC_CLIENT_KEEPALIVE_TIME_MS,
+    GRPC_CLIENT_KEEPALIVE_TIMEOUT_MS,
+    GRPC_CLIENT_MAX_ATTEMPTS,
+    GRPC_CLIENT_BATCH_CONCURRENCY,
+    GRPC_MAX_RECEIVE_MESSAGE_BYTES,
+    GRPC_MAX_SEND_MESSAGE_BYTES,
+)
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+
+def build_service_config(max_attempts: int = GRPC_CLIENT_MAX_ATTEMPTS, timeout: float = GRPC_CLIENT_TIMEOUT) -> dict:
+    """
+    Service config applied to every method: round-robin across the resolved
+    addresses, a default deadline, and retries with backoff for UNAVAILABLE
+    and RESOURCE_EXHAUSTED (the server's overload rejection). Retry throttling
+    stops retries when most calls are failing, so they can't amplify an outage.
+    """
+    method_config = {"name": [{}], "timeout": f"{timeout}s"}
+    if max_attempts > 1:
+        method_config["retryPolicy"] = {
+            "maxAttempts": max_attempts,
+            "initialBackoff": "0.05s",
+            "maxBackoff": "1s",
+            "backoffMultiplier": 2,
+            "retryableStatusCodes": ["UNAVAILABLE", "RESOURCE_EXHAUSTED"],
+        }
+    return {
+        "loadBalancingConfig": [{"round_robin": {}}],
+        "methodConfig": [method_config],
+        "retryThrottling": {"maxTokens": 10, "tokenRatio": 0.1},
+    }
+
+
+def channel_options(service_config: dict) -> list[tuple[str, Any]]:
+    return [
+        ("grpc.service_config", json.dumps(service_config)),
+        ("grpc.enable_retries", 1),
+        ("grpc.keepalive_time_ms", GRPC_CLIENT_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", GRPC_CLIENT_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.max_receive_message_length", GRPC_MAX_RECEIVE_MESSAGE_BYTES),
+        ("grpc.max_send_message_length", GRPC_MAX_SEND_MESSAGE_BYTES),
+        # Without this, channels with identical arguments share one connection per address
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
+class GrpcChannelPool:
+    """
+    Process-wide pool of long-lived gRPC channels, keyed by target.
+
+    Each target gets `size` channels, each with its own connections, handed
+    out round-robin so concurrent calls spread over several HTTP/2
+    connections instead of one. Targets are resolved with the dns resolver,
+    so a name with several addresses (e.g. a headless service) is balanced
+    across all of them. Channels belong to the event loop that created them;
+    if they are requested from a different loop the pool starts afresh.
+    """
+
+    def __init__(self, size: int = GRPC_CLIENT_CHANNELS, service_config: Optional[dict] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Channels per target
+            service_config: gRPC service config; defaults to build_service_config()
+        """
+        self.size = max(1, size)
+        self.options = channel_options(service_config or build_service_config())
+        self._channels: dict[str, list[grpc.aio.Channel]] = {}
+        self._cycles: dict[str, Iterator[grpc.aio.Channel]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Channels from another (likely closed) loop can't be reused or closed here
+            self._loop = loop
+            self._channels = {}
+            self._cycles = {}
+
+    def get_channel(self, target: str) -> grpc.aio.Channel:
+        """
+        Get a pooled channel for a target, creating the target's channels on first use.
+
+        Args:
+            target: "host:port" or a full gRPC target such as "dns:///host:port"
+
+        Returns:
+            An open channel. Do not close it; call close() on the pool instead.
+        """
+        self._bind_to_running_loop()
+        cycle = self._cycles.get(target)
+        if cycle is None:
+            resolved = target if "://" in target else f"dns:///{target}"
+            channels = [grpc.aio.insecure_channel(resolved, options=self.options) for _ in range(self.size)]
+            self._channels[target] = channels
+            cycle = self._cycles[target] = itertools.cycle(channels)
+            logger.info(f"Created {self.size} gRPC channels to {resolved}")
+        return next(cycle)
+
+    def stats(self) -> dict:
+        return {target: len(channels) for target, channels in self._channels.items()}
+
+    async def close(self):
+        """Close every channel created on the running loop."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        channels = [channel for pool in self._channels.values() for channel in pool]
+        self._channels = {}
+        self._cycles = {}
+        await asyncio.gather(*(channel.close() for channel in channels))
+        logger.info("Closed pooled gRPC channels")
+
+
+async def batch(call: Callable[..., Awaitable], requests: Iterable, concurrency: int = GRPC_CLIENT_BATCH_CONCURRENCY,
+                timeout: Optional[float] = GRPC_CLIENT_TIMEOUT) -> list:
+    """
+    Make one call per request with at most `concurrency` in flight.
+
+    Args:
+        call: A stub method, e.g. stub.GetUser
+        requests: Request messages
+        concurrency: Maximum calls in flight
+        timeout: Deadline for each call in seconds
+
+    Returns:
+        One entry per request, in order: the response, or the grpc.aio.AioRpcError the call failed with
+    """
+    requests = list(requests)
+    results: list = [None] * len(requests)
+    indexes = iter(range(len(requests)))
+
+    async def worker():
+        # Workers pull the next request, so only `concurrency` calls exist at a time
+        for i in indexes:
+            try:
+                results[i] = await call(requests[i], timeout=timeout)
+            except grpc.aio.AioRpcError as e:
+                results[i] = e
+
+    await asyncio.gather(*(worker() for _ in range(min(max(1, concurrency), len(requests)))))
+    return results
+
+
+# Create a singleton instance
+grpc_channels = GrpcChannelPool()
+
+# Convenience functions that use the singleton instance
+def get_grpc_channel(target: str) -> grpc.aio.Channel:
+    return grpc_channels.get_channel(target)
+
+async def close_grpc_channels():
+    await grpc_channels.close()
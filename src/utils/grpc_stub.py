@@ -1,42 +1,116 @@
+import grpc
 import grpc.aio
 import asyncio
-from compsci399_grpc import greeter_pb2, greeter_pb2_grpc, user_pb2, user_pb2_grpc
+from typing import Iterable, Optional
+from adapters.grpc.proto.greeting import greeter_pb2, greeter_pb2_grpc
+from adapters.grpc.proto.user import user_pb2, user_pb2_grpc
+from utils.grpc_channels import get_grpc_channel, close_grpc_channels, batch
+from config import GRPC_CLIENT_TIMEOUT, GRPC_CLIENT_BATCH_CONCURRENCY
 
 class GrpcClient:
-    """An async client for making gRPC calls to various services."""
-    
-    def __init__(self, host, port):
-        """Initialize the client with a connection to the gRPC server."""
-        self.channel = grpc.aio.insecure_channel(f'{host}:{port}')
-        
-        # Initialize service stubs
-        self.greeter = greeter_pb2_grpc.GreeterStub(self.channel)
-        self.user = user_pb2_grpc.UserStub(self.channel)
-    
+    """
+    An async client for making gRPC calls to various services.
+
+    Clients are cheap: they use the process-wide channel pool, so creating
+    one per use doesn't open a new connection. The channel is taken from the
+    pool on first use, so a client can be built outside a running event loop.
+    Pooled channels live for the whole process, shared by every client; call
+    close_grpc_channels() once on shutdown.
+    """
+
+    def __init__(self, host, port, timeout: float = GRPC_CLIENT_TIMEOUT):
+        """
+        Initialize the client for a gRPC server.
+
+        Args:
+            host: Server host name; every address it resolves to is used
+            port: Server port
+            timeout: Default deadline for calls made through the helpers below
+        """
+        self.target = f'{host}:{port}'
+        self.timeout = timeout
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._greeter: Optional[greeter_pb2_grpc.GreeterStub] = None
+        self._user: Optional[user_pb2_grpc.UserStub] = None
+
+    @property
+    def channel(self) -> grpc.aio.Channel:
+        """The pooled channel this client calls through. Needs a running event loop."""
+        if self._channel is None:
+            self._channel = get_grpc_channel(self.target)
+        return self._channel
+
+    @property
+    def greeter(self) -> greeter_pb2_grpc.GreeterStub:
+        if self._greeter is None:
+            self._greeter = greeter_pb2_grpc.GreeterStub(self.channel)
+        return self._greeter
+
+    @property
+    def user(self) -> user_pb2_grpc.UserStub:
+        if self._user is None:
+            self._user = user_pb2_grpc.UserStub(self.channel)
+        return self._user
+
+    async def get_user(self, user_id: int, timeout: Optional[float] = None):
+        """Fetch one user, or None if it doesn't exist."""
+        try:
+            return await self.user.GetUser(user_pb2.GetUserRequest(id=user_id), timeout=timeout or self.timeout)
+        except grpc.aio.AioRpcError as e:
+            if e.code() == grpc.StatusCode.NOT_FOUND:
+                return None
+            raise
+
+    async def batch_get_users(self, user_ids: Iterable[int], concurrency: int = GRPC_CLIENT_BATCH_CONCURRENCY,
+                              timeout: Optional[float] = None) -> list:
+        """
+        Fan out one GetUser call per id with at most `concurrency` in flight.
+
+        Returns:
+            One entry per id, in order: the GetUserResponse, None if the user
+            doesn't exist, or the grpc.aio.AioRpcError the call failed with
+        """
+        requests = [user_pb2.GetUserRequest(id=user_id) for user_id in user_ids]
+        results = await batch(self.user.GetUser, requests, concurrency, timeout or self.timeout)
+        return [
+            None if isinstance(result, grpc.aio.AioRpcError) and result.code() == grpc.StatusCode.NOT_FOUND else result
+            for result in results
+        ]
+
     async def close(self):
-        """Close the gRPC channel."""
-        await self.channel.close()
-    
+        """
+        Drop the client's reference to its pooled channel and stubs.
+
+        The channel itself stays open for other clients until
+        close_grpc_channels(); a closed client takes a channel from the pool
+        again if it is used afterwards.
+        """
+        self._channel = None
+        self._greeter = None
+        self._user = None
+
     async def __aenter__(self):
         """Support for async 'with' statement."""
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Ensure the channel is closed when exiting an async 'with' block."""
+        """Release the client when exiting an async 'with' block."""
         await self.close()
 
 async def run():
-    # Example of using the client with an async context manager for automatic cleanup
+    # Example of using the client with an async context manager
     async with GrpcClient('localhost', 50021) as client:
         # Call Greeter.SayHello
         hello_request = greeter_pb2.HelloRequest(name="John")
-        hello_response = await client.greeter.SayHello(hello_request)
+        hello_response = await client.greeter.SayHello(hello_request, timeout=client.timeout)
         print(f"Greeting: {hello_response.message}")
-        
-        # Call User.GetUser
-        # user_request = user_pb2.GetUserRequest(id=1)
-        # user_response = await client.user.GetUser(user_request)
-        # print(f"User name: {user_response.name}")
+
+        # Call User.GetUser for several users, 32 at a time
+        # users = await client.batch_get_users(range(1, 101))
+        # print(f"Found {sum(user is not None for user in users)} users")
+
+    # Close the pooled channels once, on shutdown
+    await close_grpc_channels()
 
 if __name__ == '__main__':
-    asyncio.run(run())
\ No newline at end of file
+    asyncio.run(run())
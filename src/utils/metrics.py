@@ -0,0 +1,263 @@
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second handlers
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    A metric family: one child per distinct label values.
+
+    Children are created on first use and kept, so hot paths should look a
+    child up once (metric.labels(...)) and reuse it. Observations are plain
+    attribute updates with no locking: they are meant to be made from the
+    event loop thread, which is where every instrumented path runs.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def clear(self):
+        """Zero every child in place, so children cached by callers stay live (for tests)."""
+        for child in self._children.values():
+            child.reset()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple, child) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def reset(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Counter(_Metric):
+    """A monotonically increasing count; name it without the _total suffix, which is added on render."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+    def _render_child(self, values: tuple, child) -> list[str]:
+        return [f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def reset(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+    def dec(self, amount: float = 1):
+        self._default.value -= amount
+
+    def set(self, value: float):
+        self._default.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        # Non-cumulative; the last slot is the +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return _Timer(self._default)
+
+    def _render_child(self, values: tuple, child: _HistogramChild) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metric families rendered in the Prometheus text format.
+
+    Observing is a dict lookup (skipped when the child is cached) plus an
+    attribute update, well under a microsecond, so instrumentation can stay on
+    in production. Each process has its own registry: with several uvicorn
+    workers or consumer processes, every process reports its own numbers.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+            # Modules imported twice under different names share one family
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collect: Callable[[], None]):
+        """
+        Run `collect` before every render. For state that is already counted
+        elsewhere (e.g. cache or pool stats): the collector copies it into its
+        metrics at scrape time instead of the hot path updating both.
+        """
+        self._collectors.append(collect)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def clear(self):
+        """Reset every metric's values, keeping the families (for tests)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            collect()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Create a singleton instance
+metrics = MetricsRegistry()
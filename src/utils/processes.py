@@ -0,0 +1,45 @@
+import logging
+import multiprocessing
+from typing import Callable
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+PROCESS_LOG_FORMAT = '%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_process_logging():
+    """Logging for a worker process; includes the pid so interleaved output can be told apart."""
+    logging.basicConfig(level=logging.INFO, format=PROCESS_LOG_FORMAT)
+
+
+def run_processes(target: Callable, args: tuple = (), processes: int = 1, name: str = "worker"):
+    """
+    Run target(*args) in `processes` spawned processes and block until they all exit.
+
+    Spawn (not fork) gives every process a fresh interpreter, so no event
+    loop, connection or client is inherited from the parent. On Ctrl+C the
+    processes are terminated.
+
+    Args:
+        target: Module-level function to run in each process
+        args: Arguments for target; must be picklable
+        processes: Number of processes to start
+        name: Prefix for the process names
+    """
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(target=target, args=args, name=f"{name}-{i}")
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Started {processes} {name} processes")
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
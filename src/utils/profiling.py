@@ -0,0 +1,112 @@
+import asyncio
+import cProfile
+import logging
+import marshal
+import os
+import sys
+import threading
+from collections import Counter
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+PROFILE_FORMATS = ("collapsed", "pstats")
+
+
+class ProfilerBusy(RuntimeError):
+    """A profile is already running in this process."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class EventLoopSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and counts identical stacks.
+
+    Sampling costs the target thread nothing between samples, so it can be
+    pointed at a production event loop. Time the loop spends idle shows up
+    under the selector's select() frame.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-loop-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def collapsed_stacks(samples: Counter) -> str:
+    """Samples in the folded format read by flamegraph.pl, speedscope and inferno."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+_profile_lock = threading.Lock()
+
+
+async def profile_event_loop(seconds: float, profile_format: str = "collapsed", interval: float = 0.005) -> bytes:
+    """
+    Profile the running event loop (every task on it) for `seconds`.
+
+    Args:
+        seconds: How long to profile for
+        profile_format: "collapsed" samples stacks every `interval` seconds and returns folded
+            stacks for a flamegraph; "pstats" traces every call with cProfile and returns a
+            file for pstats.Stats or snakeviz (more detail, more overhead while it runs)
+        interval: Seconds between samples in collapsed format
+
+    Returns:
+        The profile file's contents
+
+    Raises:
+        ProfilerBusy: If a profile is already running
+    """
+    if profile_format not in PROFILE_FORMATS:
+        raise ValueError(f"Unknown profile format {profile_format!r}, expected one of {PROFILE_FORMATS}")
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    logger.info(f"Profiling the event loop for {seconds}s ({profile_format})")
+    try:
+        if profile_format == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.disable()
+            profiler.create_stats()
+            # What Profile.dump_stats writes
+            return marshal.dumps(profiler.stats)
+
+        sampler = EventLoopSampler(threading.get_ident(), interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            samples = sampler.stop()
+        return collapsed_stacks(samples).encode()
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,90 @@
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Optional
+from config import SLOW_REQUEST_MS, SLOW_REQUEST_LOG_SIZE
+
+# Get a logger for this module - configuration should be done in app.py
+logger = logging.getLogger(__name__)
+
+
+class RequestTiming:
+    """
+    Where one request's time went. The database layer adds query time as it
+    executes; the REST layer marks when the endpoint ran and when the
+    response started.
+    """
+
+    __slots__ = ("method", "path", "start", "db", "queries", "handler_start", "handler_end", "response_start")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.handler_start = None
+        self.handler_end = None
+        self.response_start = None
+
+    def add_query(self, elapsed: float):
+        self.db += elapsed
+        self.queries += 1
+
+    def breakdown(self, end: float, status: int) -> dict:
+        """
+        Milliseconds spent in queries (db), in the endpoint outside queries
+        (handler), between the endpoint returning and the response starting
+        (serialization: response validation and encoding) and everywhere else
+        (other: routing, dependencies, middleware and sending the body).
+        """
+        total = end - self.start
+        handler = serialization = 0.0
+        if self.handler_start is not None and self.handler_end is not None:
+            handler = max(0.0, self.handler_end - self.handler_start - self.db)
+            if self.response_start is not None:
+                serialization = max(0.0, self.response_start - self.handler_end)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            "db_ms": round(self.db * 1000, 3),
+            "queries": self.queries,
+            "handler_ms": round(handler * 1000, 3),
+            "serialization_ms": round(serialization * 1000, 3),
+            "other_ms": round(max(0.0, total - self.db - handler - serialization) * 1000, 3),
+        }
+
+
+current_request_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar(
+    "current_request_timing", default=None
+)
+
+
+class SlowRequestLog:
+    """The most recent requests slower than `threshold_ms`, with their timing breakdowns."""
+
+    def __init__(self, capacity: int = SLOW_REQUEST_LOG_SIZE, threshold_ms: float = SLOW_REQUEST_MS):
+        self.threshold = threshold_ms / 1000
+        self.entries: deque = deque(maxlen=capacity)
+
+    def record(self, timing: RequestTiming, status: int, end: float):
+        if end - timing.start < self.threshold:
+            return
+        breakdown = timing.breakdown(end, status)
+        breakdown["at"] = time.time()
+        self.entries.append(breakdown)
+        logger.warning(
+            f"Slow request {timing.method} {timing.path} ({status}): {breakdown['total_ms']}ms total, "
+            f"db {breakdown['db_ms']}ms in {timing.queries} queries, handler {breakdown['handler_ms']}ms, "
+            f"serialization {breakdown['serialization_ms']}ms, other {breakdown['other_ms']}ms"
+        )
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Create a singleton instance
+slow_requests = SlowRequestLog()
@@ -1,7 +1,9 @@
 import json
 import logging
-import aioboto3
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
+from utils.aws_clients import get_aws_client, close_aws_clients
+from utils.batching import MicroBatcher, entry_size, send_in_batches
+from config import SNS_PUBLISH_LINGER_MS, AWS_BATCH_MAX_RETRIES
 
 # Get a logger for this module - configuration should be done in app.py
 logger = logging.getLogger(__name__)
@@ -9,7 +11,8 @@ logger = logging.getLogger(__name__)
 class SNSClient:
     """Asynchronous client for interacting with AWS SNS topics."""
     
-    def __init__(self, topic_arn: str, region_name: str = None, endpoint_url: Optional[str] = None):
+    def __init__(self, topic_arn: str, region_name: str = None, endpoint_url: Optional[str] = None,
+                 linger_ms: float = SNS_PUBLISH_LINGER_MS, max_retries: int = AWS_BATCH_MAX_RETRIES):
         """
         Initialize the SNS client.
         
@@ -17,6 +20,8 @@ class SNSClient:
             topic_arn: The ARN of the SNS topic to publish to
             region_name: AWS region to connect to (extracted from ARN if not provided)
             endpoint_url: Optional endpoint URL for local development
+            linger_ms: If greater than 0, single publishes made within this window are merged into batch calls
+            max_retries: How many times failed batch entries are retried
         """
         self.topic_arn = topic_arn
         
@@ -29,7 +34,8 @@ class SNSClient:
         
         self.region_name = region_name
         self.endpoint_url = endpoint_url
-        self.session = aioboto3.Session()
+        self.max_retries = max_retries
+        self._batcher = MicroBatcher(self._publish_entries, self._entry_size, linger=linger_ms / 1000) if linger_ms > 0 else None
     
     async def __aenter__(self):
         """Support for async with statement."""
@@ -37,7 +43,38 @@ class SNSClient:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up resources when exiting the async context."""
-        pass  # The aioboto3 client handles closing resources
+        # The shared client is closed by close_aws_clients() in the app lifespan
+        if self._batcher:
+            await self._batcher.flush()
+    
+    @staticmethod
+    def _message_attributes(message_type: str, content_type: str) -> Dict[str, Any]:
+        """Standard message attributes - keeping consistent with SQS client"""
+        return {
+            'Message-Type': {
+                'DataType': 'String',
+                'StringValue': message_type
+            },
+            'Content-Type': {
+                'DataType': 'String',
+                'StringValue': content_type
+            }
+        }
+    
+    @staticmethod
+    def _entry_size(entry: Dict[str, Any]) -> int:
+        return entry_size(entry, 'Message')
+    
+    async def _publish_entries(self, topic_arn: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Publish prepared batch entries, chunked to the SNS limits, retrying failed entries."""
+        sns = await get_aws_client('sns', region_name=self.region_name,
+                                   endpoint_url=self.endpoint_url)
+        return await send_in_batches(
+            lambda chunk: sns.publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=chunk),
+            entries,
+            self._entry_size,
+            max_retries=self.max_retries
+        )
     
     async def publish_message(self, 
                           message: Union[str, Dict[str, Any]], 
@@ -65,37 +102,74 @@ class SNSClient:
         if isinstance(message, dict):
             message = json.dumps(message)
         
-        # Standard message attributes - keeping consistent with SQS client
-        message_attributes = {
-            'Message-Type': {
-                'DataType': 'String',
-                'StringValue': message_type
-            },
-            'Content-Type': {
-                'DataType': 'String',
-                'StringValue': content_type
+        message_attributes = self._message_attributes(message_type, content_type)
+        
+        try:
+            publish_params = {
+                'Message': message,
+                'MessageAttributes': message_attributes
             }
-        }
+            
+            if subject:
+                publish_params['Subject'] = subject
+            
+            if self._batcher:
+                response = await self._batcher.submit(topic_arn, publish_params)
+            else:
+                sns = await get_aws_client('sns', region_name=self.region_name,
+                                           endpoint_url=self.endpoint_url)
+                response = await sns.publish(TopicArn=topic_arn, **publish_params)
+            
+            logger.info(f"Message published to topic {topic_arn}, MessageId: {response.get('MessageId')}")
+            return response
+        except Exception as e:
+            logger.error(f"Error publishing message to SNS topic {topic_arn}: {str(e)}")
+            raise
+    
+    async def publish_batch(self,
+                        messages: List[Union[str, Dict[str, Any]]],
+                        message_type: str = "template",
+                        content_type: str = "application/json",
+                        topic_arn: str = None,
+                        subject: str = None) -> Dict[str, Any]:
+        """
+        Publish many messages to an SNS topic using as few PublishBatch calls as possible.
+        
+        Messages are chunked to the 10 entry / 256 KB batch limits and only
+        entries that fail are retried.
         
-        async with self.session.client('sns', region_name=self.region_name, 
-                                     endpoint_url=self.endpoint_url) as sns:
-            try:
-                publish_params = {
-                    'TopicArn': topic_arn,
-                    'Message': message,
-                    'MessageAttributes': message_attributes
-                }
-                
-                if subject:
-                    publish_params['Subject'] = subject
-                
-                response = await sns.publish(**publish_params)
-                
-                logger.info(f"Message published to topic {topic_arn}, MessageId: {response.get('MessageId')}")
-                return response
-            except Exception as e:
-                logger.error(f"Error publishing message to SNS topic {topic_arn}: {str(e)}")
-                raise
+        Args:
+            messages: The messages to publish (strings or dictionaries)
+            message_type: Value for the Message-Type attribute
+            content_type: Value for the Content-Type attribute
+            topic_arn: Optional override for the topic ARN
+            subject: Optional subject for the messages
+            
+        Returns:
+            Dictionary with "Successful" and "Failed" entries; each entry's Id is the index of its message
+        """
+        topic_arn = topic_arn or self.topic_arn
+        message_attributes = self._message_attributes(message_type, content_type)
+        entries = []
+        for i, message in enumerate(messages):
+            entry = {
+                'Id': str(i),
+                'Message': json.dumps(message) if isinstance(message, dict) else message,
+                'MessageAttributes': message_attributes
+            }
+            if subject:
+                entry['Subject'] = subject
+            entries.append(entry)
+        
+        try:
+            response = await self._publish_entries(topic_arn, entries)
+            logger.info(f"Published {len(response['Successful'])} of {len(entries)} messages to topic {topic_arn}")
+            for failure in response['Failed']:
+                logger.error(f"Failed to publish message {failure['Id']} to topic {topic_arn}: {failure}")
+            return response
+        except Exception as e:
+            logger.error(f"Error publishing message batch to SNS topic {topic_arn}: {str(e)}")
+            raise
     
     async def publish_text_message(self, 
                               text: str,
@@ -170,6 +244,9 @@ async def example_usage():
             message={"data": "Using general method"},
             subject="Example message notification"
         )
+    
+    # Close the shared client once the program is done with it
+    await close_aws_clients()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 import json
 import logging
-import aioboto3
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
+from utils.aws_clients import get_aws_client, close_aws_clients
+from utils.batching import MicroBatcher, entry_size, send_in_batches
+from config import SQS_SEND_LINGER_MS, AWS_BATCH_MAX_RETRIES
 
 # Get a logger for this module - configuration should be done in app.py
 logger = logging.getLogger(__name__)
@@ -9,7 +11,8 @@ logger = logging.getLogger(__name__)
 class SQSClient:
     """Asynchronous client for interacting with AWS SQS queues."""
     
-    def __init__(self, queue_url: str, region_name: str = "ap-southeast-2", endpoint_url: Optional[str] = None):
+    def __init__(self, queue_url: str, region_name: str = "ap-southeast-2", endpoint_url: Optional[str] = None,
+                 linger_ms: float = SQS_SEND_LINGER_MS, max_retries: int = AWS_BATCH_MAX_RETRIES):
         """
         Initialize the SQS client.
         
@@ -17,11 +20,14 @@ class SQSClient:
             queue_url: The URL of the SQS queue to send messages to
             region_name: AWS region to connect to
             endpoint_url: Optional endpoint URL for local development with LocalStack
+            linger_ms: If greater than 0, single sends made within this window are merged into batch calls
+            max_retries: How many times failed batch entries are retried
         """
         self.region_name = region_name
         self.queue_url = queue_url
         self.endpoint_url = endpoint_url
-        self.session = aioboto3.Session()
+        self.max_retries = max_retries
+        self._batcher = MicroBatcher(self._send_entries, self._entry_size, linger=linger_ms / 1000) if linger_ms > 0 else None
     
     async def __aenter__(self):
         """Support for async with statement."""
@@ -29,7 +35,38 @@ class SQSClient:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up resources when exiting the async context."""
-        pass  # The aioboto3 client handles closing resources
+        # The shared client is closed by close_aws_clients() in the app lifespan
+        if self._batcher:
+            await self._batcher.flush()
+    
+    @staticmethod
+    def _message_attributes(message_type: str, content_type: str) -> Dict[str, Any]:
+        """Standard message attributes"""
+        return {
+            'Message-Type': {
+                'DataType': 'String',
+                'StringValue': message_type
+            },
+            'Content-Type': {
+                'DataType': 'String',
+                'StringValue': content_type
+            }
+        }
+    
+    @staticmethod
+    def _entry_size(entry: Dict[str, Any]) -> int:
+        return entry_size(entry, 'MessageBody')
+    
+    async def _send_entries(self, queue_url: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send prepared batch entries, chunked to the SQS limits, retrying failed entries."""
+        sqs = await get_aws_client('sqs', region_name=self.region_name,
+                                   endpoint_url=self.endpoint_url)
+        return await send_in_batches(
+            lambda chunk: sqs.send_message_batch(QueueUrl=queue_url, Entries=chunk),
+            entries,
+            self._entry_size,
+            max_retries=self.max_retries
+        )
     
     async def send_message(self, 
                        message_body: Union[str, Dict[str, Any]], 
@@ -57,33 +94,74 @@ class SQSClient:
         if isinstance(message_body, dict):
             message_body = json.dumps(message_body)
         
-        # Standard message attributes
-        message_attributes = {
-            'Message-Type': {
-                'DataType': 'String',
-                'StringValue': message_type
-            },
-            'Content-Type': {
-                'DataType': 'String',
-                'StringValue': content_type
-            }
-        }
+        message_attributes = self._message_attributes(message_type, content_type)
         
-        async with self.session.client('sqs', region_name=self.region_name, 
-                                     endpoint_url=self.endpoint_url) as sqs:
-            try:
+        try:
+            if self._batcher:
+                response = await self._batcher.submit(queue_url, {
+                    'MessageBody': message_body,
+                    'DelaySeconds': delay_seconds,
+                    'MessageAttributes': message_attributes
+                })
+            else:
+                sqs = await get_aws_client('sqs', region_name=self.region_name,
+                                           endpoint_url=self.endpoint_url)
                 response = await sqs.send_message(
                     QueueUrl=queue_url,
                     MessageBody=message_body,
                     DelaySeconds=delay_seconds,
                     MessageAttributes=message_attributes
                 )
-                
-                logger.info(f"Message sent to queue {queue_url}, MessageId: {response.get('MessageId')}")
-                return response
-            except Exception as e:
-                logger.error(f"Error sending message to SQS queue {queue_url}: {str(e)}")
-                raise
+            
+            logger.info(f"Message sent to queue {queue_url}, MessageId: {response.get('MessageId')}")
+            return response
+        except Exception as e:
+            logger.error(f"Error sending message to SQS queue {queue_url}: {str(e)}")
+            raise
+    
+    async def send_message_batch(self,
+                             messages: List[Union[str, Dict[str, Any]]],
+                             message_type: str,
+                             content_type: str = "application/json",
+                             queue_url: str = None,
+                             delay_seconds: int = 0) -> Dict[str, Any]:
+        """
+        Send many messages to an SQS queue using as few SendMessageBatch calls as possible.
+        
+        Messages are chunked to the 10 entry / 256 KB batch limits and only
+        entries that fail are retried.
+        
+        Args:
+            messages: The messages to send (strings or dictionaries)
+            message_type: Value for the Message-Type attribute
+            content_type: Value for the Content-Type attribute
+            queue_url: Optional override for the queue URL
+            delay_seconds: The time in seconds to delay the messages
+            
+        Returns:
+            Dictionary with "Successful" and "Failed" entries; each entry's Id is the index of its message
+        """
+        queue_url = queue_url or self.queue_url
+        message_attributes = self._message_attributes(message_type, content_type)
+        entries = [
+            {
+                'Id': str(i),
+                'MessageBody': json.dumps(message) if isinstance(message, dict) else message,
+                'DelaySeconds': delay_seconds,
+                'MessageAttributes': message_attributes
+            }
+            for i, message in enumerate(messages)
+        ]
+        
+        try:
+            response = await self._send_entries(queue_url, entries)
+            logger.info(f"Sent {len(response['Successful'])} of {len(entries)} messages to queue {queue_url}")
+            for failure in response['Failed']:
+                logger.error(f"Failed to send message {failure['Id']} to queue {queue_url}: {failure}")
+            return response
+        except Exception as e:
+            logger.error(f"Error sending message batch to SQS queue {queue_url}: {str(e)}")
+            raise
     
     async def send_text_message(self, 
                            text: str,
@@ -161,6 +239,9 @@ async def example_usage():
             message_body={"data": "Using general method"},
             message_type="template"
         )
+    
+    # Close the shared client once the program is done with it
+    await close_aws_clients()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+"""
+Cold start measurements for the REST app: where import time goes (from
+python -X importtime) and how long a fresh process takes to answer its
+first request. Both run the app in a child process, so the numbers are
+those of a new container rather than of an interpreter that has already
+imported everything.
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parse the stderr of python -X importtime, one entry per imported module in import order."""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        stripped = name.lstrip()
+        entries.append(ImportTime(stripped.strip(), int(self_us), int(cumulative_us),
+                                  (len(name) - len(stripped) - 1) // 2))
+    return entries
+
+
+def _run_child(code: str, env: Optional[dict], extra_args: tuple = ()) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        cwd=SRC_DIR,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup child process failed:\n{result.stderr[-4000:]}")
+    return result
+
+
+def import_times(module: str = "app", env: Optional[dict] = None) -> list[ImportTime]:
+    """Import `module` in a fresh interpreter under -X importtime and return what it imported."""
+    return parse_importtime(_run_child(f"import {module}", env, ("-X", "importtime")).stderr)
+
+
+def import_report(entries: list[ImportTime], top: int = 20) -> dict:
+    """
+    Summarize import_times() output.
+
+    Returns:
+        {"total_ms": cumulative time of the top-level imports,
+         "slowest": [(module, cumulative ms)] for the `top` slowest modules,
+         "packages": [(top-level package, self ms)] for the `top` most expensive packages}
+    """
+    packages = defaultdict(int)
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us
+    slowest = sorted(entries, key=lambda entry: entry.cumulative_us, reverse=True)[:top]
+    return {
+        "total_ms": round(sum(entry.cumulative_us for entry in entries if entry.depth == 0) / 1000, 1),
+        "slowest": [(entry.module, round(entry.cumulative_us / 1000, 1)) for entry in slowest],
+        "packages": [(name, round(us / 1000, 1))
+                     for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]],
+    }
+
+
+# Runs the app's lifespan and one GET straight through ASGI, so no server or
+# HTTP client is imported, then prints the wall clock time of the response
+_FIRST_REQUEST = """
+import asyncio, time
+from {module} import app
+
+async def first_request():
+    scope = {{
+        "type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": {path!r}, "raw_path": {path!r}.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"startup")], "client": ("127.0.0.1", 0),
+        "server": ("startup", 80),
+    }}
+    status = None
+
+    async def receive():
+        return {{"type": "http.request", "body": b"", "more_body": False}}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    async with app.router.lifespan_context(app):
+        await app(scope, receive, send)
+        print(time.time(), status, flush=True)
+
+asyncio.run(first_request())
+"""
+
+
+def time_to_first_request(module: str = "app", path: str = "/openapi.json", env: Optional[dict] = None) -> float:
+    """
+    Seconds from starting a new interpreter to the app's first response to GET `path`,
+    including interpreter start-up, imports and the lifespan's start-up.
+    """
+    start = time.time()
+    result = _run_child(_FIRST_REQUEST.format(module=module, path=path), env)
+    responded_at, status = result.stdout.split()[-2:]
+    if not status.isdigit() or int(status) >= 500:
+        raise RuntimeError(f"GET {path} failed with status {status}:\n{result.stderr[-4000:]}")
+    return float(responded_at) - start
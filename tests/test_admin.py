@@ -0,0 +1,163 @@
+import asyncio
+import marshal
+import pstats
+import time
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import src.adapters.rest.admin_controller as admin_controller
+from src.adapters.rest.responses import USERS, FastJSONResponse
+from src.adapters.rest.timing import RequestTimingMiddleware, TimedRoute
+from src.database.query_metrics import instrument_engine
+from src.database.slow_queries import SlowQueryLog, parameter_shape
+from src.utils.profiling import ProfilerBusy, profile_event_loop
+from src.utils.request_timing import SlowRequestLog
+
+TOKEN = "secret-token"
+
+
+def test_slow_query_log_keeps_the_slowest_above_the_threshold():
+    log = SlowQueryLog(capacity=3, threshold_ms=10)
+    for ms in (5, 50, 20, 80, 30, 10):
+        log.record("writer", f"SELECT {ms}", {"id": ms}, False, ms / 1000)
+
+    entries = log.entries()
+
+    assert [entry.statement for entry in entries] == ["SELECT 80", "SELECT 50", "SELECT 30"]
+    assert entries[0].to_dict()["parameters"] == {"id": "int"}
+    assert "id" not in str(entries[0].to_dict()["statement"])
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"email": "a@example.com", "id": 1}) == {"email": "str", "id": "int"}
+    assert parameter_shape(("a", 2.5)) == ["str", "float"]
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == {"rows": 2, "row": ["int", "str"]}
+    assert parameter_shape(tuple(range(25)))[-1] == "... 5 more"
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_captured_and_explained(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}")
+    log = SlowQueryLog(capacity=10, threshold_ms=0)
+    instrument_engine(engine, "writer", record_metrics=False, slow_queries=log)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)"))
+            await conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": "a@example.com"})
+
+        entry = next(entry for entry in log.entries() if entry.statement.startswith("SELECT"))
+        plan = await log.explain(entry)
+    finally:
+        await engine.dispose()
+
+    assert entry.to_dict()["parameters"] == ["str"]
+    assert plan and "users" in plan[0]
+    assert entry.to_dict()["plan"] == plan
+
+
+def timed_app(engine):
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/work/{item_id}")
+    async def work(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await asyncio.sleep(0.05)
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    app.include_router(router)
+    return app
+
+
+def test_slow_requests_get_a_timing_breakdown(tmp_path, monkeypatch):
+    import src.adapters.rest.timing as timing
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'timing.db'}")
+    instrument_engine(engine, "test", record_metrics=False)
+    slow_log = SlowRequestLog(capacity=10, threshold_ms=20)
+    monkeypatch.setattr(timing, "slow_requests", slow_log)
+
+    with TestClient(timed_app(engine)) as client:
+        assert client.get("/work/7").json() == {"id": 7}
+
+    [entry] = slow_log.entries
+    assert entry["path"] == "/work/{item_id}"
+    assert entry["status"] == 200
+    assert entry["queries"] == 1
+    assert entry["handler_ms"] >= 40
+    assert entry["total_ms"] >= entry["db_ms"] + entry["handler_ms"] + entry["serialization_ms"]
+
+
+class SlowRenderingResponse(FastJSONResponse):
+    def render(self, content) -> bytes:
+        time.sleep(0.05)
+        return super().render(content)
+
+
+def test_fast_json_responses_are_encoded_outside_the_handler(monkeypatch):
+    import src.adapters.rest.timing as timing
+
+    slow_log = SlowRequestLog(capacity=10, threshold_ms=20)
+    monkeypatch.setattr(timing, "slow_requests", slow_log)
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/users")
+    async def users():
+        return SlowRenderingResponse([{"id": 1, "name": "Alice", "email": "alice@example.com"}], USERS)
+
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    app.include_router(router)
+    with TestClient(app) as client:
+        assert client.get("/users").json() == [{"id": 1, "name": "Alice", "email": "alice@example.com"}]
+
+    [entry] = slow_log.entries
+    assert entry["serialization_ms"] >= 40
+    assert entry["handler_ms"] < 40
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    monkeypatch.setattr(admin_controller, "ADMIN_TOKEN", TOKEN)
+    app = FastAPI()
+    app.include_router(admin_controller.router, prefix="/admin")
+    return TestClient(app)
+
+
+def test_admin_endpoints_require_the_token(admin_client):
+    assert admin_client.get("/admin/slow-requests").status_code == 403
+    assert admin_client.get("/admin/slow-requests", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert admin_client.get("/admin/slow-requests", headers={"X-Admin-Token": TOKEN}).status_code == 200
+
+
+def test_profile_downloads_folded_stacks(admin_client):
+    response = admin_client.post("/admin/profile?seconds=0.2&interval_ms=2", headers={"X-Admin-Token": TOKEN})
+
+    assert response.status_code == 200
+    assert "profile.folded" in response.headers["content-disposition"]
+    stack, count = response.text.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_profile_downloads_pstats(admin_client, tmp_path):
+    response = admin_client.post("/admin/profile?seconds=0.1&format=pstats", headers={"X-Admin-Token": TOKEN})
+
+    assert response.status_code == 200
+    path = tmp_path / "profile.pstats"
+    path.write_bytes(response.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+@pytest.mark.asyncio
+async def test_only_one_profile_runs_at_a_time():
+    first = asyncio.ensure_future(profile_event_loop(0.2))
+    await asyncio.sleep(0.01)
+    with pytest.raises(ProfilerBusy):
+        await profile_event_loop(0.1)
+    assert await first
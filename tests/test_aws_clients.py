@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+
+from src.utils.aws_clients import AWSClientRegistry
+
+
+class DummyClient:
+    def __init__(self, service_name, region_name, endpoint_url):
+        self.key = (service_name, region_name, endpoint_url)
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+
+
+class DummySession:
+    def __init__(self):
+        self.created = []
+
+    def client(self, service_name, region_name=None, endpoint_url=None, config=None):
+        client = DummyClient(service_name, region_name, endpoint_url)
+        self.created.append(client)
+        return client
+
+
+@pytest.fixture
+def registry():
+    registry = AWSClientRegistry(max_pool_connections=7)
+    registry._session = DummySession()
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_per_service_region_and_endpoint(registry):
+    first = await registry.get_client("sqs", "ap-southeast-2")
+    again = await registry.get_client("sqs", "ap-southeast-2")
+    other_region = await registry.get_client("sqs", "us-east-1")
+    local = await registry.get_client("sqs", "ap-southeast-2", "http://localhost:9324")
+    sns = await registry.get_client("sns", "ap-southeast-2")
+
+    assert first is again
+    assert len({id(first), id(other_region), id(local), id(sns)}) == 4
+    assert len(registry._session.created) == 4
+    assert registry.config.max_pool_connections == 7
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_use_creates_one_client(registry):
+    clients = await asyncio.gather(*(registry.get_client("sqs", "ap-southeast-2") for _ in range(20)))
+
+    assert all(client is clients[0] for client in clients)
+    assert len(registry._session.created) == 1
+
+
+@pytest.mark.asyncio
+async def test_close_closes_all_clients(registry):
+    sqs = await registry.get_client("sqs", "ap-southeast-2")
+    sns = await registry.get_client("sns", "ap-southeast-2")
+
+    await registry.close()
+
+    assert sqs.closed and sns.closed
+    # A new client is created on next use
+    assert await registry.get_client("sqs", "ap-southeast-2") is not sqs
@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+
+from src.utils.batching import BATCH_CALL_FAILED, BatchEntryFailed, MicroBatcher, chunk_entries, send_in_batches
+from src.utils.sqs_client import SQSClient
+from src.utils.sns_client import SNSClient
+
+
+def body_size(entry):
+    return len(entry["MessageBody"])
+
+
+def make_entries(count, size=1):
+    return [{"Id": str(i), "MessageBody": "x" * size} for i in range(count)]
+
+
+def test_chunk_entries_respects_entry_limit():
+    chunks = chunk_entries(make_entries(25), body_size)
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_chunk_entries_respects_byte_limit():
+    chunks = chunk_entries(make_entries(5, size=100 * 1024), body_size)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_send_in_batches_retries_only_failed_entries():
+    calls = []
+
+    async def send_chunk(chunk):
+        calls.append([entry["Id"] for entry in chunk])
+        if len(calls) == 1:
+            return {
+                "Successful": [{"Id": e["Id"]} for e in chunk if e["Id"] not in ("2", "3")],
+                "Failed": [
+                    {"Id": "2", "Code": "InternalError", "SenderFault": False},
+                    {"Id": "3", "Code": "InvalidMessageContents", "SenderFault": True},
+                ],
+            }
+        return {"Successful": [{"Id": e["Id"]} for e in chunk], "Failed": []}
+
+    result = await send_in_batches(send_chunk, make_entries(5), body_size, retry_backoff=0)
+
+    assert calls == [["0", "1", "2", "3", "4"], ["2"]]
+    assert sorted(e["Id"] for e in result["Successful"]) == ["0", "1", "2", "4"]
+    assert [f["Id"] for f in result["Failed"]] == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_send_in_batches_keeps_other_chunks_when_one_raises():
+    calls = []
+
+    async def send_chunk(chunk):
+        calls.append(len(chunk))
+        if chunk[0]["Id"] == "10":
+            raise ConnectionError("connection reset")
+        return {"Successful": [{"Id": e["Id"]} for e in chunk], "Failed": []}
+
+    result = await send_in_batches(send_chunk, make_entries(25), body_size, max_retries=1, retry_backoff=0)
+
+    # The failed chunk is retried once, then reported entry by entry
+    assert calls == [10, 10, 5, 10]
+    assert sorted(int(e["Id"]) for e in result["Successful"]) == list(range(10)) + list(range(20, 25))
+    assert [f["Id"] for f in result["Failed"]] == [str(i) for i in range(10, 20)]
+    assert {(f["Code"], f["SenderFault"]) for f in result["Failed"]} == {(BATCH_CALL_FAILED, False)}
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_merges_concurrent_submits():
+    batches = []
+
+    async def send_batch(key, entries):
+        batches.append((key, len(entries)))
+        return {
+            "Successful": [{"Id": e["Id"], "MessageId": e["MessageBody"]} for e in entries if e["MessageBody"] != "bad"],
+            "Failed": [{"Id": e["Id"], "Code": "InvalidMessageContents", "SenderFault": True}
+                       for e in entries if e["MessageBody"] == "bad"],
+        }
+
+    batcher = MicroBatcher(send_batch, body_size, linger=0.01)
+    bodies = [f"m{i}" for i in range(13)] + ["bad"]
+    results = await asyncio.gather(
+        *(batcher.submit("queue", {"MessageBody": body}) for body in bodies),
+        return_exceptions=True
+    )
+
+    assert batches == [("queue", 10), ("queue", 4)]
+    assert [r["MessageId"] for r in results[:13]] == bodies[:13]
+    assert isinstance(results[13], BatchEntryFailed)
+
+
+class FakeAWSClient:
+    def __init__(self):
+        self.calls = []
+
+    async def send_message(self, **kwargs):
+        self.calls.append(("send_message", 1))
+        return {"MessageId": "single"}
+
+    async def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append(("send_message_batch", len(Entries)))
+        return {"Successful": [{"Id": e["Id"], "MessageId": f"id-{e['Id']}"} for e in Entries], "Failed": []}
+
+    async def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        self.calls.append(("publish_batch", len(PublishBatchRequestEntries)))
+        return {"Successful": [{"Id": e["Id"], "MessageId": f"id-{e['Id']}"} for e in PublishBatchRequestEntries],
+                "Failed": []}
+
+
+@pytest.fixture
+def fake_aws(monkeypatch):
+    client = FakeAWSClient()
+
+    async def get_client(*args, **kwargs):
+        return client
+
+    monkeypatch.setattr("src.utils.sqs_client.get_aws_client", get_client)
+    monkeypatch.setattr("src.utils.sns_client.get_aws_client", get_client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_sqs_send_message_batch_chunks(fake_aws):
+    client = SQSClient(queue_url="queue", linger_ms=0)
+    result = await client.send_message_batch([{"n": i} for i in range(23)], message_type="template")
+
+    assert fake_aws.calls == [("send_message_batch", 10), ("send_message_batch", 10), ("send_message_batch", 3)]
+    assert len(result["Successful"]) == 23
+
+
+@pytest.mark.asyncio
+async def test_sqs_send_json_message_is_micro_batched(fake_aws):
+    async with SQSClient(queue_url="queue", linger_ms=5) as client:
+        responses = await asyncio.gather(*(client.send_json_message({"n": i}) for i in range(7)))
+
+    assert fake_aws.calls == [("send_message_batch", 7)]
+    assert all(response["MessageId"].startswith("id-") for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_sns_publish_batch_chunks(fake_aws):
+    client = SNSClient(topic_arn="arn:aws:sns:ap-southeast-2:000000000000:topic", linger_ms=0)
+    result = await client.publish_batch([f"text {i}" for i in range(12)], content_type="text/plain")
+
+    assert fake_aws.calls == [("publish_batch", 10), ("publish_batch", 2)]
+    assert len(result["Successful"]) == 12
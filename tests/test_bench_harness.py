@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from benchmarks.harness import compare, load_baseline, run_load, save_baseline, summarize
+
+
+def test_summarize_reports_percentiles_in_milliseconds():
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+
+    result = summarize(latencies, elapsed=2.0)
+
+    assert result["operations"] == 100
+    assert result["rps"] == 50.0
+    assert result["p50_ms"] == pytest.approx(50.5)
+    assert result["p95_ms"] == pytest.approx(95.05)
+    assert result["p99_ms"] == pytest.approx(99.01)
+
+
+@pytest.mark.asyncio
+async def test_run_load_bounds_concurrency_and_counts_errors():
+    in_flight = 0
+    peak = 0
+    warmed = []
+
+    async def operation(i):
+        nonlocal in_flight, peak
+        if i < 0:
+            warmed.append(i)
+            return
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if i % 10 == 0:
+            raise RuntimeError("boom")
+
+    result = await run_load(operation, operations=50, concurrency=4, warmup=2)
+
+    assert warmed == [-1, -2]
+    assert peak == 4
+    assert result["operations"] == 45
+    assert result["errors"] == 5
+
+
+def test_compare_flags_only_regressions_beyond_the_threshold():
+    baseline = {
+        "fast": {"rps": 1000.0, "p50_ms": 1.0, "p95_ms": 2.0},
+        "slow": {"rps": 1000.0, "p50_ms": 1.0, "p95_ms": 2.0},
+    }
+    results = {
+        "fast": {"rps": 900.0, "p50_ms": 1.1, "p95_ms": 1.5},    # within 20%
+        "slow": {"rps": 700.0, "p50_ms": 1.0, "p95_ms": 3.0},    # 30% fewer req/s, 50% slower p95
+        "new": {"rps": 1.0, "p50_ms": 100.0, "p95_ms": 100.0},   # no baseline yet
+    }
+
+    regressions = compare(results, baseline, threshold=0.2)
+
+    assert len(regressions) == 2
+    assert all(regression.startswith("slow:") for regression in regressions)
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    results = {"repo.get_user_by_id": {"rps": 10.0, "p50_ms": 1.0, "p95_ms": 2.0}}
+
+    save_baseline(str(path), results, {"cpus": 1})
+
+    assert load_baseline(str(path)) == results
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import src.cli as cli
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["serve-rest", "--workers", "3", "--port", "8000"], ("serve_rest", (3, None, 8000))),
+    (["serve-rest"], ("serve_rest", (None, None, None))),
+    (["serve-grpc", "--processes", "2"], ("serve_grpc", (2,))),
+    (["consume-sqs", "--processes", "4"], ("consume_sqs", (4,))),
+    (["all"], ("run_all", ())),
+    (["startup-report", "--top", "5"], ("startup_report", (5, "/openapi.json", False))),
+])
+def test_main_dispatches_to_role(monkeypatch, argv, expected):
+    calls = []
+    for name in ("serve_rest", "serve_grpc", "consume_sqs", "run_all", "startup_report"):
+        monkeypatch.setattr(cli, name, lambda *args, name=name: calls.append((name, args)))
+
+    cli.main(argv)
+
+    assert calls == [expected]
+
+
+def test_unknown_role_is_rejected():
+    with pytest.raises(SystemExit):
+        cli.main(["serve-everything"])
+
+
+def _imported_after(statement):
+    """Modules loaded in a fresh interpreter (run from src/) after running `statement`."""
+    code = f"import sys; {statement}; print(','.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    return set(result.stdout.strip().split(","))
+
+
+def test_cli_imports_no_subsystems():
+    modules = _imported_after("import cli")
+    assert not {"fastapi", "grpc", "aioboto3", "sqlalchemy"} & modules
+
+
+def test_consumer_role_skips_rest_and_grpc():
+    modules = _imported_after("import adapters.sqs.poll")
+    assert "fastapi" not in modules
+    assert "adapters.grpc.server.grpc_server" not in modules
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database.pool import (
+    InstrumentedAsyncQueuePool,
+    PoolMetrics,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_TIMEOUTS,
+    export_pool_stats,
+)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    engine.sync_engine.pool.metrics = PoolMetrics("test")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = engine.sync_engine.pool.stats()
+        assert stats["checked_out"] == 1
+        assert stats["size"] == 1
+
+    stats = engine.sync_engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_warns_and_records_wait(engine, caplog):
+    async def hold_connection():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.WARNING, logger="database.pool"):
+        await asyncio.gather(hold_connection(), hold_connection())
+
+    stats = engine.sync_engine.pool.stats()
+    assert stats["exhausted"] >= 1
+    assert stats["wait_time_max_ms"] >= 20
+    assert any("exhausted" in record.message and "coroutines waiting" in record.message
+               for record in caplog.records)
+
+
+async def select_one(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@pytest.mark.asyncio
+async def test_only_checkouts_of_an_exhausted_pool_count_as_waiting(engine):
+    pool = engine.sync_engine.pool
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert pool.stats()["waiting"] == 0
+
+        waiter = asyncio.create_task(select_one(engine))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["waiting"] == 1
+    await waiter
+
+    assert pool.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout_is_counted(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        with pytest.raises(Exception):
+            async with engine.connect() as other:
+                await other.execute(text("SELECT 1"))
+
+    assert engine.sync_engine.pool.stats()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_survive_recreate(engine):
+    pool = engine.sync_engine.pool
+    assert pool.recreate().metrics is pool.metrics
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_are_exported_as_metrics(engine):
+    pool = engine.sync_engine.pool
+    pool.metrics = PoolMetrics("exported", record_metrics=True)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        with pytest.raises(Exception):
+            async with engine.connect() as other:
+                await other.execute(text("SELECT 1"))
+        export_pool_stats({"exported": pool.stats()})
+        assert DB_POOL_CONNECTIONS.labels("exported", "checked_out").value == 1
+        assert DB_POOL_CONNECTIONS.labels("exported", "idle").value == 0
+
+    assert DB_POOL_TIMEOUTS.labels("exported").value == 1
+    wait = DB_POOL_CHECKOUT_WAIT_SECONDS.labels("exported")
+    assert sum(wait.counts) == 2
+    assert wait.sum >= 0.2
+
@@ -0,0 +1,153 @@
+import contextvars
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database.replicas import (
+    ReaderReplica,
+    ReplicaRouter,
+    ReadYourWritesTracker,
+    set_caller_key,
+    reset_caller_key,
+    export_replica_stats,
+    DB_REPLICA_HEALTHY,
+    DB_REPLICA_OUTSTANDING,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def replicas(tmp_path):
+    engines = [create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'replica{i}.db'}") for i in range(3)]
+    yield [ReaderReplica(f"reader-{i}", engine) for i, engine in enumerate(engines)]
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_round_robin_spreads_reads(replicas):
+    router = ReplicaRouter(replicas, strategy="round_robin")
+    chosen = [router.choose().name for _ in range(6)]
+    assert chosen == ["reader-0", "reader-1", "reader-2"] * 2
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_prefers_idle_replica(replicas):
+    router = ReplicaRouter(replicas, strategy="least_outstanding")
+    replicas[0].outstanding = 4
+    replicas[1].outstanding = 1
+    replicas[2].outstanding = 2
+    assert router.choose().name == "reader-1"
+
+
+@pytest.mark.asyncio
+async def test_queries_update_latency_and_outstanding(replicas):
+    router = ReplicaRouter(replicas)
+    async with replicas[0].sessionmaker() as session:
+        await session.execute(text("SELECT 1"))
+
+    assert replicas[0].outstanding == 0
+    assert replicas[0].latency_ewma is not None
+    assert router.stats()["reader-0"]["healthy"]
+
+
+@pytest.mark.asyncio
+async def test_failing_replica_is_ejected_then_readmitted(replicas):
+    clock = FakeClock()
+    router = ReplicaRouter(replicas, eject_after_failures=2, eject_seconds=30, clock=clock)
+
+    router.record_failure(replicas[1])
+    assert replicas[1] in router.available()
+    router.record_failure(replicas[1])
+    assert replicas[1] not in router.available()
+    assert {router.choose().name for _ in range(4)} == {"reader-0", "reader-2"}
+
+    clock.now += 31
+    assert replicas[1] in router.available()
+
+
+@pytest.mark.asyncio
+async def test_all_ejected_fails_open(replicas):
+    router = ReplicaRouter(replicas, eject_after_failures=1, clock=FakeClock())
+    for replica in replicas:
+        router.record_failure(replica)
+    assert router.available() == replicas
+
+
+@pytest.mark.asyncio
+async def test_health_check_ejects_unreachable_replica(tmp_path, replicas):
+    broken = ReaderReplica("broken", create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}"))
+    router = ReplicaRouter([replicas[0], broken])
+
+    await router.check(broken, timeout=1)
+    await router.check(replicas[0], timeout=1)
+
+    assert router.available() == [replicas[0]]
+    await broken.engine.dispose()
+
+
+def test_unknown_strategy_is_rejected(replicas):
+    with pytest.raises(ValueError):
+        ReplicaRouter(replicas, strategy="random")
+
+
+def test_read_your_writes_window_per_caller():
+    clock = FakeClock()
+    tracker = ReadYourWritesTracker(window_ms=500, clock=clock)
+
+    def as_caller(key, action):
+        # Each request runs in its own context, like separate tasks do
+        def run():
+            token = set_caller_key(key)
+            try:
+                return action()
+            finally:
+                reset_caller_key(token)
+        return contextvars.copy_context().run(run)
+
+    assert not as_caller("client-a", tracker.should_use_writer)
+    as_caller("client-a", tracker.record_write)
+
+    clock.now += 0.1
+    assert as_caller("client-a", tracker.should_use_writer)
+    assert not as_caller("client-b", tracker.should_use_writer)
+
+    clock.now += 0.5
+    assert not as_caller("client-a", tracker.should_use_writer)
+
+
+def test_read_your_writes_within_same_context_without_caller_key():
+    clock = FakeClock()
+    tracker = ReadYourWritesTracker(window_ms=500, clock=clock)
+
+    def request():
+        tracker.record_write()
+        return tracker.should_use_writer()
+
+    assert contextvars.copy_context().run(request)
+    assert not contextvars.copy_context().run(tracker.should_use_writer)
+
+
+def test_read_your_writes_disabled_by_default():
+    tracker = ReadYourWritesTracker(window_ms=0)
+    tracker.record_write()
+    assert not tracker.should_use_writer()
+
+
+@pytest.mark.asyncio
+async def test_replica_stats_are_exported_as_metrics(replicas):
+    router = ReplicaRouter(replicas)
+    router.eject(replicas[1], "test")
+    replicas[2].outstanding = 3
+    export_replica_stats(router.stats())
+    assert DB_REPLICA_HEALTHY.labels("reader-0").value == 1
+    assert DB_REPLICA_HEALTHY.labels("reader-1").value == 0
+    assert DB_REPLICA_OUTSTANDING.labels("reader-2").value == 3
@@ -0,0 +1,129 @@
+import asyncio
+
+import grpc
+import pytest
+import pytest_asyncio
+from grpc.experimental import aio as grpc_aio
+
+from src.utils.grpc_channels import GrpcChannelPool, batch, build_service_config
+from src.utils.grpc_stub import GrpcClient
+
+
+class EchoService:
+    """Generic handlers: Echo returns the request, Flaky fails UNAVAILABLE a few times first."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def echo(self, request, context):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if request == b"missing":
+                await context.abort(grpc.StatusCode.NOT_FOUND, "not found")
+            return request
+        finally:
+            self.in_flight -= 1
+
+    async def flaky(self, request, context):
+        self.calls += 1
+        if self.calls <= self.failures:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "try again")
+        return request
+
+    def handler(self):
+        identity = lambda data: data
+        return grpc.method_handlers_generic_handler("test.Echo", {
+            "Echo": grpc.unary_unary_rpc_method_handler(self.echo, identity, identity),
+            "Flaky": grpc.unary_unary_rpc_method_handler(self.flaky, identity, identity),
+        })
+
+
+@pytest_asyncio.fixture
+async def echo_server():
+    service = EchoService(failures=2)
+    server = grpc_aio.server()
+    server.add_generic_rpc_handlers((service.handler(),))
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield service, f"127.0.0.1:{port}"
+    await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_channels_are_pooled_per_target_and_handed_out_round_robin(echo_server):
+    _, target = echo_server
+    pool = GrpcChannelPool(size=2)
+
+    channels = [pool.get_channel(target) for _ in range(4)]
+
+    assert channels[0] is not channels[1]
+    assert channels[0] is channels[2] and channels[1] is channels[3]
+    assert pool.stats() == {target: 2}
+    await pool.close()
+    assert pool.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_unavailable_calls_are_retried_by_the_service_config(echo_server):
+    service, target = echo_server
+    pool = GrpcChannelPool(size=1, service_config=build_service_config(max_attempts=3))
+    try:
+        flaky = pool.get_channel(target).unary_unary("/test.Echo/Flaky")
+        assert await flaky(b"hello", timeout=5) == b"hello"
+        assert service.calls == 3
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_bounds_concurrency_and_keeps_order(echo_server):
+    service, target = echo_server
+    pool = GrpcChannelPool(size=2)
+    try:
+        echo = pool.get_channel(target).unary_unary("/test.Echo/Echo")
+        requests = [str(i).encode() for i in range(20)] + [b"missing"]
+
+        results = await batch(echo, requests, concurrency=4, timeout=5)
+
+        assert results[:20] == requests[:20]
+        assert isinstance(results[20], grpc_aio.AioRpcError)
+        assert results[20].code() == grpc.StatusCode.NOT_FOUND
+        assert service.max_in_flight <= 4
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_with_no_requests():
+    assert await batch(None, []) == []
+
+
+def test_pool_starts_afresh_on_a_new_event_loop():
+    pool = GrpcChannelPool(size=1)
+
+    async def get():
+        return pool.get_channel("127.0.0.1:1")
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+    assert first is not second
+
+
+def test_client_takes_its_channel_on_first_use():
+    # Built outside any event loop, which the channel pool needs
+    client = GrpcClient("127.0.0.1", 1)
+    assert client._channel is None
+
+    async def use():
+        async with client:
+            stub = client.user
+            assert client._channel is not None
+            assert client.user is stub
+        assert client._channel is None and client._user is None
+
+    asyncio.run(use())
@@ -0,0 +1,80 @@
+import asyncio
+
+import grpc
+import pytest
+from grpc.experimental import aio as grpc_aio
+
+from src.adapters.grpc.server.grpc_server import create_grpc_server, grpc_server_options
+from adapters.grpc.proto.greeting import greeter_pb2, greeter_pb2_grpc
+
+SLOW_METHOD = "/test.Slow/Wait"
+
+
+def slow_handler(release: asyncio.Event):
+    async def wait(request, context):
+        await release.wait()
+        return request
+
+    identity = lambda data: data
+    return grpc.method_handlers_generic_handler("test.Slow", {
+        "Wait": grpc.unary_unary_rpc_method_handler(wait, request_deserializer=identity, response_serializer=identity),
+    })
+
+
+async def start_server(**kwargs):
+    server = create_grpc_server(**kwargs)
+    release = asyncio.Event()
+    server.add_generic_rpc_handlers((slow_handler(release),))
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port, release
+
+
+@pytest.mark.asyncio
+async def test_rpcs_over_the_limit_are_rejected_with_resource_exhausted():
+    server, port, release = await start_server(maximum_concurrent_rpcs=1)
+    try:
+        async with grpc_aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            wait = channel.unary_unary(SLOW_METHOD)
+            first = asyncio.ensure_future(wait(b"first"))
+            await asyncio.sleep(0.2)
+
+            with pytest.raises(grpc_aio.AioRpcError) as exc_info:
+                await wait(b"second", timeout=5)
+            assert exc_info.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+            release.set()
+            assert await first == b"first"
+            # Capacity is back once the first RPC finished
+            assert await wait(b"third", timeout=5) == b"third"
+    finally:
+        await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_servicers_are_registered_and_interceptors_run():
+    calls = []
+
+    class RecordingInterceptor(grpc_aio.ServerInterceptor):
+        async def intercept_service(self, continuation, handler_call_details):
+            calls.append(handler_call_details.method)
+            return await continuation(handler_call_details)
+
+    server, port, _ = await start_server(interceptors=[RecordingInterceptor()], compression="gzip")
+    try:
+        async with grpc_aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            reply = await greeter_pb2_grpc.GreeterStub(channel).SayHello(greeter_pb2.HelloRequest(name="grpc"), timeout=5)
+        assert reply.message == "Hello, grpc!"
+        assert calls == ["/greeter.Greeter/SayHello"]
+    finally:
+        await server.stop(None)
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        create_grpc_server(compression="brotli")
+
+
+def test_server_options_reflect_reuse_port():
+    assert ("grpc.so_reuseport", 1) in grpc_server_options(reuse_port=True)
+    assert ("grpc.so_reuseport", 0) in grpc_server_options(reuse_port=False)
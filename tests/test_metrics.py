@@ -0,0 +1,182 @@
+import asyncio
+import time
+
+import grpc
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from grpc.experimental import aio as grpc_aio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.adapters.rest.metrics import MetricsMiddleware, HTTP_REQUESTS, HTTP_REQUEST_SECONDS, router as metrics_router
+from src.adapters.grpc.server.metrics_interceptor import MetricsInterceptor, GRPC_HANDLED, GRPC_HANDLING_SECONDS
+from src.database.query_metrics import DB_QUERY_SECONDS, DB_QUERY_ERRORS, instrument_engine, statement_operation
+from src.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    for metric in (HTTP_REQUESTS, HTTP_REQUEST_SECONDS, GRPC_HANDLED, GRPC_HANDLING_SECONDS,
+                   DB_QUERY_SECONDS, DB_QUERY_ERRORS):
+        metric.clear()
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests", "Requests served", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("in_flight", "In flight")
+
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+    in_flight.set(4)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE requests counter" in lines
+    assert 'requests_total{route="/a\\"b"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 3.65" in lines
+    assert "latency_seconds_count 4" in lines
+    assert "in_flight 4" in lines
+
+
+def test_registering_twice_returns_the_same_family_and_rejects_conflicts():
+    registry = MetricsRegistry()
+    first = registry.counter("events", "Events", ("kind",))
+
+    assert registry.counter("events", "Events", ("kind",)) is first
+    with pytest.raises(ValueError):
+        registry.histogram("events", "Events", ("kind",))
+    with pytest.raises(ValueError):
+        first.labels("a", "b")
+
+
+def test_clear_keeps_cached_children_live():
+    registry = MetricsRegistry()
+    child = registry.counter("events", "Events", ("kind",)).labels("a")
+    child.inc()
+
+    registry.clear()
+    child.inc()
+
+    assert "events_total{kind=\"a\"} 1" in registry.render()
+
+
+def test_collectors_run_before_each_render():
+    registry = MetricsRegistry()
+    size = registry.gauge("queue_size", "Items queued")
+    queue = []
+    registry.add_collector(lambda: size.set(len(queue)))
+
+    queue.extend([1, 2])
+    assert "queue_size 2" in registry.render()
+    queue.clear()
+    assert "queue_size 0" in registry.render()
+
+
+def test_observation_is_cheap():
+    histogram = MetricsRegistry().histogram("cost_seconds", "Cost", ("kind",)).labels("a")
+    observations = 100_000
+
+    start = time.perf_counter()
+    for _ in range(observations):
+        histogram.observe(0.003)
+    per_observation = (time.perf_counter() - start) / observations
+
+    # Generous bound so the test isn't flaky on a busy machine; typically a few hundred ns
+    assert per_observation < 5e-6
+
+
+def test_http_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/users/{user_id}")
+    async def get_user(user_id: int):
+        if user_id == 404:
+            raise HTTPException(status_code=404)
+        return {"id": user_id}
+
+    client = TestClient(app)
+    client.get("/users/1")
+    client.get("/users/2")
+    client.get("/users/404")
+    client.get("/nowhere")
+
+    assert HTTP_REQUESTS.labels("GET", "/users/{user_id}", 200).value == 2
+    assert HTTP_REQUESTS.labels("GET", "/users/{user_id}", 404).value == 1
+    assert HTTP_REQUESTS.labels("GET", "unmatched", 404).value == 1
+    assert sum(HTTP_REQUEST_SECONDS.labels("GET", "/users/{user_id}").counts) == 3
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/users/{user_id}",status="200"} 2' in response.text
+
+
+@pytest.mark.asyncio
+async def test_grpc_interceptor_records_status_and_latency():
+    async def echo(request, context):
+        if request == b"bad":
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad request")
+        return request
+
+    async def count(request, context):
+        for i in range(3):
+            yield bytes([i])
+
+    identity = lambda data: data
+    handler = grpc.method_handlers_generic_handler("test.Metrics", {
+        "Echo": grpc.unary_unary_rpc_method_handler(echo, identity, identity),
+        "Count": grpc.unary_stream_rpc_method_handler(count, identity, identity),
+    })
+    server = grpc_aio.server(interceptors=[MetricsInterceptor()])
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc_aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            echo_call = channel.unary_unary("/test.Metrics/Echo")
+            assert await echo_call(b"ok") == b"ok"
+            assert await echo_call(b"ok") == b"ok"
+            with pytest.raises(grpc_aio.AioRpcError):
+                await echo_call(b"bad")
+            responses = [response async for response in channel.unary_stream("/test.Metrics/Count")(b"")]
+            assert len(responses) == 3
+        await asyncio.sleep(0.05)
+    finally:
+        await server.stop(None)
+
+    assert GRPC_HANDLED.labels("/test.Metrics/Echo", "OK").value == 2
+    assert GRPC_HANDLED.labels("/test.Metrics/Echo", "INVALID_ARGUMENT").value == 1
+    assert GRPC_HANDLED.labels("/test.Metrics/Count", "OK").value == 1
+    assert sum(GRPC_HANDLING_SECONDS.labels("/test.Metrics/Echo").counts) == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_events_time_queries_and_count_errors(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine, "test")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("  select 2"))
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+    finally:
+        await engine.dispose()
+
+    assert sum(DB_QUERY_SECONDS.labels("test", "SELECT").counts) == 2
+    assert DB_QUERY_ERRORS.labels("test").value == 1
+
+
+def test_statement_operation():
+    assert statement_operation("SELECT users.id FROM users") == "SELECT"
+    assert statement_operation("\n  insert into users values (1)") == "INSERT"
+    assert statement_operation("PRAGMA table_info(users)") == "OTHER"
@@ -0,0 +1,98 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from src.adapters.rest.post_controller import router
+
+
+app = FastAPI()
+app.include_router(router, prefix="/posts")
+
+
+class DummyPost:
+    def __init__(self, id, user_id, title, content="..."):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.content = content
+
+
+class DummyUser:
+    def __init__(self, id, name, email, posts):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.posts = posts
+
+
+POSTS = [DummyPost(1, 1, "First"), DummyPost(2, 1, "Second"), DummyPost(3, 2, "Hello")]
+
+async def dummy_get_post_by_id(post_id):
+    return next((post for post in POSTS if post.id == post_id), None)
+
+async def dummy_list_user_posts(user_id, limit=None, after=None):
+    posts = [post for post in POSTS if post.user_id == user_id and (after is None or post.id > after)]
+    return posts[:limit]
+
+async def dummy_get_users_with_posts(user_ids):
+    users = {
+        1: DummyUser(1, "Alice", "alice@example.com", POSTS[:2]),
+        2: DummyUser(2, "Bob", "bob@example.com", POSTS[2:]),
+    }
+    return [users[user_id] for user_id in sorted(set(user_ids)) if user_id in users]
+
+async def dummy_create_post(user_id, title, content):
+    return DummyPost(4, user_id, title, content) if user_id in (1, 2) else None
+
+
+@pytest.fixture(autouse=True)
+def patch_service_functions(monkeypatch):
+    monkeypatch.setattr("src.adapters.rest.post_controller.get_post_by_id", dummy_get_post_by_id)
+    monkeypatch.setattr("src.adapters.rest.post_controller.list_user_posts", dummy_list_user_posts)
+    monkeypatch.setattr("src.adapters.rest.post_controller.get_users_with_posts", dummy_get_users_with_posts)
+    monkeypatch.setattr("src.adapters.rest.post_controller.service_create_post", dummy_create_post)
+
+
+client = TestClient(app)
+
+
+def test_get_post():
+    assert client.get("/posts/3").json() == {"id": 3, "user_id": 2, "title": "Hello", "content": "..."}
+    assert client.get("/posts/99").status_code == 404
+
+
+def test_list_user_posts_paginated():
+    response = client.get("/posts/by-user/1", params={"limit": 1})
+    assert [post["id"] for post in response.json()] == [1]
+    assert response.headers["X-Next-Cursor"] == "1"
+
+    response = client.get("/posts/by-user/1", params={"limit": 1, "after": 1})
+    assert [post["id"] for post in response.json()] == [2]
+
+    response = client.get("/posts/by-user/1", params={"limit": 1, "after": 2})
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_users_with_posts():
+    response = client.get("/posts/by-users", params={"user_ids": [2, 1, 99]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["id"] for user in data] == [1, 2]
+    assert [post["title"] for post in data[0]["posts"]] == ["First", "Second"]
+    assert data[1]["posts"] == [{"id": 3, "user_id": 2, "title": "Hello", "content": "..."}]
+
+
+def test_get_users_with_posts_limits_ids(monkeypatch):
+    monkeypatch.setattr("src.adapters.rest.post_controller.POSTS_BY_USERS_MAX_IDS", 1)
+    assert client.get("/posts/by-users", params={"user_ids": [1, 2]}).status_code == 413
+    assert client.get("/posts/by-users").status_code == 422
+
+
+def test_create_post():
+    response = client.post("/posts/", json={"user_id": 1, "title": "New", "content": "Body"})
+    assert response.status_code == 201
+    assert response.json() == {"id": 4, "user_id": 1, "title": "New", "content": "Body"}
+
+    response = client.post("/posts/", json={"user_id": 99, "title": "New", "content": "Body"})
+    assert response.status_code == 404
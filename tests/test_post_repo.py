@@ -0,0 +1,111 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import src.data_access.post_repo as post_repo_module
+from src.data_access.post_repo import PostRepository
+from src.models import Base, Post, User
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'posts.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def sessionmaker(engine):
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def user_ids(sessionmaker):
+    """Five users with 0..4 posts each."""
+    async with sessionmaker() as db:
+        users = [User(name=f"User {i}", email=f"user{i}@example.com") for i in range(5)]
+        db.add_all(users)
+        await db.flush()
+        db.add_all(
+            Post(user_id=user.id, title=f"Post {n} by {user.id}", content="...")
+            for n in range(5) for user in users[n + 1:]
+        )
+        await db.commit()
+        return [user.id for user in users]
+
+
+@pytest.fixture
+def statements(engine):
+    """Every statement sent to the database, i.e. one entry per round trip."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return executed
+
+
+@pytest.fixture
+def repo(sessionmaker, monkeypatch):
+    async def get_async_session(read_only=True):
+        return sessionmaker()
+
+    monkeypatch.setattr(post_repo_module, "get_async_session", get_async_session)
+    return PostRepository()
+
+
+@pytest.mark.asyncio
+async def test_users_with_posts_load_in_two_queries(repo, user_ids, statements):
+    users = await repo.get_users_with_posts(user_ids + [999])
+
+    assert len(statements) == 2
+    assert [user.id for user in users] == user_ids
+    assert [len(user.posts) for user in users] == [0, 1, 2, 3, 4]
+    assert all(post.user_id == user.id for user in users for post in user.posts)
+    assert [post.id for post in users[4].posts] == sorted(post.id for post in users[4].posts)
+
+
+@pytest.mark.asyncio
+async def test_posts_are_never_lazy_loaded(repo, user_ids, sessionmaker):
+    async with sessionmaker() as db:
+        user = await db.get(User, user_ids[1])
+        with pytest.raises(InvalidRequestError):
+            user.posts
+
+
+@pytest.mark.asyncio
+async def test_list_user_posts_pages_by_id(repo, user_ids):
+    first = await repo.list_user_posts(user_ids[4], limit=3)
+    rest = await repo.list_user_posts(user_ids[4], limit=3, after=first[-1].id)
+
+    assert [post.title for post in first + rest] == [f"Post {n} by {user_ids[4]}" for n in range(4)]
+    assert len(rest) == 1
+    assert await repo.list_user_posts(user_ids[0]) == []
+
+
+@pytest.mark.asyncio
+async def test_list_user_posts_uses_the_user_id_index(repo, user_ids, engine):
+    async with engine.connect() as conn:
+        plan = await conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM posts WHERE user_id = ? AND id > ? ORDER BY id LIMIT 20", (1, 0)
+        )
+        details = " ".join(row[-1] for row in plan)
+
+    assert "ix_posts_user_id_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.asyncio
+async def test_create_post_for_a_missing_user_returns_none(repo, engine):
+    # SQLite only enforces foreign keys when asked to; PostgreSQL always does
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    await engine.dispose()
+    assert await repo.create_post(999, "Title", "Content") is None
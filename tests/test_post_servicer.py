@@ -0,0 +1,135 @@
+import grpc
+import pytest
+
+from adapters.grpc.proto.post import post_pb2
+from src.adapters.grpc.proto.post.servicer import PostServicer
+
+
+class Aborted(Exception):
+    pass
+
+
+class FakeContext:
+    """The part of grpc.aio.ServicerContext the servicer uses; abort raises like the real one."""
+
+    def __init__(self):
+        self.code = None
+        self.details = None
+
+    async def abort(self, code, details=""):
+        self.code = code
+        self.details = details
+        raise Aborted(details)
+
+
+class DummyPost:
+    def __init__(self, id, user_id, title, content="..."):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.content = content
+
+
+class DummyUser:
+    def __init__(self, id, name, email, posts):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.posts = posts
+
+
+POSTS = [DummyPost(1, 1, "First"), DummyPost(2, 1, "Second"), DummyPost(3, 2, "Hello")]
+
+
+class FakePostService:
+    def __init__(self):
+        self.calls = []
+
+    async def create_post(self, user_id, title, content):
+        return DummyPost(4, user_id, title, content) if user_id in (1, 2) else None
+
+    async def get_post_by_id(self, post_id):
+        return next((post for post in POSTS if post.id == post_id), None)
+
+    async def list_user_posts(self, user_id, limit=None, after=None):
+        self.calls.append(("list_user_posts", user_id, limit, after))
+        posts = [post for post in POSTS if post.user_id == user_id and (after is None or post.id > after)]
+        return posts[:limit]
+
+    async def get_users_with_posts(self, user_ids):
+        self.calls.append(("get_users_with_posts", user_ids))
+        users = {1: DummyUser(1, "Alice", "alice@example.com", POSTS[:2])}
+        return [users[user_id] for user_id in user_ids if user_id in users]
+
+
+@pytest.fixture
+def servicer():
+    servicer = PostServicer()
+    servicer.post_service = FakePostService()
+    return servicer
+
+
+@pytest.mark.asyncio
+async def test_create_post(servicer):
+    post = await servicer.CreatePost(post_pb2.CreatePostRequest(user_id=1, title="New", content="Body"), FakeContext())
+    assert (post.id, post.user_id, post.title, post.content) == (4, 1, "New", "Body")
+
+
+@pytest.mark.asyncio
+async def test_create_post_for_a_missing_user_is_not_found(servicer):
+    context = FakeContext()
+    with pytest.raises(Aborted):
+        await servicer.CreatePost(post_pb2.CreatePostRequest(user_id=99, title="New", content="Body"), context)
+    assert context.code == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_post(servicer):
+    post = await servicer.GetPost(post_pb2.GetPostRequest(id=3), FakeContext())
+    assert (post.id, post.user_id, post.title) == (3, 2, "Hello")
+
+    context = FakeContext()
+    with pytest.raises(Aborted):
+        await servicer.GetPost(post_pb2.GetPostRequest(id=99), context)
+    assert context.code == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_list_user_posts_pages_with_next_after(servicer):
+    page = await servicer.ListUserPosts(post_pb2.ListUserPostsRequest(user_id=1, limit=1), FakeContext())
+    assert [post.id for post in page.posts] == [1]
+    assert page.next_after == 1
+
+    page = await servicer.ListUserPosts(post_pb2.ListUserPostsRequest(user_id=1, limit=1, after=2), FakeContext())
+    assert list(page.posts) == []
+    assert page.next_after == 0
+
+
+@pytest.mark.asyncio
+async def test_list_user_posts_applies_the_default_and_max_page_size(servicer, monkeypatch):
+    monkeypatch.setattr("src.adapters.grpc.proto.post.servicer.POSTS_PAGE_MAX_LIMIT", 2)
+    await servicer.ListUserPosts(post_pb2.ListUserPostsRequest(user_id=1), FakeContext())
+    await servicer.ListUserPosts(post_pb2.ListUserPostsRequest(user_id=1, limit=50), FakeContext())
+
+    assert [call[2] for call in servicer.post_service.calls] == [2, 2]
+    assert servicer.post_service.calls[0][3] is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_posts_reports_missing_ids(servicer):
+    response = await servicer.GetUsersWithPosts(post_pb2.GetUsersWithPostsRequest(user_ids=[1, 7, 1]), FakeContext())
+
+    assert servicer.post_service.calls == [("get_users_with_posts", [1, 7])]
+    [user] = response.users
+    assert (user.id, user.name, user.email) == (1, "Alice", "alice@example.com")
+    assert [post.title for post in user.posts] == ["First", "Second"]
+    assert list(response.missing_ids) == [7]
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_posts_limits_ids(servicer, monkeypatch):
+    monkeypatch.setattr("src.adapters.grpc.proto.post.servicer.POSTS_BY_USERS_MAX_IDS", 1)
+    context = FakeContext()
+    with pytest.raises(Aborted):
+        await servicer.GetUsersWithPosts(post_pb2.GetUsersWithPostsRequest(user_ids=[1, 2]), context)
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
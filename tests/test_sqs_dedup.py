@@ -0,0 +1,178 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import src.adapters.sqs.router as router
+import src.data_access.processed_message_repo as repo_module
+from src.adapters.sqs.dedup import CLAIMED, DUPLICATE, IN_PROGRESS, MessageDeduplicator
+from src.adapters.sqs.registry import HandlerSpec
+from src.data_access.processed_message_repo import ProcessedMessageRepository, ProcessedMessage
+from src.utils.cache import LRUTTLCache
+
+
+def message(message_id, idempotency_key=None):
+    attributes = {"Message-Type": {"DataType": "String", "StringValue": "template"}}
+    if idempotency_key:
+        attributes["Idempotency-Key"] = {"DataType": "String", "StringValue": idempotency_key}
+    return {"MessageId": message_id, "ReceiptHandle": f"r-{message_id}", "Body": "hi", "MessageAttributes": attributes}
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    dedup = MessageDeduplicator(LRUTTLCache(maxsize=100, ttl=60))
+    monkeypatch.setattr(router, "message_dedup", dedup)
+    return dedup
+
+
+@pytest.fixture
+def handled(monkeypatch):
+    calls = []
+
+    async def handler(envelope):
+        calls.append(envelope.message_id)
+        if envelope.content == "fail":
+            raise RuntimeError("boom")
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_redelivered_message_is_skipped_and_deleted(dedup, handled):
+    assert await router.route_message(message("m1")) is True
+    assert await router.route_message(message("m1")) is True
+
+    assert handled == ["m1"]
+    assert dedup.stats()["duplicates_skipped"] == 1
+    assert router.route_table["template"].stats()["duplicates_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_dedups_across_message_ids(dedup, handled):
+    await router.route_message(message("m1", idempotency_key="order-7"))
+    await router.route_message(message("m2", idempotency_key="order-7"))
+    await router.route_message(message("m3"))
+
+    assert handled == ["m1", "m3"]
+
+
+@pytest.mark.asyncio
+async def test_failed_messages_are_retried(dedup, handled):
+    failing = message("m1")
+    failing["Body"] = "fail"
+
+    assert await router.route_message(failing) is False
+    assert await router.route_message(failing) is False
+    assert handled == ["m1", "m1"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_delivery_is_left_alone(dedup, monkeypatch):
+    release = asyncio.Event()
+
+    async def handler(envelope):
+        await release.wait()
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler))
+    first = asyncio.create_task(router.route_message(message("m1")))
+    await asyncio.sleep(0)
+
+    assert await router.route_message(message("m1")) is None
+    release.set()
+    assert await first is True
+    assert dedup.stats()["in_progress_duplicates"] == 1
+
+
+@pytest.mark.asyncio
+async def test_types_can_opt_out(dedup, monkeypatch):
+    calls = []
+
+    async def handler(envelope):
+        calls.append(envelope.message_id)
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler, dedup=False))
+    await router.route_message(message("m1"))
+    await router.route_message(message("m1"))
+    assert calls == ["m1", "m1"]
+
+
+@pytest_asyncio.fixture
+async def repository(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dedup.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(ProcessedMessage.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_async_session(read_only=True):
+        return sessionmaker()
+
+    monkeypatch.setattr(repo_module, "get_async_session", get_async_session)
+    yield ProcessedMessageRepository()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_database_table_is_shared_between_processes(repository):
+    # Two deduplicators stand in for two consumer processes sharing the table
+    first = MessageDeduplicator(LRUTTLCache(maxsize=100, ttl=60), repository=repository)
+    second = MessageDeduplicator(LRUTTLCache(maxsize=100, ttl=60), repository=repository)
+
+    assert await first.claim("m1") == CLAIMED
+    assert await first.claim("m1") == IN_PROGRESS
+    await first.complete("m1", "template")
+
+    assert await second.claim("m1") == DUPLICATE
+    assert second.stats()["db_hits"] == 1
+    assert await second.claim("m2") == CLAIMED
+
+
+@pytest.mark.asyncio
+async def test_expired_rows_are_ignored_and_purged(repository):
+    await repository.mark_processed("old", "template", ttl=-1)
+    await repository.mark_processed("new", "template", ttl=60)
+
+    assert not await repository.is_processed("old")
+    assert await repository.is_processed("new")
+    assert await repository.purge_expired() == 1
+
+
+class CountingRepository:
+    def __init__(self):
+        self.purges = 0
+
+    async def is_processed(self, key):
+        return False
+
+    async def mark_processed(self, key, message_type, ttl):
+        pass
+
+    async def purge_expired(self):
+        self.purges += 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_purge_runs_every_n_completions():
+    repository = CountingRepository()
+    dedup = MessageDeduplicator(LRUTTLCache(maxsize=100, ttl=60), repository=repository, purge_every=3)
+
+    for i in range(7):
+        assert await dedup.claim(f"m{i}") == CLAIMED
+        if i % 2:
+            # Failed attempts don't count towards the purge
+            dedup.release(f"m{i}")
+            assert await dedup.claim(f"m{i}") == CLAIMED
+        await dedup.complete(f"m{i}", "template")
+
+    assert dedup.stats()["completed"] == 7
+    assert repository.purges == 2
+
+
+def test_processed_messages_table_only_created_with_db_dedup(monkeypatch):
+    import src.database.db as db
+
+    monkeypatch.setattr(db, "SQS_DEDUP_DB_ENABLED", False)
+    assert "processed_messages" not in [table.name for table in db._tables_to_create()]
+    monkeypatch.setattr(db, "SQS_DEDUP_DB_ENABLED", True)
+    assert "processed_messages" in [table.name for table in db._tables_to_create()]
@@ -0,0 +1,341 @@
+import asyncio
+import threading
+import pytest
+
+import src.adapters.sqs.poll as poll
+import src.adapters.sqs.router as router
+from src.adapters.sqs.executors import shutdown_handler_executors
+from src.adapters.sqs.poll import SQSConsumer
+from src.adapters.sqs.registry import HandlerSpec
+
+
+def make_message(i, message_type=None):
+    message = {"MessageId": f"m{i}", "ReceiptHandle": f"r{i}", "Body": "{}"}
+    if message_type:
+        message["MessageAttributes"] = {"Message-Type": {"DataType": "String", "StringValue": message_type}}
+    return message
+
+
+class FakeQueue:
+    """Stands in for SQS: hands out queued messages and records deletions."""
+
+    def __init__(self, count):
+        self.messages = [make_message(i) for i in range(count)]
+        self.received = 0
+        self.deleted = []
+        self.delete_calls = []
+        self.visibility_changes = []
+
+    async def receive_message(self, queue_url, max_messages=10, visibility_timeout=20):
+        if not self.messages:
+            await asyncio.sleep(0.01)  # long poll on an empty queue
+            return []
+        batch, self.messages = self.messages[:max_messages], self.messages[max_messages:]
+        self.received += len(batch)
+        return batch
+
+    async def delete_message_batch(self, queue_url, entries):
+        # Receipt handles mirror message ids: r<i> belongs to m<i>
+        self.delete_calls.append(len(entries))
+        self.deleted.extend("m" + entry["ReceiptHandle"][1:] for entry in entries)
+        return {"Successful": [{"Id": entry["Id"]} for entry in entries]}
+
+    async def change_visibility(self, queue_url, entries):
+        self.visibility_changes.extend((entry["Id"], entry["VisibilityTimeout"]) for entry in entries)
+
+
+@pytest.fixture(autouse=True)
+def clear_dedup():
+    # Tests reuse message ids, which would otherwise be skipped as redeliveries
+    poll.message_dedup.clear()
+
+
+@pytest.fixture
+def fake_queue(monkeypatch):
+    queue = FakeQueue(45)
+    monkeypatch.setattr(poll, "receive_message", queue.receive_message)
+    monkeypatch.setattr(poll, "delete_message_batch", queue.delete_message_batch)
+    monkeypatch.setattr(poll, "change_visibility", queue.change_visibility)
+    return queue
+
+
+async def run_until(consumer, condition, timeout=2.0):
+    task = asyncio.create_task(consumer.run())
+    try:
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.005)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_consumer_processes_and_deletes_all_messages(monkeypatch, fake_queue):
+    running = 0
+    peak = 0
+
+    async def fake_route(envelope, delete_unknown_types=True, on_overrun=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        return True
+
+    monkeypatch.setattr(poll, "route_envelope", fake_route)
+    consumer = SQSConsumer(queue_url="q", receivers=3, worker_concurrency=4, max_in_flight=12)
+
+    await run_until(consumer, lambda: len(fake_queue.deleted) == 45)
+
+    assert sorted(fake_queue.deleted) == sorted(f"m{i}" for i in range(45))
+    assert peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_consumer_stops_receiving_at_in_flight_ceiling(monkeypatch, fake_queue):
+    release = asyncio.Event()
+
+    async def blocked_route(envelope, delete_unknown_types=True, on_overrun=None):
+        await release.wait()
+        return True
+
+    monkeypatch.setattr(poll, "route_envelope", blocked_route)
+    consumer = SQSConsumer(queue_url="q", receivers=2, worker_concurrency=50, max_in_flight=15)
+
+    task = asyncio.create_task(consumer.run())
+    await asyncio.sleep(0.1)
+    # Handlers are stuck, so receivers must have paused at the ceiling
+    assert fake_queue.received == 15
+    assert consumer.in_flight == 15
+
+    release.set()
+    async with asyncio.timeout(2.0):
+        while len(fake_queue.deleted) < 45:
+            await asyncio.sleep(0.005)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_consumer_keeps_failed_messages(monkeypatch, fake_queue):
+    async def flaky_route(envelope, delete_unknown_types=True, on_overrun=None):
+        if envelope.message_id == "m3":
+            raise RuntimeError("boom")
+        return envelope.message_id != "m4"
+
+    monkeypatch.setattr(poll, "route_envelope", flaky_route)
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=5, max_in_flight=10)
+
+    await run_until(consumer, lambda: len(fake_queue.deleted) == 43)
+
+    assert "m3" not in fake_queue.deleted
+    assert "m4" not in fake_queue.deleted
+
+
+@pytest.mark.asyncio
+async def test_slow_type_cannot_take_every_worker(monkeypatch, fake_queue):
+    release = asyncio.Event()
+    slow_running = 0
+    slow_peak = 0
+
+    async def slow(envelope):
+        nonlocal slow_running, slow_peak
+        slow_running += 1
+        slow_peak = max(slow_peak, slow_running)
+        await release.wait()
+        slow_running -= 1
+
+    async def fast(envelope):
+        pass
+
+    monkeypatch.setitem(poll.route_table, "slow", HandlerSpec("slow", slow, max_concurrency=1))
+    monkeypatch.setitem(poll.route_table, "fast", HandlerSpec("fast", fast))
+    fake_queue.messages = [make_message(i, "slow") for i in range(10)] + \
+        [make_message(i, "fast") for i in range(10, 20)]
+    consumer = SQSConsumer(queue_url="q", receivers=2, worker_concurrency=3, max_in_flight=20)
+
+    task = asyncio.create_task(consumer.run())
+    async with asyncio.timeout(2.0):
+        while len(fake_queue.deleted) < 10:
+            await asyncio.sleep(0.005)
+    assert set(fake_queue.deleted) == {f"m{i}" for i in range(10, 20)}
+    assert consumer.stats()["waiting"]["slow"] == 9
+
+    release.set()
+    async with asyncio.timeout(2.0):
+        while len(fake_queue.deleted) < 20:
+            await asyncio.sleep(0.005)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert slow_peak == 1
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_types_are_dispatched_first(monkeypatch, fake_queue):
+    order = []
+
+    async def record(envelope):
+        order.append(envelope.message_type)
+
+    monkeypatch.setitem(poll.route_table, "low", HandlerSpec("low", record))
+    monkeypatch.setitem(poll.route_table, "high", HandlerSpec("high", record, priority=10))
+    fake_queue.messages = [make_message(i, "low") for i in range(5)] + \
+        [make_message(i, "high") for i in range(5, 10)]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=1, max_in_flight=10)
+
+    await run_until(consumer, lambda: len(order) == 10)
+
+    assert order == ["high"] * 5 + ["low"] * 5
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_extends_long_running_messages(monkeypatch, fake_queue):
+    async def slow(envelope):
+        await asyncio.sleep(0.3)
+
+    async def unextended(envelope):
+        await asyncio.sleep(0.3)
+
+    monkeypatch.setitem(poll.route_table, "slow", HandlerSpec("slow", slow, visibility_timeout=60))
+    monkeypatch.setitem(poll.route_table, "batch", HandlerSpec("batch", unextended, heartbeat=False))
+    fake_queue.messages = [make_message(0, "slow"), make_message(1, "batch")]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=2, max_in_flight=2,
+                           visibility_timeout=0.1, heartbeat_interval=0.05)
+
+    await run_until(consumer, lambda: len(fake_queue.deleted) == 2)
+
+    assert fake_queue.visibility_changes == [("m0", 60)]
+    assert consumer.stats()["visibility_extended"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_messages_are_released_immediately(monkeypatch, fake_queue):
+    async def failing(envelope):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(poll.route_table, "failing", HandlerSpec("failing", failing))
+    fake_queue.messages = [make_message(0, "failing"), make_message(1, "unknown")]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=2, max_in_flight=2,
+                           delete_unknown_types=False, heartbeat_interval=0)
+
+    await run_until(consumer, lambda: consumer.stats()["released_on_failure"] == 1)
+
+    # Unknown types are kept, but only failed handlers go straight back to the queue
+    assert fake_queue.visibility_changes == [("m0", 0)]
+    assert fake_queue.deleted == []
+
+
+@pytest.mark.asyncio
+async def test_slow_message_does_not_hold_back_acks(monkeypatch, fake_queue):
+    release = asyncio.Event()
+
+    async def route(envelope, delete_unknown_types=True, on_overrun=None):
+        if envelope.message_id == "m0":
+            await release.wait()
+        return True
+
+    monkeypatch.setattr(poll, "route_envelope", route)
+    fake_queue.messages = [make_message(i) for i in range(10)]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=10, max_in_flight=10,
+                           delete_linger_ms=5)
+
+    task = asyncio.create_task(consumer.run())
+    async with asyncio.timeout(2.0):
+        while len(fake_queue.deleted) < 9:
+            await asyncio.sleep(0.005)
+    assert "m0" not in fake_queue.deleted
+
+    release.set()
+    async with asyncio.timeout(2.0):
+        while len(fake_queue.deleted) < 10:
+            await asyncio.sleep(0.005)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_deletes_are_batched(monkeypatch, fake_queue):
+    async def route(envelope, delete_unknown_types=True, on_overrun=None):
+        return True
+
+    monkeypatch.setattr(poll, "route_envelope", route)
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=10, max_in_flight=20,
+                           delete_linger_ms=20)
+
+    await run_until(consumer, lambda: len(fake_queue.deleted) == 45)
+
+    assert max(fake_queue.delete_calls) == 10
+    assert len(fake_queue.delete_calls) < 45
+    assert consumer.stats()["deleted"] == 45
+
+
+
+@pytest.mark.asyncio
+async def test_timed_out_thread_handler_is_not_released(monkeypatch, fake_queue):
+    release = threading.Event()
+
+    def blocking(envelope):
+        release.wait(5)
+
+    monkeypatch.setitem(poll.route_table, "blocking",
+                        HandlerSpec("blocking", blocking, mode="thread", timeout=0.05))
+    fake_queue.messages = [make_message(0, "blocking")]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=2, max_in_flight=2,
+                           heartbeat_interval=0)
+
+    try:
+        await run_until(consumer, lambda: poll.route_table["blocking"].stats()["timeouts"] == 1)
+        await asyncio.sleep(0.02)
+        # Still running in the pool: releasing it would start a second run alongside it
+        assert fake_queue.visibility_changes == []
+        assert consumer.stats()["released_on_failure"] == 0
+        assert fake_queue.deleted == []
+    finally:
+        release.set()
+        async with asyncio.timeout(2.0):
+            while router._overrunning:
+                await asyncio.sleep(0.005)
+        shutdown_handler_executors()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_thread_handler_keeps_its_worker_until_it_returns(monkeypatch, fake_queue):
+    release = threading.Event()
+    calls = 0
+
+    def blocking(envelope):
+        nonlocal calls
+        calls += 1
+        release.wait(5)
+
+    monkeypatch.setitem(poll.route_table, "blocking",
+                        HandlerSpec("blocking", blocking, mode="thread", timeout=0.05, max_concurrency=1))
+    fake_queue.messages = [make_message(i, "blocking") for i in range(3)]
+    consumer = SQSConsumer(queue_url="q", receivers=1, worker_concurrency=2, max_in_flight=3,
+                           heartbeat_interval=0)
+
+    task = asyncio.create_task(consumer.run())
+    try:
+        async with asyncio.timeout(2.0):
+            while poll.route_table["blocking"].stats()["timeouts"] < 1:
+                await asyncio.sleep(0.005)
+        await asyncio.sleep(0.1)
+        # The first call still occupies the pool, so the type's only slot stays taken
+        assert calls == 1
+        assert consumer.stats()["running"]["blocking"] == 1
+        assert consumer.stats()["waiting"]["blocking"] == 2
+
+        release.set()
+        async with asyncio.timeout(2.0):
+            while calls < 3:
+                await asyncio.sleep(0.005)
+    finally:
+        release.set()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        async with asyncio.timeout(2.0):
+            while router._overrunning:
+                await asyncio.sleep(0.005)
+        shutdown_handler_executors()
+
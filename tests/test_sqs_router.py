@@ -0,0 +1,304 @@
+import asyncio
+import json
+import os
+import threading
+import pytest
+
+import src.adapters.sqs.decoder as decoder
+import src.adapters.sqs.router as router
+from src.adapters.sqs.registry import HandlerSpec, SQS_IN_FLIGHT, SQS_PROCESSING_SECONDS, register_handler, handler_stats
+from src.adapters.sqs.decoder import DecodeError, MessageEnvelope, decode_message
+from src.adapters.sqs.executors import shutdown_handler_executors
+
+
+def sqs_message(body, message_type="template", content_type="application/json"):
+    attributes = {}
+    if message_type:
+        attributes["Message-Type"] = {"DataType": "String", "StringValue": message_type}
+    if content_type:
+        attributes["Content-Type"] = {"DataType": "String", "StringValue": content_type}
+    return {"MessageId": "m1", "ReceiptHandle": "r1", "Body": body, "MessageAttributes": attributes}
+
+
+def sns_message(inner, message_type="template", content_type="application/json"):
+    envelope = {
+        "Type": "Notification",
+        "MessageId": "sns-1",
+        "Message": inner,
+        "MessageAttributes": {
+            "Message-Type": {"Type": "String", "Value": message_type},
+            "Content-Type": {"Type": "String", "Value": content_type},
+        },
+    }
+    return {"MessageId": "m1", "ReceiptHandle": "r1", "Body": json.dumps(envelope)}
+
+
+@pytest.fixture(autouse=True)
+def clear_dedup():
+    # Tests reuse message ids, which would otherwise be skipped as redeliveries
+    router.message_dedup.clear()
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    name, loads, errors = decoder._load_json_backend(request.param)
+    if name != request.param:
+        pytest.skip(f"{request.param} is not installed")
+    monkeypatch.setattr(decoder, "_loads", loads)
+    monkeypatch.setattr(decoder, "_decode_errors", errors)
+    return name
+
+
+def test_decodes_plain_sqs_json(backend):
+    envelope = decode_message(sqs_message('{"abc": "abc"}'))
+
+    assert isinstance(envelope, MessageEnvelope)
+    assert (envelope.message_type, envelope.content, envelope.is_sns) == ("template", {"abc": "abc"}, False)
+    assert envelope.receipt_handle == "r1"
+
+
+def test_decodes_sns_wrapped_json(backend):
+    envelope = decode_message(sns_message('{"abc": "abc"}'))
+
+    assert envelope.is_sns
+    assert envelope.message_type == "template"
+    assert envelope.content == {"abc": "abc"}
+
+
+def test_text_payload_is_not_parsed(backend, monkeypatch):
+    def fail(_):
+        raise AssertionError("text bodies should not be parsed")
+
+    monkeypatch.setattr(decoder, "_loads", fail)
+    envelope = decode_message(sqs_message("hello", content_type="text/plain"))
+    assert envelope.content == "hello"
+
+
+def test_plain_json_body_is_parsed_once(backend, monkeypatch):
+    calls = []
+    loads = decoder._loads
+
+    def counting_loads(data):
+        calls.append(data)
+        return loads(data)
+
+    monkeypatch.setattr(decoder, "_loads", counting_loads)
+    decode_message(sqs_message('{"abc": "abc"}'))
+    assert len(calls) == 1
+
+
+def test_legacy_attribute_names(backend):
+    message = sqs_message("{}", message_type=None, content_type=None)
+    message["MessageAttributes"] = {
+        "MessageType": {"StringValue": "template"},
+        "ContentType": {"StringValue": "application/json"},
+    }
+    envelope = decode_message(message)
+    assert (envelope.message_type, envelope.content) == ("template", {})
+
+
+def test_invalid_json_raises_decode_error(backend):
+    with pytest.raises(DecodeError):
+        decode_message(sqs_message("{not json"))
+    with pytest.raises(DecodeError):
+        decode_message(sns_message("{not json"))
+
+
+def test_envelope_has_no_instance_dict():
+    envelope = decode_message(sqs_message("{}"))
+    with pytest.raises(AttributeError):
+        envelope.extra = 1
+
+
+@pytest.mark.asyncio
+async def test_route_message_hands_envelope_to_handler(monkeypatch):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope)
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler))
+
+    assert await router.route_message(sns_message('{"abc": "abc"}')) is True
+    assert received[0].content == {"abc": "abc"}
+
+
+@pytest.mark.asyncio
+async def test_route_message_unknown_and_invalid(monkeypatch):
+    async def failing_handler(envelope):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", failing_handler))
+
+    assert await router.route_message(sqs_message("{}", message_type="other")) is True
+    assert await router.route_message(sqs_message("{}", message_type="other"), delete_unknown_types=False) is False
+    assert await router.route_message(sqs_message("{bad")) is True
+    assert await router.route_message(sqs_message("{}")) is False
+
+
+@pytest.mark.asyncio
+async def test_timed_out_messages_are_left_for_redelivery(monkeypatch):
+    async def hang(envelope):
+        await asyncio.sleep(10)
+
+    spec = HandlerSpec("template", hang, timeout=0.01)
+    monkeypatch.setitem(router.route_table, "template", spec)
+
+    assert await router.route_message(sqs_message("{}")) is False
+    assert spec.stats()["timeouts"] == 1
+    assert spec.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_register_handler_records_limits_and_metrics(monkeypatch):
+    monkeypatch.delitem(router.route_table, "template")
+
+    @register_handler("template", max_concurrency=2, timeout=5, priority=3)
+    async def handle(envelope):
+        pass
+
+    await router.route_message(sqs_message("{}"))
+
+    spec = router.route_table["template"]
+    assert (spec.max_concurrency, spec.timeout, spec.priority) == (2, 5, 3)
+    stats = handler_stats()["template"]
+    assert stats["processed"] == 1
+    assert stats["latency_max_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_outcomes_are_exported_as_prometheus_metrics(monkeypatch):
+    async def failing_handler(envelope):
+        raise RuntimeError("boom")
+
+    messages = router.SQS_MESSAGES
+    messages.clear()
+    SQS_PROCESSING_SECONDS.clear()
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", failing_handler))
+
+    await router.route_message(sqs_message("{}"))
+    await router.route_message(sqs_message("{}", message_type="other"))
+    await router.route_message(sqs_message("{bad"))
+
+    assert messages.labels("template", "failed").value == 1
+    assert messages.labels("", "unknown_type").value == 1
+    assert messages.labels("", "decode_error").value == 1
+    assert sum(router.route_table["template"]._latency_histogram.counts) == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_messages_are_exported_per_type(monkeypatch):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def blocking_handler(envelope):
+        started.set()
+        await release.wait()
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", blocking_handler))
+    task = asyncio.create_task(router.route_message(sqs_message("{}")))
+    await started.wait()
+
+    assert SQS_IN_FLIGHT.labels("template").value == 1
+
+    release.set()
+    assert await task is True
+    assert SQS_IN_FLIGHT.labels("template").value == 0
+
+
+def record_pid(envelope):
+    # Module level so process-mode handlers can be pickled
+    return os.getpid()
+
+
+@pytest.fixture
+def executors():
+    yield
+    shutdown_handler_executors()
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_runs_off_the_event_loop(monkeypatch, executors):
+    threads = []
+
+    def handler(envelope):
+        threads.append(threading.current_thread())
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler, mode="thread"))
+
+    assert await router.route_message(sqs_message("{}")) is True
+    assert threads[0] is not threading.main_thread()
+    assert router.route_table["template"].stats()["mode"] == "thread"
+
+
+@pytest.mark.asyncio
+async def test_process_mode_runs_in_handler_pool(monkeypatch, executors):
+    spec = HandlerSpec("template", record_pid, mode="process")
+    monkeypatch.setitem(router.route_table, "template", spec)
+
+    assert await router.route_message(sqs_message('{"abc": "abc"}')) is True
+    assert spec.stats()["processed"] == 1
+
+
+def test_offloaded_handlers_must_be_sync():
+    async def handler(envelope):
+        pass
+
+    with pytest.raises(ValueError):
+        HandlerSpec("template", handler, mode="thread")
+    with pytest.raises(ValueError):
+        HandlerSpec("template", record_pid, mode="greenlet")
+
+
+@pytest.mark.asyncio
+async def test_timed_out_thread_handler_keeps_its_claim_until_it_returns(monkeypatch, executors):
+    release = threading.Event()
+    calls = []
+
+    def handler(envelope):
+        calls.append(envelope.message_id)
+        release.wait(5)
+
+    spec = HandlerSpec("template", handler, mode="thread", timeout=0.05)
+    monkeypatch.setitem(router.route_table, "template", spec)
+
+    # The call can't be stopped, so the message is left alone rather than released
+    assert await router.route_message(sqs_message("{}")) is None
+    assert spec.stats()["timeouts"] == 1
+    assert spec.stats()["in_flight"] == 1
+    # A redelivery while it still runs is not handled a second time
+    assert await router.route_message(sqs_message("{}")) is None
+
+    release.set()
+    async with asyncio.timeout(2.0):
+        while router._overrunning:
+            await asyncio.sleep(0.005)
+
+    assert spec.stats()["in_flight"] == 0
+    assert await router.route_message(sqs_message("{}")) is True
+    assert calls == ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_overrunning_handler_releases_its_claim(monkeypatch, executors):
+    release = threading.Event()
+
+    def handler(envelope):
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(router.route_table, "template", HandlerSpec("template", handler, mode="thread", timeout=0.05))
+
+    assert await router.route_message(sqs_message("{}")) is None
+    release.set()
+    async with asyncio.timeout(2.0):
+        while router._overrunning:
+            await asyncio.sleep(0.005)
+
+    release.clear()
+    # The claim was given up, so the redelivery is handled (and times out again)
+    assert await router.route_message(sqs_message("{}")) is None
+    release.set()
+    async with asyncio.timeout(2.0):
+        while router._overrunning:
+            await asyncio.sleep(0.005)
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from src.config import STARTUP_BUDGET_SECONDS
+from src.utils.startup import _run_child, import_report, import_times, parse_importtime, time_to_first_request
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings.utf_8
+import time:       300 |        400 | encodings
+import time:        50 |         50 |     sqlalchemy.sql
+import time:       200 |        250 |   sqlalchemy
+import time:      1050 |       1300 | app
+"""
+
+
+@pytest.fixture
+def rest_only_env(tmp_path):
+    """A REST worker as `python -m cli serve-rest` starts it, on a throwaway database."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}"
+    return {
+        "GRPC_SERVE_IN_APP": "false",
+        "SQS_POLL_IN_APP": "false",
+        "WRITER_DATABASE_URL": url,
+        "READER_DATABASE_URL": url,
+    }
+
+
+def test_parse_importtime():
+    entries = parse_importtime(IMPORTTIME)
+
+    assert [(entry.module, entry.depth) for entry in entries] == [
+        ("encodings.utf_8", 1), ("encodings", 0), ("sqlalchemy.sql", 2), ("sqlalchemy", 1), ("app", 0),
+    ]
+    report = import_report(entries, top=2)
+    assert report["total_ms"] == 1.7
+    assert report["slowest"] == [("app", 1.3), ("encodings", 0.4)]
+    assert report["packages"] == [("app", 1.1), ("encodings", 0.4)]
+
+
+def test_rest_only_app_does_not_load_grpc_or_aws(rest_only_env):
+    # SQS settings aren't needed to import the SQS modules, let alone the app
+    env = {**rest_only_env, "SQS_QUEUE_URL": "", "SQS_REGION": ""}
+    modules = {entry.module for entry in import_times("app", env)}
+
+    assert "fastapi" in modules
+    assert not {"grpc", "adapters.grpc.proto.user.user_pb2", "aioboto3", "botocore", "adapters.sqs.poll"} & modules
+
+
+def test_time_to_first_request_is_within_budget(rest_only_env):
+    # Best of two, so one run slowed by a busy machine doesn't fail the build
+    elapsed = min(time_to_first_request("app", "/openapi.json", rest_only_env) for _ in range(2))
+
+    assert elapsed < STARTUP_BUDGET_SECONDS, (
+        f"A REST worker took {elapsed:.2f}s to answer its first request (budget {STARTUP_BUDGET_SECONDS}s); "
+        f"run `python -m cli startup-report` from src/ to see where the time goes"
+    )
+
+
+@pytest.mark.parametrize("enabled", ["true", "false"])
+def test_metrics_route_follows_metrics_enabled(rest_only_env, enabled):
+    code = "import app; from fastapi.testclient import TestClient; print(TestClient(app.app).get('/metrics').status_code)"
+    result = _run_child(code, {**rest_only_env, "METRICS_ENABLED": enabled})
+
+    assert result.stdout.strip().splitlines()[-1] == ("200" if enabled == "true" else "404")
@@ -0,0 +1,216 @@
+import asyncio
+import os
+import pytest
+
+from src.utils.cache import LRUTTLCache, ReadThroughCache, SharedCache, register_cache_metrics
+from src.utils.metrics import MetricsRegistry
+from src.services.user_service import UserService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSharedCache(SharedCache):
+    """Dict-backed stand-in for a shared tier such as Redis."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class DummyUser:
+    def __init__(self, id, name, email):
+        self.id = id
+        self.name = name
+        self.email = email
+
+
+class DummyUserRepo:
+    def __init__(self):
+        self.users = {1: DummyUser(1, "Alice", "alice@example.com")}
+        self.lookups = 0
+
+    async def get_user_by_id(self, user_id):
+        self.lookups += 1
+        await asyncio.sleep(0.01)
+        return self.users.get(user_id)
+
+    async def get_users_by_ids(self, user_ids):
+        self.lookups += 1
+        await asyncio.sleep(0.01)
+        return [self.users[user_id] for user_id in user_ids if user_id in self.users]
+
+    async def update_user(self, user_id, name, email):
+        self.users[user_id] = DummyUser(user_id, name, email)
+        return self.users[user_id]
+
+
+def make_cache(shared=None, maxsize=100, clock=None):
+    local = LRUTTLCache(maxsize=maxsize, ttl=10, clock=clock or FakeClock())
+    return ReadThroughCache(
+        "user", local, shared,
+        dumps=lambda user: {"id": user.id, "name": user.name, "email": user.email},
+        loads=lambda data: DummyUser(**data),
+    )
+
+
+def test_lru_ttl_cache_evicts_and_expires():
+    clock = FakeClock()
+    cache = LRUTTLCache(maxsize=2, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.evictions == 1
+
+    clock.now = 6
+    assert cache.get("a") == (False, None)
+    assert cache.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_collapsed():
+    cache = make_cache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return DummyUser(1, "Alice", "alice@example.com")
+
+    users = await asyncio.gather(*(cache.get_or_load(1, loader) for _ in range(20)))
+
+    assert calls == 1
+    assert all(user is users[0] for user in users)
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["loads_collapsed"] == 19
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_does_not_store_stale_value():
+    cache = make_cache()
+    started = asyncio.Event()
+
+    async def slow_loader():
+        started.set()
+        await asyncio.sleep(0.01)
+        return DummyUser(1, "Old", "old@example.com")
+
+    load = asyncio.create_task(cache.get_or_load(1, slow_loader))
+    await started.wait()
+    await cache.invalidate(1)
+    await load
+
+    assert cache.local.get(1) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_collapsed_waiters():
+    cache = make_cache()
+    repo = DummyUserRepo()
+
+    leader = asyncio.create_task(cache.get_or_load(1, lambda: repo.get_user_by_id(1)))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load(1, lambda: repo.get_user_by_id(1)))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert (await waiter).name == "Alice"
+    assert leader.cancelled()
+    assert repo.lookups == 1
+    assert cache.stats()["loads_collapsed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_processes():
+    shared = FakeSharedCache()
+    first, second = make_cache(shared), make_cache(shared)
+
+    async def loader():
+        return DummyUser(1, "Alice", "alice@example.com")
+
+    await first.get_or_load(1, loader)
+    user = await second.get_or_load(1, loader)
+
+    assert user.name == "Alice"
+    assert second.stats()["shared_hits"] == 1
+    assert second.stats()["misses"] == 0
+
+    await first.invalidate(1)
+    assert shared.data == {}
+
+
+@pytest.mark.asyncio
+async def test_user_service_caches_and_invalidates_on_update():
+    service = UserService(cache=make_cache())
+    service.user_repo = DummyUserRepo()
+
+    await service.get_user_by_id(1)
+    await service.get_user_by_id(1)
+    assert service.user_repo.lookups == 1
+
+    await service.update_user(1, "Alice Updated", "alice@example.com")
+    user = await service.get_user_by_id(1)
+    assert user.name == "Alice Updated"
+    assert service.user_repo.lookups == 2
+    assert service.cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_users_are_not_cached():
+    service = UserService(cache=make_cache())
+    service.user_repo = DummyUserRepo()
+
+    assert await service.get_user_by_id(99) is None
+    assert await service.get_user_by_id(99) is None
+    assert service.user_repo.lookups == 2
+
+
+def test_cache_is_off_by_default_and_warns_with_several_processes(monkeypatch, caplog):
+    import src.services.user_service as user_service
+
+    if "USER_CACHE_ENABLED" not in os.environ:
+        assert user_service.user_cache is None
+
+    monkeypatch.setattr(user_service, "USER_CACHE_ENABLED", True)
+    monkeypatch.setattr(user_service, "REST_WORKERS", 4)
+    with caplog.at_level("WARNING"):
+        assert user_service._build_user_cache() is not None
+    assert "USER_CACHE_TTL_SECONDS" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_are_exported_at_scrape_time():
+    registry = MetricsRegistry()
+    cache = make_cache(maxsize=1)
+    register_cache_metrics(cache, registry)
+    repo = DummyUserRepo()
+    repo.users[2] = DummyUser(2, "Bob", "bob@example.com")
+
+    await cache.get_or_load(1, lambda: repo.get_user_by_id(1))
+    await cache.get_or_load(1, lambda: repo.get_user_by_id(1))
+    await cache.get_or_load(2, lambda: repo.get_user_by_id(2))
+
+    text = registry.render()
+    assert 'cache_lookups_total{cache="user",result="hit"} 1' in text
+    assert 'cache_lookups_total{cache="user",result="miss"} 2' in text
+    assert 'cache_removals_total{cache="user",reason="evicted"} 1' in text
+    assert 'cache_entries{cache="user"} 1' in text
+    assert 'cache_max_entries{cache="user"} 1' in text
@@ -1,9 +1,13 @@
+import json
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 import pytest
+from pydantic import TypeAdapter, ValidationError
 
 # Import the router from the user_controller
 from src.adapters.rest.user_controller import router
+import src.adapters.rest.responses as responses
+from src.dto.user_dto import UserDTO, BulkUsersResponse
 
 
 # Create a dummy FastAPI app and include the router under the "/users" prefix
@@ -20,8 +24,19 @@ class DummyUser:
 
 
 # Dummy async service functions
-async def dummy_get_all_users():
-    return [DummyUser(1, "Alice", "alice@example.com"), DummyUser(2, "Bob", "bob@example.com")]
+ALL_USERS = [DummyUser(1, "Alice", "alice@example.com"), DummyUser(2, "Bob", "bob@example.com")]
+
+async def dummy_get_all_users(limit=None, after=None):
+    users = [user for user in ALL_USERS if after is None or user.id > after]
+    return users[:limit] if limit is not None else users
+
+async def dummy_stream_users_chunks(chunk_size=1000, after=None):
+    users = [user for user in ALL_USERS if after is None or user.id > after]
+    for user in users:
+        yield [user]
+
+def dummy_stream_users(chunk_size=1000, after=None):
+    return dummy_stream_users_chunks(chunk_size, after)
 
 async def dummy_get_user_by_id(user_id: int):
     if user_id == 1:
@@ -36,15 +51,30 @@ async def dummy_update_user(user_id: int, name: str, email: str):
         return DummyUser(1, name, email)
     return None
 
+async def dummy_patch_user(user_id: int, changes: dict):
+    if user_id == 1:
+        user = DummyUser(1, "Alice", "alice@example.com")
+        user.__dict__.update(changes)
+        return user
+    return None
+
+async def dummy_bulk_upsert_users(users, on_conflict="update"):
+    created = [DummyUser(10 + i, user["name"], user["email"]) for i, user in enumerate(users[:-1])]
+    conflicts = [{"index": len(users) - 1, "email": users[-1]["email"], "reason": "email already exists"}]
+    return {"users": created, "conflicts": conflicts}
+
 
 # Fixture to monkeypatch the service functions used in the controller
 @pytest.fixture(autouse=True)
 def patch_service_functions(monkeypatch):
     # Patch the functions in the user_controller module
     monkeypatch.setattr("src.adapters.rest.user_controller.get_all_users", dummy_get_all_users)
+    monkeypatch.setattr("src.adapters.rest.user_controller.stream_users", dummy_stream_users)
     monkeypatch.setattr("src.adapters.rest.user_controller.get_user_by_id", dummy_get_user_by_id)
     monkeypatch.setattr("src.adapters.rest.user_controller.service_create_user", dummy_create_user)
     monkeypatch.setattr("src.adapters.rest.user_controller.service_update_user", dummy_update_user)
+    monkeypatch.setattr("src.adapters.rest.user_controller.service_patch_user", dummy_patch_user)
+    monkeypatch.setattr("src.adapters.rest.user_controller.service_bulk_upsert_users", dummy_bulk_upsert_users)
 
 
 client = TestClient(app)
@@ -62,6 +92,36 @@ def test_get_users():
     assert data[0]["email"] == "alice@example.com"
 
 
+def test_get_users_paginated():
+    response = client.get("/users/", params={"limit": 1})
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json()] == [1]
+    assert response.headers["X-Next-Cursor"] == "1"
+
+    response = client.get("/users/", params={"limit": 1, "after": 1})
+    assert [user["id"] for user in response.json()] == [2]
+
+    response = client.get("/users/", params={"limit": 1, "after": 2})
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_users_invalid_limit():
+    response = client.get("/users/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+def test_get_users_stream():
+    response = client.get("/users/", params={"stream": "true"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"id": 1, "name": "Alice", "email": "alice@example.com"},
+        {"id": 2, "name": "Bob", "email": "bob@example.com"},
+    ]
+
+
 def test_get_user_found():
     response = client.get("/users/1")
     assert response.status_code == 200
@@ -103,4 +163,61 @@ def test_update_user_not_found():
     response = client.put("/users/999", json=payload)
     assert response.status_code == 404
     data = response.json()
-    assert data["detail"] == "User not found" 
\ No newline at end of file
+    assert data["detail"] == "User not found" 
+
+
+def test_bulk_upsert_users():
+    payload = {
+        "users": [
+            {"name": "Carol", "email": "carol@example.com"},
+            {"name": "Alice", "email": "alice@example.com"},
+        ],
+        "on_conflict": "skip",
+    }
+    response = client.post("/users/bulk", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["users"] == [{"id": 10, "name": "Carol", "email": "carol@example.com"}]
+    assert data["conflicts"] == [{"index": 1, "email": "alice@example.com", "reason": "email already exists"}]
+
+
+def test_bulk_upsert_rejects_too_many_users(monkeypatch):
+    monkeypatch.setattr("src.adapters.rest.user_controller.USERS_BULK_MAX_ROWS", 1)
+    payload = {"users": [{"name": "A", "email": "a@example.com"}, {"name": "B", "email": "b@example.com"}]}
+    response = client.post("/users/bulk", json=payload)
+    assert response.status_code == 413
+
+
+def test_patch_user():
+    response = client.patch("/users/1", json={"name": "Alicia"})
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alicia", "email": "alice@example.com"}
+
+
+def test_patch_user_not_found():
+    response = client.patch("/users/999", json={"email": "x@example.com"})
+    assert response.status_code == 404
+
+
+
+def test_responses_match_the_documented_models():
+    response = client.get("/users/")
+    assert response.headers["content-type"] == "application/json"
+    TypeAdapter(list[UserDTO]).validate_json(response.content)
+    UserDTO.model_validate_json(client.get("/users/1").content)
+
+    payload = {"users": [{"name": "A", "email": "a@example.com"}, {"name": "B", "email": "b@example.com"}]}
+    BulkUsersResponse.model_validate_json(client.post("/users/bulk", json=payload).content)
+
+    # response_model still documents the shape
+    schema = app.openapi()["paths"]["/users/{user_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/UserDTO"}
+
+
+def test_responses_are_validated_before_they_are_sent():
+    rows = [{"id": 1, "name": "Zoë", "email": "zoe@example.com"}]
+    response = responses.FastJSONResponse(rows, responses.USERS)
+    assert response.body == json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    with pytest.raises(ValidationError):
+        responses.FastJSONResponse([{"id": 1, "name": "Bob", "email": None}], responses.USERS).body
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+
+from src.services.user_loader import UserBatchLoader
+
+
+class DummyUser:
+    def __init__(self, id):
+        self.id = id
+
+
+class DummyBatchRepo:
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.calls = []
+
+    async def get_users_by_ids(self, user_ids):
+        self.calls.append(sorted(user_ids))
+        await asyncio.sleep(0)
+        return [DummyUser(user_id) for user_id in user_ids if user_id in self.existing]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_query():
+    repo = DummyBatchRepo(existing=range(1, 51))
+    loader = UserBatchLoader(repo.get_users_by_ids)
+
+    users = await asyncio.gather(*(loader.load(user_id) for user_id in [1, 2, 3, 2, 99]))
+
+    assert repo.calls == [[1, 2, 3, 99]]
+    assert [user.id if user else None for user in users] == [1, 2, 3, 2, None]
+    assert loader.batches == 1
+    assert loader.loads == 5
+
+
+@pytest.mark.asyncio
+async def test_large_batches_are_split():
+    repo = DummyBatchRepo(existing=range(25))
+    loader = UserBatchLoader(repo.get_users_by_ids, max_batch_size=10)
+
+    users = await asyncio.gather(*(loader.load(user_id) for user_id in range(25)))
+
+    assert [len(call) for call in repo.calls] == [10, 10, 5]
+    assert [user.id for user in users] == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_loads_in_later_ticks_get_new_batches():
+    repo = DummyBatchRepo(existing=[1, 2])
+    loader = UserBatchLoader(repo.get_users_by_ids)
+
+    await loader.load(1)
+    await loader.load(2)
+
+    assert repo.calls == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    async def failing_batch(user_ids):
+        raise RuntimeError("db down")
+
+    loader = UserBatchLoader(failing_batch)
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_running_batches_are_referenced_until_done():
+    release = asyncio.Event()
+
+    async def batch_fn(user_ids):
+        await release.wait()
+        return [DummyUser(user_id) for user_id in user_ids]
+
+    loader = UserBatchLoader(batch_fn, max_batch_size=2)
+    loads = asyncio.gather(*(loader.load(user_id) for user_id in range(5)))
+    await asyncio.sleep(0.01)
+    assert len(loader._running) == 3
+
+    release.set()
+    assert [user.id for user in await loads] == list(range(5))
+    await asyncio.sleep(0)
+    assert not loader._running
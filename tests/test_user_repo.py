@@ -0,0 +1,164 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import src.data_access.user_repo as user_repo_module
+from src.data_access.user_repo import UserRepository, User
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    """Every statement sent to the database, i.e. one entry per round trip."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return executed
+
+
+@pytest_asyncio.fixture
+async def repo(engine, monkeypatch):
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_async_session(read_only=True):
+        return sessionmaker()
+
+    monkeypatch.setattr(user_repo_module, "get_async_session", get_async_session)
+    return UserRepository()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_inserts_in_chunks(repo):
+    users = [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(25)]
+
+    result = await repo.bulk_upsert_users(users, chunk_size=10)
+
+    assert [user.email for user in result["users"]] == [user["email"] for user in users]
+    assert result["conflicts"] == []
+    assert len(await repo.list_users(limit=100)) == 25
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_existing_emails(repo):
+    existing = await repo.create_user("Alice", "alice@example.com")
+
+    result = await repo.bulk_upsert_users([
+        {"name": "Alice Updated", "email": "alice@example.com"},
+        {"name": "Bob", "email": "bob@example.com"},
+    ])
+
+    assert [user.name for user in result["users"]] == ["Alice Updated", "Bob"]
+    assert result["users"][0].id == existing.id
+    assert (await repo.get_user_by_id(existing.id)).name == "Alice Updated"
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_skip_reports_conflicts(repo):
+    await repo.create_user("Alice", "alice@example.com")
+
+    result = await repo.bulk_upsert_users([
+        {"name": "Bob", "email": "bob@example.com"},
+        {"name": "Alice Again", "email": "alice@example.com"},
+        {"name": "Bob Again", "email": "bob@example.com"},
+        {"name": "", "email": "nameless@example.com"},
+    ], on_conflict="skip")
+
+    assert [user.email for user in result["users"]] == ["bob@example.com"]
+    assert [(conflict["index"], conflict["reason"]) for conflict in result["conflicts"]] == [
+        (1, "email already exists"),
+        (2, "duplicate email in request"),
+        (3, "name and email are required"),
+    ]
+    assert (await repo.get_user_by_email("alice@example.com")).name == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_rejected_rows_are_isolated_from_the_rest_of_their_chunk(repo, engine, caplog):
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TRIGGER reject_blocked BEFORE INSERT ON users WHEN NEW.email LIKE 'blocked%' "
+            "BEGIN SELECT RAISE(ABORT, 'secret constraint detail'); END"
+        ))
+    users = [{"name": f"User {i}", "email": f"{'blocked' if i in (3, 6) else 'user'}{i}@example.com"}
+             for i in range(10)]
+
+    result = await repo.bulk_upsert_users(users, chunk_size=5)
+
+    assert len(result["users"]) == 8
+    assert result["conflicts"] == [
+        {"index": 3, "email": "blocked3@example.com", "reason": "rejected by database"},
+        {"index": 6, "email": "blocked6@example.com", "reason": "rejected by database"},
+    ]
+    # The database's own message is logged, not returned
+    assert "secret constraint detail" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_non_constraint_errors_in_a_later_chunk_are_isolated_too(repo, engine):
+    # abs() of the smallest integer fails with an "integer overflow" OperationalError, not an IntegrityError
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TRIGGER overflow_bad BEFORE INSERT ON users WHEN NEW.email LIKE 'bad%' "
+            "BEGIN SELECT abs(-9223372036854775807 - 1); END"
+        ))
+    users = [{"name": f"User {i}", "email": f"{'bad' if i == 7 else 'user'}{i}@example.com"} for i in range(10)]
+
+    result = await repo.bulk_upsert_users(users, chunk_size=5)
+
+    assert len(result["users"]) == 9
+    assert result["conflicts"] == [{"index": 7, "email": "bad7@example.com", "reason": "rejected by database"}]
+    assert len(await repo.list_users(limit=100)) == 9
+
+
+@pytest.mark.asyncio
+async def test_update_is_a_single_statement(repo, statements):
+    user = await repo.create_user("Alice", "alice@example.com")
+    statements.clear()
+
+    updated = await repo.update_user(user.id, "Alice Updated", "alice@new.example.com")
+
+    assert (updated.id, updated.name, updated.email) == (user.id, "Alice Updated", "alice@new.example.com")
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE")
+
+
+@pytest.mark.asyncio
+async def test_patch_only_sends_changed_columns(repo, statements):
+    user = await repo.create_user("Alice", "alice@example.com")
+    statements.clear()
+
+    patched = await repo.patch_user(user.id, {"name": "Alicia"})
+
+    assert (patched.name, patched.email) == ("Alicia", "alice@example.com")
+    assert len(statements) == 1
+    assert "email" not in statements[0].split("RETURNING")[0]
+
+
+@pytest.mark.asyncio
+async def test_update_missing_user_returns_none(repo, statements):
+    assert await repo.update_user(99, "Nobody", "nobody@example.com") is None
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_is_a_single_statement(repo, statements):
+    user = await repo.create_user("Alice", "alice@example.com")
+    statements.clear()
+
+    assert await repo.delete_user(user.id) is True
+    assert await repo.delete_user(user.id) is False
+    assert len(statements) == 2
+    assert all(statement.startswith("DELETE") for statement in statements)
+
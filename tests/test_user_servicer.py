@@ -0,0 +1,115 @@
+import grpc
+import pytest
+
+import src.adapters.grpc.proto.user.servicer as servicer_module
+from adapters.grpc.proto.user import user_pb2
+from src.adapters.grpc.proto.user.servicer import UserServicer
+
+
+class Aborted(Exception):
+    pass
+
+
+class FakeContext:
+    """The part of grpc.aio.ServicerContext the servicer uses; abort raises like the real one."""
+
+    def __init__(self):
+        self.code = None
+        self.details = None
+
+    async def abort(self, code, details=""):
+        self.code = code
+        self.details = details
+        raise Aborted(details)
+
+
+class DummyUser:
+    def __init__(self, id, name, email):
+        self.id = id
+        self.name = name
+        self.email = email
+
+
+USERS = [DummyUser(i, f"user{i}", f"user{i}@example.com") for i in range(1, 8)]
+
+
+class FakeUserService:
+    def __init__(self):
+        self.calls = []
+        self.stream_closed = False
+
+    async def get_user_by_id(self, user_id):
+        return next((user for user in USERS if user.id == user_id), None)
+
+    async def get_users_by_ids(self, user_ids):
+        self.calls.append(("get_users_by_ids", user_ids))
+        return [user for user in USERS if user.id in user_ids]
+
+    async def stream_users(self, chunk_size=1000, after=None):
+        self.calls.append(("stream_users", chunk_size, after))
+        rows = [user for user in USERS if after is None or user.id > after]
+        try:
+            for i in range(0, len(rows), chunk_size):
+                yield rows[i:i + chunk_size]
+        finally:
+            self.stream_closed = True
+
+
+@pytest.fixture
+def servicer(monkeypatch):
+    monkeypatch.setattr(servicer_module, "USERS_STREAM_CHUNK_SIZE", 3)
+    servicer = UserServicer()
+    servicer.user_service = FakeUserService()
+    return servicer
+
+
+@pytest.mark.asyncio
+async def test_get_user(servicer):
+    user = await servicer.GetUser(user_pb2.GetUserRequest(id=2), FakeContext())
+    assert (user.id, user.name, user.email) == (2, "user2", "user2@example.com")
+
+
+@pytest.mark.asyncio
+async def test_missing_user_is_not_found(servicer):
+    context = FakeContext()
+    with pytest.raises(Aborted):
+        await servicer.GetUser(user_pb2.GetUserRequest(id=99), context)
+    assert context.code == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_batch_get_users_uses_one_lookup_and_reports_missing_ids(servicer):
+    response = await servicer.BatchGetUsers(user_pb2.BatchGetUsersRequest(ids=[3, 99, 1, 3]), FakeContext())
+
+    assert [user.id for user in response.users] == [3, 1]
+    assert list(response.missing_ids) == [99]
+    assert servicer.user_service.calls == [("get_users_by_ids", [3, 99, 1])]
+
+
+@pytest.mark.asyncio
+async def test_batch_get_users_rejects_too_many_ids(servicer, monkeypatch):
+    monkeypatch.setattr(servicer_module, "GRPC_BATCH_GET_MAX_IDS", 2)
+    context = FakeContext()
+    with pytest.raises(Aborted):
+        await servicer.BatchGetUsers(user_pb2.BatchGetUsersRequest(ids=[1, 2, 3]), context)
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
+    assert servicer.user_service.calls == []
+
+
+@pytest.mark.asyncio
+async def test_stream_users_from_after(servicer):
+    request = user_pb2.StreamUsersRequest(after=2)
+    users = [user async for user in servicer.StreamUsers(request, FakeContext())]
+
+    assert [user.id for user in users] == [3, 4, 5, 6, 7]
+    assert servicer.user_service.calls == [("stream_users", 3, 2)]
+
+
+@pytest.mark.asyncio
+async def test_stream_users_stops_at_limit_and_closes_the_cursor(servicer):
+    request = user_pb2.StreamUsersRequest(limit=4)
+    users = [user async for user in servicer.StreamUsers(request, FakeContext())]
+
+    assert [user.id for user in users] == [1, 2, 3, 4]
+    assert servicer.user_service.calls == [("stream_users", 3, None)]
+    assert servicer.user_service.stream_closed